@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Batch chat CLI: answer many chat requests and write one NDJSON result line per request.
+
+Input is a JSONL file (or a JSON array) of /process-chat request bodies; "-" reads stdin.
+By default the batch runs in-process; --url sends it to a running service's /process-chat/batch.
+
+    python batch_chat.py requests.jsonl -o results.ndjson --concurrency 4
+    python batch_chat.py requests.jsonl --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List, TextIO
+
+
+def read_requests(source: TextIO) -> List[Dict[str, Any]]:
+    """Parse a JSON array or JSON lines of chat requests"""
+    text = source.read().strip()
+    if text.startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+async def run_local(requests: List[Dict[str, Any]], concurrency: int, output: TextIO) -> None:
+    from src.data.mongo import mongo
+    from src.pipeline.batch import batch_processor
+    from src.runtime.crew_executor import crew_executor
+
+    mongo.connect()
+    try:
+        async for record in batch_processor.run(requests, concurrency):
+            output.write(json.dumps(record, default=str) + '\n')
+            output.flush()
+    finally:
+        crew_executor.shutdown()
+        mongo.close()
+
+
+async def run_remote(requests: List[Dict[str, Any]], concurrency: int, url: str, output: TextIO) -> None:
+    import httpx
+
+    body = {'requests': requests, 'concurrency': concurrency}
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream('POST', f"{url.rstrip('/')}/process-chat/batch", json=body) as response:
+            if response.status_code != 200:
+                await response.aread()
+                sys.exit(f"Batch request failed ({response.status_code}): {response.text}")
+            async for line in response.aiter_lines():
+                if line:
+                    output.write(line + '\n')
+                    output.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Answer a batch of chat requests as NDJSON")
+    parser.add_argument('input', help="JSONL file (or JSON array) of chat requests, '-' for stdin")
+    parser.add_argument('-o', '--output', help="NDJSON output file (default: stdout)")
+    parser.add_argument('--concurrency', type=int, default=None, help="Pipeline runs in flight")
+    parser.add_argument('--url', help="Send the batch to a running AI service instead of running in-process")
+    args = parser.parse_args()
+
+    with (sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')) as source:
+        requests = read_requests(source)
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.url:
+            asyncio.run(run_remote(requests, args.concurrency, args.url, output))
+        else:
+            asyncio.run(run_local(requests, args.concurrency, output))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Processed {len(requests)} requests", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
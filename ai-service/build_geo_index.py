@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Backfill GeoJSON points on restaurants and create the 2dsphere index used by GEO_BACKEND=mongo"""
+
+from pymongo import GEOSPHERE, UpdateOne
+
+from src.config.settings import config
+from src.data.mongo import mongo
+
+mongo.connect()
+try:
+    restaurants = mongo.collection('restaurants')
+    updates = []
+    for doc in restaurants.find({}, {'location': 1}):
+        location = doc.get('location') or {}
+        if location.get('latitude') is None or location.get('longitude') is None:
+            continue
+        point = {'type': 'Point', 'coordinates': [float(location['longitude']), float(location['latitude'])]}
+        # updatedAt is left alone: the point mirrors location and does not change the catalog
+        updates.append(UpdateOne({'_id': doc['_id']}, {'$set': {config.GEO_POINT_FIELD: point}}))
+    if updates:
+        result = restaurants.bulk_write(updates, ordered=False)
+        print(f'Backfilled {config.GEO_POINT_FIELD} on {result.modified_count} of {len(updates)} restaurants')
+    name = restaurants.create_index([(config.GEO_POINT_FIELD, GEOSPHERE)])
+    print(f'2dsphere index ready: {name}')
+    print('Set GEO_BACKEND=mongo to query it; re-run after restaurants move')
+finally:
+    mongo.close()
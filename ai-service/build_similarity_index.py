@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Build the "more like this" similarity index offline"""
+
+import time
+
+from src.config.settings import config
+from src.data.mongo import mongo
+from src.search.similarity import similarity_index
+
+mongo.connect()
+try:
+    started = time.perf_counter()
+    table = similarity_index.rebuild()
+    print(f'Wrote {config.SIMILARITY_INDEX_PATH} in {time.perf_counter() - started:.2f}s')
+    print(f'Catalog version: {table.version}')
+    print(f'Items: {len(table.ids)}, neighbours per item: {table.neighbors.shape[1]}')
+finally:
+    mongo.close()
@@ -21,8 +21,7 @@ try:
     foods = food_search.invoke({'query': ''})
     print(f'Found {len(foods)} food items total')
     for f in foods[:5]:
-        rest_name = f.get('restaurant', {}).get('name', 'Unknown') if isinstance(f.get('restaurant'), dict) else str(f.get('restaurant', 'Unknown'))
-        print(f'- {f.get("name", "Unknown")} | Restaurant: {rest_name}')
+        print(f'- {f}')
 except Exception as e:
     print(f'Food search error: {e}')
 
@@ -6,10 +6,11 @@ import os
 from dotenv import load_dotenv
 import json
 import httpx
-from pymongo import MongoClient
 from datetime import datetime
 import asyncio
 
+from src.data.mongo import mongo
+
 load_dotenv()
 
 # Configure Gemini AI
@@ -22,9 +23,8 @@ class FoodSearchTool(BaseTool):
     def _run(self, query: str, preferences: Dict = None) -> List[Dict]:
         """Search for food items from the database"""
         try:
-            # Connect to MongoDB
-            client = MongoClient(os.getenv("MONGODB_URI"))
-            db = client['jarvis-delivers']
+            # Shared pooled connection
+            db = mongo.database
             
             # Build search query
             search_query = {}
@@ -77,7 +77,6 @@ class FoodSearchTool(BaseTool):
                     'tags': item.get('tags', [])
                 })
             
-            client.close()
             return results
             
         except Exception as e:
@@ -91,8 +90,7 @@ class RestaurantSearchTool(BaseTool):
     def _run(self, location: str = None, cuisine: str = None) -> List[Dict]:
         """Search for restaurants"""
         try:
-            client = MongoClient(os.getenv("MONGODB_URI"))
-            db = client['jarvis-delivers']
+            db = mongo.database
             
             query = {}
             if cuisine:
@@ -110,7 +108,6 @@ class RestaurantSearchTool(BaseTool):
                     'estimatedDeliveryTime': restaurant.get('estimatedDeliveryTime', '25-35 mins')
                 })
             
-            client.close()
             return results
             
         except Exception as e:
@@ -16,10 +16,12 @@ from crewai.tools import BaseTool
 from langchain_google_genai import ChatGoogleGenerativeAI
 import google.generativeai as genai
 from pydantic import BaseModel
-import pymongo
 import requests
 from dotenv import load_dotenv
 
+from src.data.mongo import mongo
+from src.data.taste_profiles import taste_profiles
+
 # Load environment variables
 load_dotenv()
 
@@ -70,11 +72,10 @@ class ChatResponse(BaseModel):
     actionRequired: Optional[str] = None
     confidence: float = 0.0
 
-# Database connection
+# Database connection (shared pooled client)
 def get_database():
     try:
-        client = pymongo.MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017'))
-        return client['jarvis-delivers']
+        return mongo.database
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         return None
@@ -88,7 +89,7 @@ class RestaurantSearchTool(BaseTool):
         """Search restaurants and food items"""
         try:
             db = get_database()
-            if not db:
+            if db is None:
                 return "Database connection failed"
             
             # Build search criteria
@@ -139,27 +140,23 @@ class UserPreferencesTool(BaseTool):
     description: str = "Get user preferences, order history, and dietary restrictions"
     
     def _run(self, user_id: str) -> str:
-        """Get user preferences and history"""
+        """Get user preferences and history from the in-memory taste profiles"""
         try:
-            db = get_database()
-            if not db:
-                return "Database connection failed"
-            
-            # Get user info
-            user = db.users.find_one({"_id": user_id})
-            if not user:
-                return "User not found"
+            if not taste_profiles.loaded:
+                taste_profiles.start()
             
-            # Get order history
-            orders = list(db.orders.find({"user": user_id}).sort("createdAt", -1).limit(10))
+            profile = taste_profiles.profile(user_id)
+            if not profile:
+                return json.dumps({"past_orders": 0, "favorite_cuisines": [], "average_order_value": 0}, indent=2)
             
             user_data = {
-                "name": user.get('name', ''),
-                "email": user.get('email', ''),
-                "dietary_preferences": user.get('dietaryPreferences', []),
-                "past_orders": len(orders),
-                "favorite_cuisines": [],  # Could be calculated from order history
-                "average_order_value": 0  # Could be calculated from order history
+                "dietary_preferences": profile['dietary_preferences'],
+                "past_orders": profile['orders'],
+                "favorite_cuisines": [entry['cuisine'] for entry in profile['favorite_cuisines']],
+                "favorite_restaurants": [entry['name'] for entry in profile['favorite_restaurants'] if entry['name']],
+                "typical_dish_price": profile['price']['p50'],
+                "average_order_value": profile['average_order_value'],
+                "days_between_orders": profile['cadence']['mean_days_between_orders']
             }
             
             return json.dumps(user_data, indent=2)
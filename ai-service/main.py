@@ -3,22 +3,86 @@ FastAPI server for the AI-powered food recommendation service.
 Uses CrewAI with specialized agents for intelligent food recommendations.
 """
 
+from contextlib import asynccontextmanager
+from datetime import datetime
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
+import asyncio
+import json
+import time
 import uvicorn
 
 # Import our modular CrewAI implementation
 from src.crews.food_crew import food_crew
 from src.config.settings import config
+from src.data.catalog_refresher import catalog_refresher
+from src.data.catalog_store import catalog_store
+from src.data.mongo import mongo
+from src.data.taste_profiles import taste_profiles
+from src.search.food_index import food_index
+from src.search.geo_index import geo_index
+from src.search.opening_hours import opening_hours
+from src.search.recommendations import InvalidQueryError, recommendation_engine
+from src.search.similarity import similarity_index
+from src.llm.rate_limiter import gemini_limiter, is_rate_limit_error
+from src.pipeline.batch import batch_processor
+from src.pipeline.fallbacks import fallback_engine
+from src.pipeline.fast_path import fast_path
+from src.pipeline.hydration import recommendation_hydrator
+from src.pipeline.response_cache import depersonalize, personalize, response_cache
+from src.pipeline.streaming import ProgressCallback, picks_event, token_event
+from src.runtime.backend_client import backend_client
+from src.runtime.crew_executor import CrewQueueFullError, crew_executor
+from src.runtime.single_flight import chat_flights, coalescing_key
+from src.tools.cart_operations import cart_action
+from src.tools.restaurant_search import nearby_restaurants, open_restaurants
+from src.utils.metrics import stage_metrics
 from src.utils.helpers import validate_user_message, validate_user_context, log_crew_activity
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown"""
+    mongo.connect()
+    log_crew_activity("MongoDB pool opened", {"max_pool_size": config.MONGO_MAX_POOL_SIZE})
+    try:
+        # Load the catalog once, then follow changes incrementally instead of reloading it
+        await run_in_threadpool(catalog_refresher.start)
+        log_crew_activity("Catalog refresher started", {"mode": config.CATALOG_REFRESH_MODE})
+    except Exception as e:
+        log_crew_activity("Catalog refresher failed to start", {"error": str(e)})
+    try:
+        # Build taste profiles from order history, then follow new orders
+        await run_in_threadpool(taste_profiles.start)
+    except Exception as e:
+        log_crew_activity("Taste profiles failed to build", {"error": str(e)})
+    try:
+        # Warm the search index so the first fast-path request does not pay for the load
+        await run_in_threadpool(food_index.get)
+        # Precompute the no-LLM answers so a Gemini outage is served from memory
+        await run_in_threadpool(fallback_engine.warm)
+    except Exception as e:
+        log_crew_activity("Food index warm-up failed", {"error": str(e)})
+    # One pooled HTTP/2 client for every Node backend call
+    await backend_client.start()
+    yield
+    await backend_client.stop()
+    taste_profiles.stop()
+    catalog_refresher.stop()
+    # Waits for in-flight crews, so keep it off the event loop
+    await run_in_threadpool(crew_executor.shutdown)
+    mongo.close()
+    log_crew_activity("MongoDB pool closed")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Jarvis Delivers AI Service",
     description="CrewAI-powered food recommendation service with Gemini AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -41,6 +105,37 @@ class ChatRequest(BaseModel):
     user_context: UserContext
     conversation_history: Optional[List[Dict[str, Any]]] = []
 
+class BatchChatRequest(BaseModel):
+    requests: List[ChatRequest]
+    concurrency: Optional[int] = None
+
+class RecommendationFilters(BaseModel):
+    cuisines: Optional[List[str]] = None
+    categories: Optional[List[str]] = None
+    tags: Optional[List[str]] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    vegetarian: Optional[bool] = None
+    vegan: Optional[bool] = None
+    gluten_free: Optional[bool] = None
+    spice_levels: Optional[List[str]] = None
+    max_spice: Optional[str] = None
+    min_rating: Optional[float] = None
+    min_restaurant_rating: Optional[float] = None
+    max_delivery_minutes: Optional[float] = None
+    restaurant_id: Optional[str] = None
+    open_now: Optional[bool] = None
+    available_only: Optional[bool] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None
+
+class RecommendationRequest(BaseModel):
+    filters: RecommendationFilters = RecommendationFilters()
+    sort: str = "rating"
+    limit: int = 20
+    cursor: Optional[str] = None
+
 class CartRequest(BaseModel):
     item_id: str
     user_id: str
@@ -57,13 +152,43 @@ class ChatResponse(BaseModel):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    # The ping can wait up to the server selection timeout; keep it off the event loop
+    database = await run_in_threadpool(mongo.health)
     return {
-        "status": "healthy",
+        "status": "healthy" if database["status"] == "healthy" else "degraded",
         "service": "Jarvis Delivers AI Service",
         "version": "1.0.0",
-        "ai_model": config.GEMINI_MODEL
+        "ai_model": config.GEMINI_MODEL,
+        "database": database
     }
 
+# Runtime metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    """Runtime statistics for shared resources"""
+    stats = {
+        "mongo_pool": mongo.pool_stats(),
+        "catalog_store": catalog_store.stats(),
+        "catalog_refresher": catalog_refresher.stats(),
+        "geo_index": geo_index.stats(),
+        "opening_hours": opening_hours.stats(),
+        "taste_profiles": taste_profiles.stats(),
+        "crew_executor": crew_executor.stats(),
+        "gemini_limiter": gemini_limiter.stats(),
+        "backend_client": backend_client.stats(),
+        "single_flight": chat_flights.stats(),
+        "batch": batch_processor.stats(),
+        "fast_path": fast_path.stats(),
+        "fallbacks": fallback_engine.stats(),
+        "response_cache": response_cache.stats(),
+        "hydration": recommendation_hydrator.stats(),
+        "stages": stage_metrics.snapshot()
+    }
+    if config.LLM_CACHE_ENABLED:
+        from src.llm.completion_cache import completion_store
+        stats["llm_completion_cache"] = completion_store.stats()
+    return stats
+
 # Main chat processing endpoint
 @app.post("/process-chat", response_model=ChatResponse)
 async def process_chat(request: ChatRequest):
@@ -88,154 +213,309 @@ async def process_chat(request: ChatRequest):
             "message_length": len(request.message)
         })
         
+        return ChatResponse(**await _answer_chat(request.message, request.user_context.dict()))
+        
+    except HTTPException:
+        raise
+    except CrewQueueFullError as e:
+        raise _busy_error(e)
+    except Exception as e:
+        log_crew_activity("Chat processing error", {"error": str(e)})
+        raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+
+async def _answer_chat(
+    message: str,
+    user_context: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Answer one validated chat message: fast path first, then the pipeline on the crew executor
+    
+    Args:
+        message (str): User's food request message
+        user_context (Dict): User context from the request
+        progress (ProgressCallback): Receives stage events if this request leads a pipeline run
+        
+    Returns:
+        Dict: ChatResponse-shaped result
+        
+    Raises:
+        CrewQueueFullError: If the crew executor cannot admit the run
+    """
+    if config.FAST_PATH_ENABLED:
         try:
-            # Process through CrewAI
-            result = food_crew.process_user_query(
-                user_message=request.message,
-                user_context=request.user_context.dict()
-            )
-        except Exception as crew_error:            # Check if it's a quota/rate limit error
-            error_str = str(crew_error)
-            if "quota" in error_str.lower() or "rate" in error_str.lower() or "429" in error_str:
-                log_crew_activity("Quota exceeded - using fallback response", {"error": error_str})
-                
-                # Smart fallback based on user message keywords
-                user_msg_lower = request.message.lower()
-                fallback_recommendations = []
-                fallback_message = ""
-                
-                if any(word in user_msg_lower for word in ["pizza", "italian"]):
-                    fallback_message = "My AI chef is taking a quick break, but I know you want pizza! 🍕 Here are some amazing options:"
-                    fallback_recommendations = [
-                        {
-                            "id": "pizza_1", 
-                            "name": "Margherita Pizza", 
-                            "price": 14.99,
-                            "restaurant": "Pizza Paradise",
-                            "description": "Classic Italian pizza with fresh mozzarella, tomato sauce, and basil leaves on a crispy wood-fired crust.",
-                            "category": "Pizza",
-                            "rating": 4.5,
-                            "preparationTime": "15 mins"
-                        },
-                        {
-                            "id": "pizza_2",
-                            "name": "Pepperoni Pizza",
-                            "price": 16.99,
-                            "restaurant": "Pizza Paradise",
-                            "description": "Classic pepperoni pizza with mozzarella cheese and spicy pepperoni slices on a hand-tossed crust.",
-                            "category": "Pizza", 
-                            "rating": 4.6,
-                            "preparationTime": "18 mins"
-                        }
-                    ]
-                elif any(word in user_msg_lower for word in ["sushi", "japanese", "roll"]):
-                    fallback_message = "Even without my AI powers, I can tell you love sushi! 🍣 Check these out:"
-                    fallback_recommendations = [
-                        {
-                            "id": "sushi_1",
-                            "name": "California Roll",
-                            "price": 8.99,
-                            "restaurant": "Sushi Zen",
-                            "description": "Crab, avocado and cucumber rolled in rice and nori, topped with sesame seeds.",
-                            "category": "Sushi",
-                            "rating": 4.4,
-                            "preparationTime": "10 mins"
-                        },
-                        {
-                            "id": "sushi_2",
-                            "name": "Salmon Roll",
-                            "price": 12.99,
-                            "restaurant": "Sushi Zen",
-                            "description": "Fresh salmon with cucumber and avocado wrapped in seasoned sushi rice and nori.",
-                            "category": "Sushi",
-                            "rating": 4.8,
-                            "preparationTime": "10 mins"
-                        }
-                    ]
-                elif any(word in user_msg_lower for word in ["indian", "curry", "spicy"]):
-                    fallback_message = "My AI is recharging, but I know great Indian food! 🍛 Try these:"
-                    fallback_recommendations = [
-                        {
-                            "id": "indian_1",
-                            "name": "Paneer Butter Masala",
-                            "price": 18.38,
-                            "restaurant": "Spice Garden",
-                            "description": "Soft paneer cubes simmered in a rich, creamy tomato and butter sauce with aromatic Indian spices.",
-                            "category": "Indian",
-                            "rating": 4.7,
-                            "preparationTime": "25 mins"
-                        },
-                        {
-                            "id": "indian_2",
-                            "name": "Chicken Tikka Masala",
-                            "price": 19.99,
-                            "restaurant": "Spice Garden",
-                            "description": "Tender chicken pieces marinated in yogurt and spices, cooked in a rich, creamy tomato-based curry sauce.",
-                            "category": "Indian",
-                            "rating": 4.9,
-                            "preparationTime": "30 mins"
-                        }
-                    ]
-                else:
-                    # General fallback for all other requests
-                    fallback_message = "I'm experiencing high demand right now! 🔥 But here are some popular dishes I think you'll love:"
-                    fallback_recommendations = [
-                        {
-                            "id": "popular_1",
-                            "name": "Chicken Caesar Salad",
-                            "price": 13.99,
-                            "restaurant": "Green Garden Cafe",
-                            "description": "Crisp romaine lettuce, grilled chicken, parmesan cheese, and croutons with Caesar dressing.",
-                            "category": "Salad",
-                            "rating": 4.3,
-                            "preparationTime": "12 mins"
-                        },
-                        {
-                            "id": "popular_2",
-                            "name": "BBQ Burger",
-                            "price": 15.99,
-                            "restaurant": "Burger Junction",
-                            "description": "Juicy beef patty with BBQ sauce, bacon, cheese, lettuce, and tomato on a toasted bun.",
-                            "category": "Burger",
-                            "rating": 4.5,
-                            "preparationTime": "20 mins"
-                        },
-                        {
-                            "id": "popular_3",
-                            "name": "Pad Thai",
-                            "price": 14.99,
-                            "restaurant": "Bangkok Street",
-                            "description": "Stir-fried rice noodles with shrimp, tofu, bean sprouts, and peanuts in a tangy tamarind sauce.",
-                            "category": "Thai",
-                            "rating": 4.6,
-                            "preparationTime": "18 mins"
-                        }
-                    ]
-                
-                return ChatResponse(
-                    message=fallback_message,
-                    recommendations=fallback_recommendations,
-                    actionRequired={
-                        "type": "add_to_cart",
-                        "message": "Would you like to add any of these to your cart?"
-                    },
-                    user_context=request.user_context.dict(),
-                    processed_at=f"{__import__('datetime').datetime.now().isoformat()}"
-                )
-            else:
-                # Re-raise non-quota errors
-                raise crew_error
+            fast_result = await run_in_threadpool(fast_path.respond, message, user_context)
+        except Exception as fast_error:
+            log_crew_activity("Fast path failed - escalating to crew", {"error": str(fast_error)})
+            fast_result = None
         
-        log_crew_activity("Chat processing completed", {
-            "user_id": request.user_context.id,
-            "recommendations_count": len(result.get('recommendations', []))
-        })
+        if fast_result:
+            log_crew_activity("Answered by fast path", {
+                "user_id": user_context.get('id'),
+                "confidence": fast_result['intent']['confidence']
+            })
+            return fast_result
+    
+    try:
+        # Process through CrewAI on the bounded worker pool; identical concurrent
+        # requests share a single crew run
+        result, shared = await chat_flights.do(
+            coalescing_key(message, user_context, taste_profiles.segment(user_context.get('id'))),
+            lambda: crew_executor.run(
+                food_crew.process_user_query,
+                user_message=message,
+                user_context=user_context,
+                progress=progress
+            )
+        )
+        if shared:
+            result = _personalize_shared_result(result, user_context)
+    except CrewQueueFullError:
+        raise
+    except Exception as crew_error:            # Check if it's a quota/rate limit error
+        error_str = str(crew_error)
+        if is_rate_limit_error(crew_error):
+            log_crew_activity("Quota exceeded - using fallback response", {"error": error_str})
+            # respond() may probe the catalog version or build the first fallback table
+            return await run_in_threadpool(fallback_engine.respond, message, user_context)
+        else:
+            # Re-raise non-quota errors
+            raise crew_error
+    
+    log_crew_activity("Chat processing completed", {
+        "user_id": user_context.get('id'),
+        "recommendations_count": len(result.get('recommendations', []))
+    })
+    return result
+
+def _busy_error(error: CrewQueueFullError) -> HTTPException:
+    """503 for a request the crew executor could not admit"""
+    log_crew_activity("Crew queue full - rejecting request", crew_executor.stats())
+    return HTTPException(
+        status_code=503,
+        detail="AI service is busy, please retry shortly",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+def _personalize_shared_result(result: Dict[str, Any], user_context: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a coalesced crew result and swap in the waiting user's own fields"""
+    leader_name = (result.get('user_context') or {}).get('name') or 'friend'
+    shared = personalize(depersonalize(result, leader_name), user_context.get('name') or 'friend')
+    shared['user_context'] = user_context
+    shared['processed_at'] = datetime.now().isoformat()
+    return shared
+
+# Streaming chat endpoint (Server-Sent Events)
+@app.post("/process-chat/stream")
+async def process_chat_stream(request: ChatRequest):
+    """
+    Process user chat message and stream progress as Server-Sent Events
+    
+    The request takes the same path as /process-chat (fast path, coalescing, crew executor,
+    response cache); a pipeline run reports its stages as it goes.
+    Events: started, intent, candidates, ranking, then token events carrying the message as the
+    model writes it, and result with the same payload as /process-chat (or error). Answers that
+    ran no pipeline (fast path, cache hits, coalesced requests) send ranking and one token built
+    from the final result.
+    
+    Args:
+        request (ChatRequest): Chat request with message and user context
         
-        return ChatResponse(**result)
+    Returns:
+        StreamingResponse: text/event-stream of pipeline events
+    """
+    if not validate_user_message(request.message):
+        raise HTTPException(status_code=400, detail="Invalid message format")
+    
+    if not validate_user_context(request.user_context.dict()):
+        raise HTTPException(status_code=400, detail="Invalid user context")
+    
+    log_crew_activity("Streaming chat request", {
+        "user_id": request.user_context.id,
+        "message_length": len(request.message)
+    })
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def progress(event: str, data: Dict[str, Any]) -> None:
+        # Called on the crew worker thread
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+    
+    started = time.perf_counter()
+    answer = asyncio.ensure_future(_answer_chat(request.message, request.user_context.dict(), progress))
+    getter = asyncio.ensure_future(events.get())
+    try:
+        # Hold the response until the run has started (or already finished), so a full crew
+        # queue still answers 503 instead of an event stream
+        await asyncio.wait({answer, getter}, return_when=asyncio.FIRST_COMPLETED)
+        if answer.done() and answer.exception() is not None:
+            raise answer.exception()
+    except CrewQueueFullError as e:
+        getter.cancel()
+        raise _busy_error(e)
+    except BaseException as e:
+        getter.cancel()
+        answer.cancel()
+        if isinstance(e, (HTTPException, asyncio.CancelledError)):
+            raise
+        log_crew_activity("Streaming chat error", {"error": str(e)})
+        raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+    
+    async def event_stream():
+        nonlocal getter
+        first_event = True
+        sent = set()
+        try:
+            while True:
+                if not getter.done():
+                    await asyncio.wait({answer, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    break
+                event, data = getter.result()
+                sent.add(event)
+                yield _sse(event, data)
+                if first_event:
+                    stage_metrics.record('stream.first_event', time.perf_counter() - started)
+                    first_event = False
+                getter = asyncio.ensure_future(events.get())
+            getter.cancel()
+            # Events put just before the run returned
+            while not events.empty():
+                event, data = events.get_nowait()
+                sent.add(event)
+                yield _sse(event, data)
+            
+            result = ChatResponse(**answer.result()).dict()
+            if "ranking" not in sent:
+                yield _sse("ranking", picks_event(result))
+            if "token" not in sent:
+                yield _sse("token", token_event(result["message"]))
+            stage_metrics.record('stream.total', time.perf_counter() - started)
+            yield _sse("result", result)
+        except CrewQueueFullError as e:
+            yield _sse("error", {"detail": "AI service is busy, please retry shortly", "retry_after": e.retry_after})
+        except Exception as e:
+            log_crew_activity("Streaming chat error", {"error": str(e)})
+            yield _sse("error", {"detail": f"Chat processing failed: {str(e)}"})
+        finally:
+            # Client went away: stop waiting; a coalesced crew run still finishes for its other callers
+            getter.cancel()
+            answer.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+# Batch chat endpoint (NDJSON)
+@app.post("/process-chat/batch")
+async def process_chat_batch(request: BatchChatRequest):
+    """
+    Process many chat requests and stream one NDJSON line per request as it completes
+    
+    Each line has the request's index, a status (ok, invalid or error), the answer source
+    (fast_path, pipeline or deduplicated) and the /process-chat response; a final
+    {"summary": ...} line closes the stream.
+    
+    Args:
+        request (BatchChatRequest): Chat requests and an optional concurrency override
         
+    Returns:
+        StreamingResponse: application/x-ndjson stream of per-request results
+    """
+    if not request.requests or len(request.requests) > batch_processor.max_items:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1 to {batch_processor.max_items} requests")
+    if request.concurrency is not None and not 1 <= request.concurrency <= config.CREW_MAX_WORKERS + config.CREW_MAX_QUEUE:
+        raise HTTPException(status_code=400, detail="concurrency must fit the crew worker pool and queue")
+    
+    log_crew_activity("Batch chat request", {"size": len(request.requests), "concurrency": request.concurrency})
+    
+    async def ndjson_stream():
+        try:
+            async for record in batch_processor.run([item.dict() for item in request.requests], request.concurrency):
+                yield json.dumps(record, default=str) + "\n"
+        except Exception as e:
+            log_crew_activity("Batch chat error", {"error": str(e)})
+            yield json.dumps({"status": "error", "error": f"Batch processing failed: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+# "More like this" endpoint
+@app.get("/similar/{item_id}")
+async def similar_items(item_id: str, limit: int = 5, other_restaurants: bool = False):
+    """
+    Get dishes similar to a food item from the precomputed neighbour table
+    """
+    if not 1 <= limit <= config.SIMILARITY_TOP_K:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {config.SIMILARITY_TOP_K}")
+    try:
+        similar = await run_in_threadpool(similarity_index.similar_items, item_id, limit, other_restaurants)
     except Exception as e:
-        log_crew_activity("Chat processing error", {"error": str(e)})
-        raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+        log_crew_activity("Similar items error", {"error": str(e)})
+        raise HTTPException(status_code=503, detail=f"Similarity index unavailable: {str(e)}")
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"Food item {item_id} not found")
+    return {
+        "success": True,
+        "item_id": item_id,
+        "similar": similar
+    }
+
+@app.get("/restaurants/nearby")
+async def restaurants_nearby(lat: float, lng: float, radius_km: Optional[float] = None, limit: int = 10):
+    """
+    Get the restaurants closest to a point (within radius_km when given, else the nearest `limit`)
+    """
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(status_code=400, detail="lat must be within [-90, 90] and lng within [-180, 180]")
+    if not 1 <= limit <= 100 or (radius_km is not None and radius_km <= 0):
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100 and radius_km positive")
+    try:
+        restaurants = await run_in_threadpool(nearby_restaurants, lat, lng, radius_km, limit)
+    except Exception as e:
+        log_crew_activity("Nearby restaurants error", {"error": str(e)})
+        raise HTTPException(status_code=503, detail=f"Geo index unavailable: {str(e)}")
+    return {
+        "success": True,
+        "location": {"latitude": lat, "longitude": lng},
+        "restaurants": restaurants
+    }
+
+@app.get("/restaurants/open")
+async def restaurants_open(at: Optional[datetime] = None, limit: int = 20):
+    """
+    Get the best-rated restaurants open now, or at `at` (ISO 8601; no offset = restaurant local time)
+    """
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    try:
+        restaurants = await run_in_threadpool(open_restaurants, at, limit)
+    except Exception as e:
+        log_crew_activity("Open restaurants error", {"error": str(e)})
+        raise HTTPException(status_code=503, detail=f"Opening hours unavailable: {str(e)}")
+    return {
+        "success": True,
+        "at": (at or opening_hours.now()).isoformat(),
+        "restaurants": restaurants
+    }
+
+@app.get("/users/{user_id}/taste-profile")
+async def user_taste_profile(user_id: str):
+    """
+    Get a user's taste profile (cuisine affinities, price band, dietary habits, favourite restaurants)
+    """
+    if not taste_profiles.loaded:
+        raise HTTPException(status_code=503, detail="Taste profiles are not loaded")
+    profile = taste_profiles.profile(user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No order history for user {user_id}")
+    return {"success": True, "profile": profile}
 
 # Add to cart endpoint
 @app.post("/add-to-cart")
@@ -259,7 +539,8 @@ async def add_to_cart(request: CartRequest):
             "quantity": request.quantity
         })
         
-        result = food_crew.add_to_cart(
+        result = await cart_action(
+            "add_item",
             item_id=request.item_id,
             user_id=request.user_id,
             quantity=request.quantity
@@ -273,26 +554,32 @@ async def add_to_cart(request: CartRequest):
 
 # Get recommendations endpoint (alternative to chat)
 @app.post("/recommendations")
-async def get_recommendations(request: Dict[str, Any]):
+async def get_recommendations(request: RecommendationRequest):
     """
-    Get food recommendations based on filters
+    Get food recommendations matching structured filters, straight from the catalog (no LLM)
     
     Args:
-        request (Dict): Request with filters and preferences
+        request (RecommendationRequest): Filters, sort key, page size and the previous page's cursor
         
     Returns:
-        Dict: Recommendations response
+        Dict: One page of recommendations, the total match count and the next page's cursor
     """
+    if request.limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
     try:
-        # This could be a simplified version of the chat workflow
-        # For now, return a basic response
-        return {
-            "recommendations": [],
-            "message": "Recommendations endpoint - use /process-chat for full AI experience"
-        }
-        
+        page = await run_in_threadpool(
+            recommendation_engine.query,
+            request.filters.dict(),
+            request.sort,
+            request.limit,
+            request.cursor
+        )
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        log_crew_activity("Recommendations error", {"error": str(e)})
         raise HTTPException(status_code=500, detail=f"Recommendations failed: {str(e)}")
+    return {"success": True, **page}
 
 # Debug endpoint for development
 @app.get("/debug/config")
@@ -305,13 +592,40 @@ async def debug_config():
         "db_name": config.DB_NAME
     }
 
+# Pipeline comparison endpoint for development
+@app.post("/debug/pipeline-compare")
+async def pipeline_compare(request: ChatRequest):
+    """Run the same message through crew and structured modes and compare latency and tokens"""
+    comparison = {}
+    for mode in ("crew", "structured"):
+        started = time.perf_counter()
+        try:
+            result, (prompt_tokens, completion_tokens) = await crew_executor.run(
+                food_crew.run_pipeline,
+                request.message,
+                request.user_context.dict(),
+                mode
+            )
+        except CrewQueueFullError as e:
+            raise _busy_error(e)
+        comparison[mode] = {
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "fallback": bool(result.get("fallback")),
+            "recommendation_ids": [rec.get("id") for rec in result.get("recommendations", [])],
+            "message": result.get("message")
+        }
+    return comparison
+
 # Test endpoint for development
 @app.get("/test-crew")
 async def test_crew():
     """Test endpoint to verify CrewAI is working"""
     try:
         # Create a test request
-        test_result = food_crew.process_user_query(
+        test_result = await crew_executor.run(
+            food_crew.process_user_query,
             user_message="I'm feeling sad and want some comfort food",
             user_context={"name": "Test User", "id": "test123"}
         )
@@ -5,8 +5,10 @@ Specialized in finding and searching for relevant food options.
 
 from crewai import Agent
 from ..config.settings import config
+from ..tools.discovery import discover_options
 from ..tools.food_search import food_search
 from ..tools.restaurant_search import restaurant_search
+from ..tools.similar_items import find_similar_items
 
 
 class FoodDiscoveryAgent:
@@ -29,7 +31,11 @@ class FoodDiscoveryAgent:
             - Understanding of dietary restrictions and healthy alternatives
             - Knowledge of seasonal ingredients and trending food items
             
-            IMPORTANT: When searching for comfort food, try these specific terms that work well:
+            IMPORTANT: Always start with ONE discover_options call - it runs the food and restaurant
+            searches in parallel. Only use food_search or restaurant_search for a follow-up search.
+            When the user asks for "something like" a dish they already know, use find_similar_items.
+            
+            When searching for comfort food, try these specific terms that work well:
             - For comfort food: search "pizza", "indian", "mexican", "japanese", "dessert"
             - For restaurants: search "Pizza Paradise", "Spice Garden", "Taco Fiesta", "Sushi Zen", "Dessert Dreams"
             - Start with broad cuisine searches like "pizza", "indian", "mexican" before trying specific items
@@ -39,7 +45,7 @@ class FoodDiscoveryAgent:
             quite articulate it themselves.""",
             verbose=True,
             allow_delegation=False,
-            tools=[food_search, restaurant_search],
+            tools=[discover_options, food_search, restaurant_search, find_similar_items],
             llm=config.get_gemini_llm(),
             max_iter=3,
             memory=False
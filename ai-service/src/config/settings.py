@@ -35,10 +35,98 @@ class Config:
         "orders": "orders"
     }
     
+    # Connection pool for the shared MongoDB client (src/data/mongo.py)
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    
     # Search Limits
     MAX_FOOD_RESULTS: int = 10
     MAX_RESTAURANT_RESULTS: int = 5
     
+    # Crew execution pool: concurrent crew runs, waiting runs, and Retry-After for rejects
+    CREW_MAX_WORKERS: int = int(os.getenv("CREW_MAX_WORKERS", "4"))
+    CREW_MAX_QUEUE: int = int(os.getenv("CREW_MAX_QUEUE", "16"))
+    CREW_RETRY_AFTER_SECONDS: int = int(os.getenv("CREW_RETRY_AFTER_SECONDS", "10"))
+    
+    # Batch chat: pipeline runs in flight per batch, and the largest accepted batch
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "5000"))
+    
+    # Deterministic fast path: answer explicit requests without the crew above this confidence
+    FAST_PATH_ENABLED: bool = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    FAST_PATH_MIN_CONFIDENCE: float = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.7"))
+    
+    # Recommendation pipeline: "crew" (four sequential agents) or "structured" (retrieval + one LLM call)
+    PIPELINE_MODE: str = os.getenv("PIPELINE_MODE", "crew").lower()
+    STRUCTURED_MAX_CANDIDATES: int = int(os.getenv("STRUCTURED_MAX_CANDIDATES", "12"))
+    
+    # Threads for concurrent discovery searches (food by query/type, restaurants by cuisine)
+    DISCOVERY_MAX_WORKERS: int = int(os.getenv("DISCOVERY_MAX_WORKERS", "8"))
+    
+    # Crew response cache keyed on normalized intent + catalog version
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "500"))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "900"))
+    
+    # Persistent completion cache for agent task prompts
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_completions.sqlite3")
+    LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "64"))
+    
+    # Gemini rate limiter shared by every LLM call (and across workers via the state file)
+    GEMINI_RPM: float = float(os.getenv("GEMINI_RPM", "10"))
+    GEMINI_MIN_RPM: float = float(os.getenv("GEMINI_MIN_RPM", "2"))
+    GEMINI_BURST: int = int(os.getenv("GEMINI_BURST", "5"))
+    GEMINI_MAX_WAIT_SECONDS: float = float(os.getenv("GEMINI_MAX_WAIT_SECONDS", "10"))
+    GEMINI_RETRY_ATTEMPTS: int = int(os.getenv("GEMINI_RETRY_ATTEMPTS", "3"))
+    GEMINI_BACKOFF_SECONDS: float = float(os.getenv("GEMINI_BACKOFF_SECONDS", "1"))
+    GEMINI_BREAKER_THRESHOLD: int = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "3"))
+    GEMINI_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("GEMINI_BREAKER_COOLDOWN_SECONDS", "60"))
+    GEMINI_LIMITER_STATE_PATH: str = os.getenv("GEMINI_LIMITER_STATE_PATH", ".cache/gemini_limiter.json")
+    
+    # Seconds between catalog change probes (counts + latest updatedAt)
+    CATALOG_VERSION_POLL_SECONDS: float = float(os.getenv("CATALOG_VERSION_POLL_SECONDS", "5"))
+    
+    # Incremental catalog refresh: "poll" (updatedAt watermark), "change_stream" or "off"
+    CATALOG_REFRESH_MODE: str = os.getenv("CATALOG_REFRESH_MODE", "poll").lower()
+    CATALOG_REFRESH_SECONDS: float = float(os.getenv("CATALOG_REFRESH_SECONDS", "5"))
+    # Seconds between full _id comparisons in poll mode (catches deletes that counts miss)
+    CATALOG_DELETE_SWEEP_SECONDS: float = float(os.getenv("CATALOG_DELETE_SWEEP_SECONDS", "60"))
+    
+    # Seconds before the in-memory food search index is rebuilt from MongoDB
+    SEARCH_INDEX_TTL: int = int(os.getenv("SEARCH_INDEX_TTL", "300"))
+    
+    # Precomputed "more like this" neighbours (rebuilt when the catalog version changes)
+    SIMILARITY_INDEX_PATH: str = os.getenv("SIMILARITY_INDEX_PATH", ".cache/similar_items.npz")
+    SIMILARITY_TOP_K: int = int(os.getenv("SIMILARITY_TOP_K", "20"))
+    
+    # Restaurants farther than this from the user's address are left out of recommendations (0 disables)
+    GEO_SEARCH_RADIUS_KM: float = float(os.getenv("GEO_SEARCH_RADIUS_KM", "10"))
+    # Geo queries: "memory" (grid over the catalog) or "mongo" (2dsphere index, see build_geo_index.py)
+    GEO_BACKEND: str = os.getenv("GEO_BACKEND", "memory").lower()
+    GEO_POINT_FIELD: str = os.getenv("GEO_POINT_FIELD", "geoPoint")
+    
+    # Drop restaurants closed right now (per Restaurant.hours) before ranking and agent tools
+    OPEN_HOURS_FILTER: bool = os.getenv("OPEN_HOURS_FILTER", "true").lower() == "true"
+    # IANA timezone the hours strings are written in (empty = server local time)
+    RESTAURANT_TIMEZONE: str = os.getenv("RESTAURANT_TIMEZONE", "")
+    
+    # Largest page POST /recommendations returns
+    RECOMMENDATIONS_MAX_PAGE_SIZE: int = int(os.getenv("RECOMMENDATIONS_MAX_PAGE_SIZE", "100"))
+    
+    # Per-user taste profiles built from order history and refreshed from new orders
+    TASTE_PROFILES_ENABLED: bool = os.getenv("TASTE_PROFILES_ENABLED", "true").lower() == "true"
+    TASTE_PROFILE_REFRESH_SECONDS: float = float(os.getenv("TASTE_PROFILE_REFRESH_SECONDS", "30"))
+    
+    # Shared HTTP client for Node backend calls (src/runtime/backend_client.py)
+    BACKEND_HTTP2: bool = os.getenv("BACKEND_HTTP2", "true").lower() == "true"
+    BACKEND_MAX_CONNECTIONS: int = int(os.getenv("BACKEND_MAX_CONNECTIONS", "20"))
+    BACKEND_MAX_KEEPALIVE: int = int(os.getenv("BACKEND_MAX_KEEPALIVE", "10"))
+    BACKEND_KEEPALIVE_SECONDS: float = float(os.getenv("BACKEND_KEEPALIVE_SECONDS", "30"))
+    BACKEND_TIMEOUT_SECONDS: float = float(os.getenv("BACKEND_TIMEOUT_SECONDS", "10"))
+    
     @classmethod
     def validate_config(cls) -> bool:        
         """Validate that all required configuration is present"""
@@ -47,9 +135,9 @@ class Config:
         return True
     
     @classmethod
-    def get_mongo_client(cls) -> MongoClient:
-        """Get MongoDB client instance"""
-        return MongoClient(cls.MONGODB_URI)
+    def get_mongo_client(cls, **options) -> MongoClient:
+        """Create a MongoDB client instance (tools share the pooled one in src.data.mongo)"""
+        return MongoClient(cls.MONGODB_URI, **options)
     
     @classmethod
     def get_gemini_model(cls):
@@ -65,8 +153,6 @@ class Config:
     @classmethod
     def get_gemini_llm(cls):
         """Get configured CrewAI LLM instance for Gemini - Updated for newer CrewAI versions"""
-        from crewai import LLM
-        
         # Ensure environment variables are set for CrewAI/LiteLLM
         import os
         os.environ["GOOGLE_API_KEY"] = cls.GEMINI_API_KEY
@@ -76,8 +162,17 @@ class Config:
         if "OPENAI_API_KEY" in os.environ:
             del os.environ["OPENAI_API_KEY"]
         
+        # Every call waits on the shared Gemini rate limiter
+        from ..llm.rate_limiter import RateLimitedLLM
+        LLM = RateLimitedLLM
+        if cls.LLM_CACHE_ENABLED:
+            # Same LLM, but repeated prompts are answered from the local completion cache
+            from ..llm.completion_cache import CachedLLM
+            LLM = CachedLLM
+        
         return LLM(
-            model="gemini/gemini-1.5-flash",
+            # Same model as the structured pipeline, so the two modes compare like for like
+            model=cls.get_gemini_model(),
             api_key=cls.GEMINI_API_KEY,
             temperature=cls.TEMPERATURE
         )
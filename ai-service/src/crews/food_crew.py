@@ -3,21 +3,71 @@ Food Recommendation Crew.
 Main orchestrator for the CrewAI food recommendation workflow.
 """
 
+from contextlib import nullcontext
 from crewai import Crew, Process
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import re
+import time
 
 from ..agents.intent_agent import FoodIntentAgent
 from ..agents.discovery_agent import FoodDiscoveryAgent
-from ..agents.evaluator_agent import FoodEvaluatorAgent
 from ..agents.advisor_agent import FoodAdvisorAgent
 from ..tasks.food_tasks import FoodRecommendationTasks
-from ..tools.cart_operations import cart_operations
+from ..config.settings import config
+from ..data.catalog_version import catalog_version
+from ..data.taste_profiles import taste_profiles
+from ..llm.json_output import extract_json, parse_json_response
+from ..llm.rate_limiter import gemini_limiter, stream_field
+from ..pipeline.fast_path import apply_user_context, fast_path, match_candidates
+from ..pipeline.fallbacks import fallback_engine
+from ..pipeline.handles import compact_line, handle_table
+from ..pipeline.hydration import recommendation_hydrator
+from ..pipeline.streaming import ProgressCallback, candidates_event, intent_event, ranking_event, report, token_event
+from ..pipeline.structured import RESPONSE_SCHEMA, candidate_query, structured_pipeline
+from ..ranking.scoring import describe_breakdown, scoring_engine
+from ..search.food_index import FoodIndexSnapshot, build_item_mask, food_index
+from ..search.geo_index import user_location
+from ..utils.metrics import estimate_tokens, stage_metrics
+from ..pipeline.response_cache import cache_key, depersonalize, personalize, response_cache
+from ..runtime.backend_client import backend_client
+from ..tools.cart_operations import cart_action, cart_operations
 from ..tools.food_search import food_search
 from ..tools.restaurant_search import restaurant_search
 
 
+# Shortlist size handed to the advisor
+EVALUATION_TOP_K = 5
+
+# Dishes offered when the advisor returns no usable list of picks
+FALLBACK_TOP_K = 3
+
+# Corrected payloads requested from the advisor when its output fails extraction or validation
+ADVISOR_REPAIR_ATTEMPTS = 1
+
+# Tail of a rejected advisor output quoted back in the repair prompt
+ADVISOR_REPAIR_CONTEXT_CHARS = 4000
+
+# Gemini calls a crew run usually makes (one per task plus a tool round trip)
+CREW_LLM_CALLS = 4
+
+# Crew stage names in task order, reported per stage in /metrics as crew.<stage>
+CREW_STAGES = ('intent', 'discovery', 'advisor')
+
+# Intent agent fields used for ranking, with the values the scoring engine understands
+INTENT_CHOICES = {
+    'mood': ('comfort', 'celebration', 'healthy', 'casual', 'adventurous'),
+    'budget': ('low', 'medium', 'high'),
+    'urgency': ('fast', 'normal', 'relaxed'),
+    'meal_type': ('breakfast', 'lunch', 'dinner', 'snack'),
+    'serving_size': ('individual', 'sharing', 'party'),
+    'health_goals': ('weight_loss', 'muscle_gain', 'maintenance', 'comfort')
+}
+
+# Discovery food line: optional bullet, numbering or quote, then "handle | name | ..."
+DISCOVERY_LINE = re.compile(r'^[\s"\'`\[,*•-]*(?:\d+[.)]\s+)?#?([0-9A-Za-z]+)\s*\|')
+
+
 class FoodRecommendationCrew:
     """
     Main crew orchestrator for food recommendations using CrewAI.
@@ -28,73 +78,415 @@ class FoodRecommendationCrew:
         """Initialize the crew with all agents and tools"""        # Initialize agents
         self.intent_agent = FoodIntentAgent.create()
         self.discovery_agent = FoodDiscoveryAgent.create()
-        self.evaluator_agent = FoodEvaluatorAgent.create()
         self.advisor_agent = FoodAdvisorAgent.create()
         
         # Tools are now available as function imports
     
-    def process_user_query(self, user_message: str, user_context: Dict = None) -> Dict[str, Any]:
+    def process_user_query(
+        self,
+        user_message: str,
+        user_context: Dict = None,
+        progress: Optional[ProgressCallback] = None,
+        snapshot: Optional[FoodIndexSnapshot] = None
+    ) -> Dict[str, Any]:
         """
-        Process user query through the complete CrewAI pipeline
+        Process user query, serving repeat intents from the response cache
         
         Args:
             user_message (str): User's food request message
             user_context (Dict): Additional context about the user (name, id, address, etc.)
+            progress (ProgressCallback): Receives stage events from a pipeline run; cache hits send none
+            snapshot (FoodIndexSnapshot): Catalog snapshot to answer from, pinned for the whole run
+                (agent tools included) and used for the cache key; defaults to the current one
             
         Returns:
             Dict: Complete recommendation response with message, recommendations, and actions
         """
+        with food_index.pinned(snapshot) if snapshot is not None else nullcontext():
+            user_name = user_context.get('name', 'friend') if user_context else 'friend'
+            if not config.RESPONSE_CACHE_ENABLED:
+                return self.run_pipeline(user_message, user_context, progress=progress)[0]
+            
+            try:
+                version = snapshot.version if snapshot is not None else catalog_version.current()
+                key = cache_key(
+                    user_message,
+                    version,
+                    user_location(user_context),
+                    taste_profiles.segment(user_context.get('id') if user_context else None)
+                )
+            except Exception as e:
+                print(f"⚠️ Response cache unavailable: {e}")
+                return self.run_pipeline(user_message, user_context, progress=progress)[0]
+            
+            cached = response_cache.get(key, version)
+            if cached is not None:
+                print(f"⚡ Response cache hit for user: {user_name}")
+                result = personalize(cached, user_name)
+                result['user_context'] = user_context
+                result['processed_at'] = self._get_timestamp()
+                return result
+            
+            result, _ = self.run_pipeline(user_message, user_context, progress=progress)
+            # Fallbacks and empty answers are not worth replaying
+            if not result.get('fallback') and result.get('recommendations'):
+                response_cache.put(key, version, depersonalize(result, user_name))
+            return result
+    
+    def run_pipeline(
+        self,
+        user_message: str,
+        user_context: Dict = None,
+        mode: str = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """
+        Run the selected recommendation pipeline without consulting the response cache
+        
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): Additional context about the user
+            mode (str): "crew" or "structured"; defaults to config.PIPELINE_MODE
+            progress (ProgressCallback): Receives "started" with the mode actually used, then "intent",
+                "candidates" and "ranking" as each stage finishes and "token" events as the message streams
+            
+        Returns:
+            Tuple: (recommendation response with message, recommendations and actions,
+            (prompt tokens, completion tokens) this run recorded)
+        """
+        mode = mode or config.PIPELINE_MODE
+        if mode == 'crew' and not gemini_limiter.admits(CREW_LLM_CALLS):
+            # Not enough Gemini budget for a full crew run: one structured call, or none if the breaker is open
+            print("🚦 Gemini budget too thin for the crew, answering with the structured pipeline")
+            mode = 'structured'
+        report(progress, 'started', {'mode': mode})
+        if mode == 'structured':
+            return structured_pipeline.run(user_message, user_context, progress)
+        return self._run_crew(user_message, user_context, progress)
+    
+    def _run_crew(
+        self,
+        user_message: str,
+        user_context: Dict = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """
+        Process user query through the complete CrewAI pipeline
+        
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): Additional context about the user (name, id, address, etc.)
+            progress (ProgressCallback): Receives "intent" when the intent agent is done, "candidates" and
+                "ranking" from the scoring engine, then the advisor message as "token" events
+            
+        Returns:
+            Tuple: (complete recommendation response, (prompt tokens, completion tokens) CrewAI reported)
+        """
         try:
             # Extract user info for personalization
             user_name = user_context.get('name', 'friend') if user_context else 'friend'
             user_id = user_context.get('id', '') if user_context else ''
+            # Discovery handles and the shortlist both refer to this snapshot
+            snapshot = food_index.get()
             
             # Create tasks for the workflow
-            intent_task = FoodRecommendationTasks.create_intent_analysis_task(user_message, user_context)
+            intent_task = FoodRecommendationTasks.create_intent_analysis_task(
+                user_message,
+                user_context,
+                taste_profiles.describe(user_id)
+            )
             discovery_task = FoodRecommendationTasks.create_food_discovery_task()
-            evaluation_task = FoodRecommendationTasks.create_evaluation_task()
-            recommendation_task = FoodRecommendationTasks.create_recommendation_task(user_name)
             
             # Assign agents to tasks
             intent_task.agent = self.intent_agent
             discovery_task.agent = self.discovery_agent
-            evaluation_task.agent = self.evaluator_agent
-            recommendation_task.agent = self.advisor_agent
             
-            # Set task dependencies (context)
+            # Set task dependencies (context); stages pass compact handle lines, not full item JSON
             discovery_task.context = [intent_task]
-            evaluation_task.context = [intent_task, discovery_task]
-            recommendation_task.context = [intent_task, discovery_task, evaluation_task]            # Create and execute crew
-            crew = Crew(
-                agents=[self.intent_agent, self.discovery_agent, self.evaluator_agent, self.advisor_agent],
-                tasks=[intent_task, discovery_task, evaluation_task, recommendation_task],
-                verbose=True,
-                process=Process.sequential,
-                memory=False,  # Disabled to prevent OpenAI embeddings usage
-                max_rpm=10  # Rate limiting for API calls
-            )
+            finished_at: List[float] = []
+            
+            def intent_done(output: Any) -> None:
+                finished_at.append(time.perf_counter())
+                # Report the intent now rather than after discovery, so a stream shows it early
+                if progress is None:
+                    return
+                try:
+                    intent = self._read_intent(str(getattr(output, 'raw', output)), user_message, snapshot)
+                except Exception as e:
+                    print(f"⚠️ Could not read the intent for the stream: {e}")
+                    return
+                report(progress, 'intent', intent_event(apply_user_context(intent, user_context)))
             
-            # Execute the crew workflow
+            intent_task.callback = intent_done
+            discovery_task.callback = lambda output: finished_at.append(time.perf_counter())
+            
+            # Execute the research half of the workflow: intent analysis, then discovery
             print(f"🚀 Starting food recommendation workflow for user: {user_name}")
-            result = crew.kickoff()
+            started = time.perf_counter()
+            research = self._kickoff([self.intent_agent, self.discovery_agent], [intent_task, discovery_task])
+            research_outputs = self._task_outputs(research)
+            
+            # Ranking is done in code by the scoring engine instead of an evaluator agent: it scores
+            # what discovery found, weighted by the intent agent's reading of the message
+            evaluation, intent, shortlist = self._evaluate_candidates(
+                user_message, user_context, snapshot, research_outputs, progress
+            )
+            recommendation_task = FoodRecommendationTasks.create_recommendation_task(user_name, evaluation)
+            recommendation_task.agent = self.advisor_agent
+            # The intent output carries over from the research run; the shortlist replaces the discovery lines
+            recommendation_task.context = [intent_task]
+            recommendation_task.callback = lambda output: finished_at.append(time.perf_counter())
             
-            # Parse and format the final result
-            formatted_result = self._parse_crew_result(result)
+            # The advisor's message reaches a stream while the model is still writing it
+            def on_token(text: str) -> None:
+                report(progress, 'token', token_event(text))
+            
+            advisor_started = time.perf_counter()
+            with stream_field('message', on_token) if progress is not None else nullcontext():
+                result = self._kickoff([self.advisor_agent], [recommendation_task])
+            prompt_tokens, completion_tokens = self._token_usage(research, result)
+            stage_metrics.record('pipeline.crew', time.perf_counter() - started, prompt_tokens, completion_tokens)
+            self._record_stages(
+                [intent_task, discovery_task, recommendation_task],
+                research_outputs + self._task_outputs(result),
+                {0: started, 2: advisor_started},
+                finished_at
+            )
+            
+            # Parse the advisor's picks and hydrate them from the catalog
+            formatted_result = self._hydrate(self._parse_crew_result(result), snapshot, intent, shortlist)
             
             # Add user context to the result
             formatted_result['user_context'] = user_context
             formatted_result['processed_at'] = self._get_timestamp()
             
             print("✅ Food recommendation workflow completed successfully")
-            return formatted_result
+            return formatted_result, (prompt_tokens, completion_tokens)
             
         except Exception as e:
             print(f"❌ Error in crew workflow: {e}")
-            return self._create_fallback_response(user_message, user_name)
+            return self._create_fallback_response(user_message, user_context), (0, 0)
+    
+    def _kickoff(self, agents: List[Any], tasks: List[Any]) -> Any:
+        """Run tasks as one sequential crew and return its output"""
+        crew = Crew(
+            agents=agents,
+            tasks=tasks,
+            verbose=True,
+            process=Process.sequential,
+            memory=False  # Disabled to prevent OpenAI embeddings usage
+        )
+        return crew.kickoff()
+    
+    def _evaluate_candidates(
+        self,
+        user_message: str,
+        user_context: Optional[Dict],
+        snapshot: FoodIndexSnapshot,
+        research_outputs: List[str],
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Optional[str], Optional[Dict], List[Dict]]:
+        """
+        Rank the discovered candidates with the scoring engine for the advisor
+        
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): User context; address coordinates enable distance ranking and
+                the user id selects the taste profile
+            snapshot (FoodIndexSnapshot): Snapshot the discovery handles were issued from
+            research_outputs (List[str]): Raw outputs of the intent and discovery tasks
+            progress (ProgressCallback): Receives "candidates" once matched and "ranking" once scored
+            
+        Returns:
+            Tuple: (numbered shortlist of handle lines with score breakdowns, intent, ranked items);
+            the shortlist and intent are None and the items empty if ranking is unavailable
+        """
+        intent_output, discovery_output = (list(research_outputs) + ['', ''])[:2]
+        try:
+            started = time.perf_counter()
+            intent = apply_user_context(self._read_intent(intent_output, user_message, snapshot), user_context)
+            matches = self._discovered_candidates(discovery_output, snapshot, intent)
+            if not matches:
+                # Discovery listed nothing usable: search the catalog with the agent's intent instead
+                print("⚠️ No usable discovery results, ranking catalog matches for the analyzed intent")
+                matches = match_candidates(snapshot, intent, candidate_query(intent)) or match_candidates(snapshot, intent, '')
+            report(progress, 'candidates', candidates_event(item for item, _ in matches))
+            ranked = scoring_engine.rank(snapshot, matches, intent, EVALUATION_TOP_K)
+            stage_metrics.record('crew.evaluation', time.perf_counter() - started)
+            report(progress, 'ranking', ranking_event((entry['item'], entry['score']) for entry in ranked))
+        except Exception as e:
+            print(f"⚠️ Scoring engine unavailable: {e}")
+            return None, None, []
+        
+        table = handle_table(snapshot)
+        lines = [
+            f"{position}. {compact_line(table, entry['item'], snapshot.restaurant_for(entry['item']))} | "
+            f"score {entry['score']:.2f} [{describe_breakdown(entry['breakdown'])}]"
+            for position, entry in enumerate(ranked, start=1)
+        ]
+        return '\n'.join(lines) or None, intent, [entry['item'] for entry in ranked]
+    
+    def _read_intent(self, text: str, user_message: str, snapshot: FoodIndexSnapshot) -> Dict:
+        """
+        Build the ranking intent from the intent agent's JSON
+        
+        The rule-based parse of the message supplies what the agent's schema lacks (price
+        ceiling, keywords) and stands in for any field the agent left out or got wrong.
+        
+        Args:
+            text (str): Raw output of the intent task
+            user_message (str): User's food request message
+            snapshot (FoodIndexSnapshot): Snapshot whose categories the parser knows
+            
+        Returns:
+            Dict: Intent in the parser's shape
+        """
+        intent = fast_path.parser_for(snapshot).parse(user_message)
+        analysis = extract_json(text) or {}
+        for field, choices in INTENT_CHOICES.items():
+            value = analysis.get(field)
+            if isinstance(value, str) and value.strip().lower() in choices:
+                intent[field] = value.strip().lower()
+        food_type = analysis.get('foodType')
+        if isinstance(food_type, str) and food_type.strip().lower() not in ('', 'null', 'none'):
+            intent['foodType'] = food_type.strip().lower()
+        preferences = analysis.get('preferences')
+        if isinstance(preferences, list):
+            stated = [str(pref).strip().lower() for pref in preferences if isinstance(pref, str) and pref.strip()]
+            intent['preferences'] = list(dict.fromkeys(intent['preferences'] + stated))
+        if isinstance(analysis.get('emotional_context'), str):
+            intent['emotional_context'] = analysis['emotional_context']
+        return intent
+    
+    def _discovered_candidates(self, text: str, snapshot: FoodIndexSnapshot, intent: Dict) -> List[Tuple[Dict, float]]:
+        """
+        Resolve the discovery task's food lines to catalog items
+        
+        Args:
+            text (str): Raw output of the discovery task, one "handle | name | ..." line per dish
+            snapshot (FoodIndexSnapshot): Snapshot the handles were issued from
+            intent (Dict): Intent whose budget, dietary and availability filters the items must pass
+            
+        Returns:
+            List[Tuple[Dict, float]]: (item, relevance) pairs in discovery order; relevance falls
+            linearly from 1.0 for the first line
+        """
+        table = handle_table(snapshot)
+        item_ids = []
+        for line in text.splitlines():
+            match = DISCOVERY_LINE.match(line)
+            item_id = table.resolve(match.group(1)) if match else None
+            if item_id and item_id not in item_ids:
+                item_ids.append(item_id)
+        
+        mask = build_item_mask(snapshot.catalog, intent, available_only=True)
+        items = []
+        for item in snapshot.items_by_ids(item_ids):
+            row = snapshot.catalog.food_row(item['_id']) if item is not None else None
+            if row is not None and mask[row]:
+                items.append(item)
+        return [(item, 1.0 - position / len(items)) for position, item in enumerate(items)]
+    
+    def _hydrate(
+        self,
+        parsed: Dict[str, Any],
+        snapshot: Optional[FoodIndexSnapshot],
+        intent: Optional[Dict],
+        shortlist: List[Dict]
+    ) -> Dict[str, Any]:
+        """
+        Turn the advisor's handle picks into full recommendations from the catalog
+        
+        Args:
+            parsed (Dict): Advisor JSON: message, recommendations [{id, why_perfect}], actionRequired
+            snapshot (FoodIndexSnapshot): Snapshot the shortlist was ranked from (default: current)
+            intent (Dict): Parsed intent used for the shortlist
+            shortlist (List[Dict]): Ranked items that replace unknown picks, or stand in for a missing list
+            
+        Returns:
+            Dict: The parsed result with hydrated recommendations and a resolved actionRequired
+        """
+        snapshot = snapshot or food_index.get()
+        intent = intent or {'preferences': []}
+        table = handle_table(snapshot)
+        
+        picks = parsed.get('recommendations')
+        recommendations = recommendation_hydrator.hydrate(
+            'crew',
+            snapshot,
+            picks if isinstance(picks, list) else None,
+            intent,
+            shortlist,
+            resolve=table.resolve,
+            default_count=FALLBACK_TOP_K
+        )
+        
+        action = parsed.get('actionRequired')
+        if isinstance(action, dict) and recommendations:
+            # Point the action at a hydrated pick; the top one when the model's id is unknown
+            item_id = table.resolve(action.get('item_id'))
+            top = next((rec for rec in recommendations if rec['id'] == item_id), recommendations[0])
+            action = {
+                'type': action.get('type') or 'add_to_cart',
+                'message': f"Would you like me to add the {top['name']} to your cart?",
+                'item_id': top['id']
+            }
+        else:
+            action = None
+        
+        parsed['recommendations'] = recommendations
+        parsed['actionRequired'] = action
+        return parsed
+    
+    def _record_stages(
+        self,
+        tasks: List[Any],
+        outputs: List[str],
+        starts: Dict[int, float],
+        finished_at: List[float]
+    ) -> None:
+        """
+        Record latency and token estimates per crew stage
+        
+        CrewAI only reports crew-wide token usage, so per-stage prompt tokens are estimated from
+        the task description plus the context outputs it receives, and completion tokens from its output.
+        A stage's latency runs from the previous stage's end, or from `starts` where a kickoff began.
+        """
+        positions = {id(task): position for position, task in enumerate(tasks)}
+        previous = starts.get(0, 0.0)
+        for position, (stage, finished) in enumerate(zip(CREW_STAGES, finished_at)):
+            task = tasks[position]
+            previous = starts.get(position, previous)
+            context = task.context if isinstance(task.context, list) else []
+            received = [
+                outputs[positions[id(source)]] for source in context
+                if positions.get(id(source), len(outputs)) < len(outputs)
+            ]
+            stage_metrics.record(
+                f'crew.{stage}',
+                finished - previous,
+                estimate_tokens(task.description) + sum(estimate_tokens(text) for text in received),
+                estimate_tokens(outputs[position]) if position < len(outputs) else 0
+            )
+            previous = finished
+    
+    @staticmethod
+    def _task_outputs(result: Any) -> List[str]:
+        """Raw text of each task output in a crew result"""
+        return [str(getattr(output, 'raw', output)) for output in getattr(result, 'tasks_output', None) or []]
+    
+    @staticmethod
+    def _token_usage(*results: Any) -> Tuple[int, int]:
+        """Prompt and completion tokens CrewAI reported across crew results"""
+        usages = [getattr(result, 'token_usage', None) for result in results]
+        return (
+            sum(getattr(usage, 'prompt_tokens', 0) or 0 for usage in usages),
+            sum(getattr(usage, 'completion_tokens', 0) or 0 for usage in usages)
+        )
     
     def add_to_cart(self, item_id: str, user_id: str, quantity: int = 1) -> Dict[str, Any]:
         """
-        Add item to cart using the cart tool
+        Add item to cart through the shared backend client (blocking; async callers await cart_action)
         
         Args:
             item_id (str): Food item ID to add
@@ -104,8 +496,7 @@ class FoodRecommendationCrew:
             Dict: Cart operation result
         """
         try:
-            result = self.cart_tool._run("add_item", item_id=item_id, user_id=user_id, quantity=quantity)
-            return result
+            return backend_client.run_sync(cart_action("add_item", item_id=item_id, user_id=user_id, quantity=quantity))
         except Exception as e:
             return {
                 'success': False,
@@ -114,217 +505,95 @@ class FoodRecommendationCrew:
     
     def _parse_crew_result(self, result: Any) -> Dict[str, Any]:
         """
-        Parse and format the crew execution result
+        Extract the advisor's JSON from the crew result and validate it against the response schema
+        
+        An unusable payload (no JSON, or schema violations after repair) re-asks only the advisor
+        for a corrected payload instead of re-running the crew.
         
         Args:
-            result: Raw result from crew execution
+            result: Crew output (CrewOutput, raw string or already-parsed dict)
             
         Returns:
-            Dict: Formatted result with message, recommendations, and actions
+            Dict: Advisor payload: message, recommendations [{id, why_perfect}], actionRequired
         """
-        try:
-            print(f"🔍 DEBUG: Raw crew result type: {type(result)}")
-            print(f"🔍 DEBUG: Raw crew result content: {str(result)[:500]}...")
-            
-            # If result is already a dict, return it
-            if isinstance(result, dict):
-                print("✅ Result is already a dict, returning as-is")
-                return result
-            
-            # If result is a string, try to extract JSON
-            if isinstance(result, str):
-                # First try to parse the entire string as JSON
-                try:
-                    parsed = json.loads(result)
-                    print("✅ Successfully parsed entire result as JSON")
-                    return parsed
-                except json.JSONDecodeError:
-                    print("⚠️ Failed to parse entire result as JSON, searching for JSON block...")
-                
-                # Try to find JSON block in the result string (fixed regex)
-                json_match = re.search(r'\{.*\}', result, re.DOTALL)
-                if json_match:
-                    try:
-                        parsed = json.loads(json_match.group())
-                        print("✅ Successfully extracted and parsed JSON block")
-                        return parsed
-                    except json.JSONDecodeError as e:
-                        print(f"❌ Failed to parse extracted JSON: {e}")
-                
-                # If no valid JSON found, check if it contains structured data
-                if "recommendations" in result.lower() or "actionrequired" in result.lower():
-                    print("⚠️ Result contains recommendation keywords but not valid JSON")
-                
-                # Create structured response from plain text
-                print("📝 Creating structured response from plain text")
-                return {
-                    "message": result.strip(),
-                    "recommendations": [],
-                    "actionRequired": None
-                }
-            
-            # Handle other result types (CrewAI task results, etc.)
-            if hasattr(result, 'raw'):
-                print("🔍 Result has 'raw' attribute, parsing...")
-                return self._parse_crew_result(result.raw)
-            
-            if hasattr(result, 'output'):
-                print("🔍 Result has 'output' attribute, parsing...")
-                return self._parse_crew_result(result.output)
-            
-            # Convert to string and try again
-            result_str = str(result)
-            if result_str != str(result.__class__):  # Avoid infinite recursion
-                print("🔄 Converting result to string and re-parsing...")
-                return self._parse_crew_result(result_str)
-            
-            # Default fallback
-            print("⚠️ Using default fallback response")
-            return {
-                "message": "I found some great options for you! Let me know if you'd like more details.",
-                "recommendations": [],
-                "actionRequired": None
-            }
+        if isinstance(result, dict):
+            text = json.dumps(result, default=str)
+        else:
+            text = getattr(result, 'raw', None) or str(result)
+        payload, errors = parse_json_response(text, RESPONSE_SCHEMA)
+        
+        for _ in range(ADVISOR_REPAIR_ATTEMPTS):
+            if not errors:
+                break
+            print(f"⚠️ Advisor output rejected ({'; '.join(errors[:3])}), asking for a corrected payload")
+            repaired = self._repair_advisor_output(text, errors)
+            if not repaired:
+                break
+            text = repaired
+            corrected, errors = parse_json_response(text, RESPONSE_SCHEMA)
+            payload = corrected if corrected is not None else payload
+        
+        if not errors:
+            return payload
+        
+        # Keep whatever survived; _hydrate offers the shortlist in place of missing picks
+        payload = payload or {}
+        message = payload.get('message')
+        if not isinstance(message, str) or not message.strip():
+            message = "I found some great options for you! Let me know if you'd like more details."
+        picks = payload.get('recommendations')
+        if isinstance(picks, list):
+            picks = [pick for pick in picks if isinstance(pick, dict) and pick.get('id')]
+        return {
+            "message": message,
+            "recommendations": picks if isinstance(picks, list) else None,
+            "actionRequired": {"type": "add_to_cart"}
+        }
+    
+    def _repair_advisor_output(self, text: str, errors: List[str]) -> Optional[str]:
+        """
+        Ask the advisor's LLM, without the rest of the crew, to correct its own payload
+        
+        Args:
+            text (str): The advisor's unusable output
+            errors (List[str]): Extraction or schema errors found in it
             
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON parsing error: {e}")
-            return {
-                "message": "I have some recommendations ready for you! There was a small formatting issue, but I can still help you find great food.",
-                "recommendations": [],
-                "actionRequired": None
-            }
+        Returns:
+            Optional[str]: The corrected completion, or None when the call fails
+        """
+        prompt = f"""Your previous answer could not be used: {'; '.join(errors[:5])}.
+
+Previous answer:
+{text[-ADVISOR_REPAIR_CONTEXT_CHARS:]}
+
+Reply with only the corrected JSON object, keeping the same picks, handles and wording. Schema:
+{json.dumps(RESPONSE_SCHEMA, separators=(',', ':'))}"""
+        started = time.perf_counter()
+        try:
+            completion = self.advisor_agent.llm.call([{"role": "user", "content": prompt}])
         except Exception as e:
-            print(f"❌ Result parsing error: {e}")
-            return self._create_fallback_response("", "friend")
+            print(f"❌ Advisor repair call failed: {e}")
+            return None
+        stage_metrics.record(
+            'crew.advisor_repair',
+            time.perf_counter() - started,
+            estimate_tokens(prompt),
+            estimate_tokens(completion or '')
+        )
+        return completion
     
-    def _create_fallback_response(self, user_message: str, user_name: str) -> Dict[str, Any]:
+    def _create_fallback_response(self, user_message: str, user_context: Dict = None) -> Dict[str, Any]:
         """
         Create a fallback response when the crew workflow fails
         
         Args:
             user_message (str): Original user message
-            user_name (str): User's name
+            user_context (Dict): User context (name, id, address)
             
         Returns:
-            Dict: Fallback response with rich recommendations
+            Dict: Fallback response with precomputed catalog dishes matched to the message
         """
-        # Analyze user message for food preferences
-        user_msg_lower = user_message.lower()
-        
-        # Default recommendations
-        recommendations = [
-            {
-                "id": "spicy_jalapeno_pizza",
-                "name": "Spicy Jalapeno Pizza",
-                "price": 7.09,
-                "restaurant": {
-                    "name": "Pizza Paradise",
-                    "rating": 4.7,
-                    "deliveryTime": "25-35 mins"
-                },
-                "description": "Artisan pizza with fresh toppings on a wood-fired crust. A delicious blend of spicy jalapenos and savory flavors.",
-                "why_perfect": "Budget-friendly, highly-rated, and offers a delicious balance of spice and flavor. Perfect for a satisfying meal.",
-                "tags": ["pizza", "spicy", "vegetarian-option-available", "italian"]
-            },
-            {
-                "id": "bbq_chicken_pizza",
-                "name": "BBQ Chicken Pizza",
-                "price": 8.95,
-                "restaurant": {
-                    "name": "Pizza Paradise",
-                    "rating": 4.6,
-                    "deliveryTime": "25-35 mins"
-                },
-                "description": "Smoky barbecue chicken with red onions, bell peppers and tangy BBQ sauce on a crispy crust.",
-                "why_perfect": "A classic and flavorful choice for those who enjoy BBQ flavors.",
-                "tags": ["pizza", "bbq", "chicken"]
-            },
-            {
-                "id": "margherita_pizza",
-                "name": "Margherita Pizza",
-                "price": 13.81,
-                "restaurant": {
-                    "name": "Pizza Paradise",
-                    "rating": 4.2,
-                    "deliveryTime": "25-35 mins"
-                },
-                "description": "Classic Italian pizza with fresh mozzarella, tomato sauce, and basil leaves on a crispy wood-fired crust.",
-                "why_perfect": "A classic and simple choice for traditional pizza lovers.",
-                "tags": ["pizza", "classic", "vegetarian"]
-            }
-        ]
-        
-        # Customize based on user preferences
-        if any(word in user_msg_lower for word in ["sushi", "japanese", "roll"]):
-            recommendations = [
-                {
-                    "id": "california_roll",
-                    "name": "California Roll",
-                    "price": 8.99,
-                    "restaurant": {
-                        "name": "Sushi Zen",
-                        "rating": 4.8,
-                        "deliveryTime": "15-25 mins"
-                    },
-                    "description": "Crab, avocado and cucumber rolled in rice and nori, topped with sesame seeds.",
-                    "why_perfect": "A perfect introduction to sushi with familiar flavors.",
-                    "tags": ["sushi", "seafood", "fresh"]
-                },
-                {
-                    "id": "salmon_roll",
-                    "name": "Salmon Roll",
-                    "price": 12.99,
-                    "restaurant": {
-                        "name": "Sushi Zen",
-                        "rating": 4.9,
-                        "deliveryTime": "15-25 mins"
-                    },
-                    "description": "Fresh salmon with cucumber and avocado wrapped in seasoned sushi rice and nori.",
-                    "why_perfect": "High-quality fresh salmon that melts in your mouth.",
-                    "tags": ["sushi", "salmon", "premium"]
-                }
-            ]
-        elif any(word in user_msg_lower for word in ["indian", "curry", "spicy"]):
-            recommendations = [
-                {
-                    "id": "chicken_tikka_masala",
-                    "name": "Chicken Tikka Masala",
-                    "price": 16.99,
-                    "restaurant": {
-                        "name": "Spice Garden",
-                        "rating": 4.8,
-                        "deliveryTime": "30-40 mins"
-                    },
-                    "description": "Tender chicken pieces marinated in yogurt and spices, cooked in a rich, creamy tomato-based curry sauce.",
-                    "why_perfect": "The perfect balance of spice and creaminess that's loved worldwide.",
-                    "tags": ["indian", "curry", "chicken", "creamy"]
-                },
-                {
-                    "id": "paneer_butter_masala",
-                    "name": "Paneer Butter Masala",
-                    "price": 14.99,
-                    "restaurant": {
-                        "name": "Spice Garden",
-                        "rating": 4.7,
-                        "deliveryTime": "30-40 mins"
-                    },
-                    "description": "Soft paneer cubes simmered in a rich, creamy tomato and butter sauce with aromatic spices.",
-                    "why_perfect": "A vegetarian delight that's rich, creamy, and absolutely satisfying.",
-                    "tags": ["indian", "vegetarian", "paneer", "creamy"]
-                }
-            ]
-        
-        return {
-            "message": f"Hey {user_name}! 👋 Even though my AI chef is taking a quick break, I've got some amazing recommendations for you! 🍕 Here are some highly-rated dishes that I think you'll absolutely love:",
-            "recommendations": recommendations,
-            "actionRequired": {
-                "type": "add_to_cart",
-                "message": f"Would you like me to add the {recommendations[0]['name']} to your cart?",
-                "item_id": recommendations[0]['id']
-            },
-            "fallback": True,
-            "original_message": user_message
-        }
+        return fallback_engine.respond(user_message, user_context)
     
     def _get_timestamp(self) -> str:
         """Get current timestamp for logging"""
@@ -0,0 +1,230 @@
+"""
+Incremental catalog refresher.
+Pulls only documents changed since the last updatedAt watermark (or tails a change stream)
+and publishes each new catalog snapshot with an atomic reference swap.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from pymongo.errors import PyMongoError
+
+from ..config.settings import config
+from .catalog_store import FOOD_FIELDS, RESTAURANT_FIELDS, CatalogSnapshot, catalog_store
+from .catalog_version import catalog_version, version_stamp
+from .mongo import mongo
+
+
+# Projection per catalog collection key
+PROJECTIONS = {
+    'food_items': {field: 1 for field in FOOD_FIELDS},
+    'restaurants': {field: 1 for field in RESTAURANT_FIELDS}
+}
+
+# Change stream operations that affect the catalog
+WATCHED_OPERATIONS = ['insert', 'update', 'replace', 'delete']
+
+
+class CatalogRefresher:
+    """
+    Background thread that keeps catalog_store current without full reloads.
+    Readers never block: each refresh builds a new snapshot from copies of the columns and
+    swaps it in, so a reader sees either the old catalog or the new one, never a mix.
+    """
+
+    def __init__(self, mode: str, poll_seconds: float, sweep_seconds: float):
+        """
+        Initialize the refresher
+
+        Args:
+            mode (str): "poll" (updatedAt watermark), "change_stream" (falls back to polling
+                when the deployment has no change streams) or "off"
+            poll_seconds (float): Seconds between polls / max wait per change stream batch
+            sweep_seconds (float): Seconds between full _id set comparisons while polling
+        """
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self.sweep_seconds = sweep_seconds
+        self._last_sweep: Dict[str, float] = {key: time.monotonic() for key in PROJECTIONS}
+        self.active_mode: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._resume_token = None
+        # Ids already applied at the current watermark, so $gte polling does not re-apply them
+        self._seen_at_watermark: Dict[str, Set[str]] = {'food_items': set(), 'restaurants': set()}
+        self._counters = {
+            'refreshes': 0, 'food_changes': 0, 'restaurant_changes': 0, 'deletions': 0, 'id_sweeps': 0, 'errors': 0
+        }
+
+    def start(self) -> None:
+        """Load the catalog once and start following changes"""
+        if self.mode == 'off' or self._thread is not None:
+            return
+        snapshot = catalog_store.load(catalog_version.current())
+        for key in PROJECTIONS:
+            watermark = snapshot.watermarks.get(key)
+            self._seen_at_watermark[key] = {
+                str(doc['_id']) for doc in mongo.collection(key).find({'updatedAt': watermark}, {'_id': 1})
+            } if watermark is not None else set()
+        catalog_store.live = True
+        catalog_version.publish(snapshot.version)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following changes; the store goes back to version probing"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 5)
+            self._thread = None
+        catalog_store.live = False
+        catalog_version.publish(None)
+        self.active_mode = None
+
+    def refresh_once(self) -> bool:
+        """
+        Poll for documents changed since the watermark and apply them
+
+        Returns:
+            bool: True if a new snapshot was published
+        """
+        snapshot = catalog_store.peek()
+        changed = {key: self._changed_since(key, snapshot.watermarks.get(key)) for key in PROJECTIONS}
+        deleted = {key: self._deleted_ids(key, snapshot, changed[key]) for key in PROJECTIONS}
+        return self._apply(snapshot, changed, deleted)
+
+    def stats(self) -> Dict:
+        """Get refresh counters and the active mode"""
+        return {'mode': self.mode, 'active_mode': self.active_mode, **self._counters}
+
+    def _run(self) -> None:
+        if self.mode == 'change_stream':
+            try:
+                self._watch()
+            except PyMongoError as e:
+                print(f"⚠️ Catalog change stream unavailable, polling updatedAt instead: {e}")
+            if self._stop.is_set():
+                return
+
+        self.active_mode = 'poll'
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh_once()
+            except Exception as e:
+                self._counters['errors'] += 1
+                print(f"❌ Catalog refresh failed: {e}")
+
+    def _changed_since(self, key: str, watermark) -> List[Dict]:
+        """Documents with updatedAt at or after the watermark that were not applied yet"""
+        query = {'updatedAt': {'$gte': watermark}} if watermark is not None else {'updatedAt': {'$ne': None}}
+        seen = self._seen_at_watermark[key]
+        return [
+            doc for doc in mongo.collection(key).find(query, PROJECTIONS[key])
+            if not (doc.get('updatedAt') == watermark and str(doc['_id']) in seen)
+        ]
+
+    def _deleted_ids(self, key: str, snapshot: CatalogSnapshot, changed: List[Dict]) -> Set[str]:
+        """
+        Find removed documents. updatedAt polling cannot see deletes, so the _id sets are
+        compared when the collection shrank relative to the snapshot, and otherwise every
+        sweep_seconds: an insert and a delete in the same poll window leave the count unchanged.
+        """
+        known = snapshot._food_rows if key == 'food_items' else snapshot._restaurant_rows
+        inserted = sum(1 for doc in changed if str(doc['_id']) not in known)
+        collection = mongo.collection(key)
+        now = time.monotonic()
+        if now - self._last_sweep[key] < self.sweep_seconds and collection.count_documents({}) >= len(known) + inserted:
+            return set()
+        self._last_sweep[key] = now
+        self._counters['id_sweeps'] += 1
+        present = {str(doc['_id']) for doc in collection.find({}, {'_id': 1})}
+        return set(known) - present
+
+    def _apply(self, snapshot: CatalogSnapshot, changed: Dict[str, List[Dict]], deleted: Dict[str, Set[str]]) -> bool:
+        """Build the next snapshot, swap it in and publish its version"""
+        if not any(changed.values()) and not any(deleted.values()):
+            return False
+
+        updated = snapshot.with_changes(
+            food_docs=changed['food_items'],
+            restaurant_docs=changed['restaurants'],
+            deleted_food_ids=deleted['food_items'],
+            deleted_restaurant_ids=deleted['restaurants']
+        )
+        updated.version = version_stamp(
+            {'food_items': updated.food_count, 'restaurants': updated.restaurant_count},
+            updated.watermarks
+        )
+        catalog_store.swap(updated)
+        catalog_version.publish(updated.version)
+
+        for key, docs in changed.items():
+            watermark = updated.watermarks.get(key)
+            at_watermark = {str(doc['_id']) for doc in docs if doc.get('updatedAt') == watermark}
+            if watermark != snapshot.watermarks.get(key):
+                self._seen_at_watermark[key] = at_watermark
+            else:
+                self._seen_at_watermark[key] |= at_watermark
+
+        self._counters['refreshes'] += 1
+        self._counters['food_changes'] += len(changed['food_items'])
+        self._counters['restaurant_changes'] += len(changed['restaurants'])
+        self._counters['deletions'] += len(deleted['food_items']) + len(deleted['restaurants'])
+        print(
+            f"🔄 Catalog refreshed: {len(changed['food_items'])} items, {len(changed['restaurants'])} restaurants "
+            f"changed, {len(deleted['food_items']) + len(deleted['restaurants'])} deleted"
+        )
+        return True
+
+    def _watch(self) -> None:
+        """Tail a change stream on both catalog collections, applying events in batches"""
+        keys = {config.COLLECTIONS[key]: key for key in PROJECTIONS}
+        pipeline = [{'$match': {
+            'ns.coll': {'$in': list(keys)},
+            'operationType': {'$in': WATCHED_OPERATIONS}
+        }}]
+        with mongo.database.watch(
+            pipeline,
+            full_document='updateLookup',
+            resume_after=self._resume_token,
+            max_await_time_ms=int(self.poll_seconds * 1000)
+        ) as stream:
+            self.active_mode = 'change_stream'
+            # Catch up on anything that changed between the initial load and opening the stream
+            self.refresh_once()
+            while not self._stop.is_set():
+                changed = {key: {} for key in PROJECTIONS}
+                deleted = {key: set() for key in PROJECTIONS}
+                change = stream.try_next()
+                while change is not None:
+                    key = keys[change['ns']['coll']]
+                    doc_id = str(change['documentKey']['_id'])
+                    document = change.get('fullDocument')
+                    if change['operationType'] == 'delete' or document is None:
+                        changed[key].pop(doc_id, None)
+                        deleted[key].add(doc_id)
+                    else:
+                        deleted[key].discard(doc_id)
+                        changed[key][doc_id] = document
+                    self._resume_token = stream.resume_token
+                    change = stream.try_next()
+                try:
+                    self._apply(
+                        catalog_store.peek(),
+                        {key: list(docs.values()) for key, docs in changed.items()},
+                        deleted
+                    )
+                except Exception as e:
+                    self._counters['errors'] += 1
+                    print(f"❌ Catalog change stream apply failed: {e}")
+
+
+# Global instance started by the FastAPI lifespan
+catalog_refresher = CatalogRefresher(
+    mode=config.CATALOG_REFRESH_MODE,
+    poll_seconds=config.CATALOG_REFRESH_SECONDS,
+    sweep_seconds=config.CATALOG_DELETE_SWEEP_SECONDS
+)
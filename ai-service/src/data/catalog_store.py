@@ -0,0 +1,634 @@
+"""
+Columnar catalog store.
+Loads fooditems and restaurants once per catalog version into NumPy columns and interned
+string tables; lookups, filters and joins run over the arrays.
+"""
+
+import copy
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .catalog_version import catalog_version
+from .mongo import mongo
+
+
+# Fields read from MongoDB; nutritionInfo, allergens, images etc. are never materialized
+FOOD_FIELDS = (
+    'name', 'description', 'price', 'category', 'restaurant', 'rating', 'tags', 'keywords',
+    'ingredients', 'calories', 'spiceLevel', 'isVegetarian', 'isVegan', 'isGlutenFree', 'isAvailable',
+    'updatedAt'
+)
+RESTAURANT_FIELDS = (
+    'name', 'location', 'cuisine', 'rating', 'deliveryTime', 'keywords', 'priceRange', 'isOpen',
+    'deliveryFee', 'minimumOrder', 'specialOffers', 'hours', 'isActive', 'updatedAt'
+)
+
+# Per-row columns by table, used when merging incremental changes into a new snapshot
+FOOD_ARRAYS = (
+    'food_name', 'category', 'restaurant_row', 'price', 'rating', 'calories', 'spice_level',
+    'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_available'
+)
+FOOD_RAGGED = ('tags', 'keywords', 'ingredients')
+FOOD_LISTS = ('food_ids', 'description')
+RESTAURANT_ARRAYS = (
+    'restaurant_name', 'restaurant_rating', 'delivery_time', 'delivery_minutes', 'price_range',
+    'latitude', 'longitude', 'is_open', 'is_active', 'delivery_fee', 'minimum_order'
+)
+RESTAURANT_RAGGED = ('restaurant_cuisine', 'restaurant_keywords', 'special_offers')
+RESTAURANT_LISTS = ('restaurant_ids', 'address', 'hours')
+
+# FoodItem.spiceLevel enum, mildest first
+SPICE_LEVELS = ('None', 'Mild', 'Medium', 'Hot', 'Very Hot')
+
+# Assumed delivery time when a restaurant does not state one
+DEFAULT_DELIVERY_MINUTES = 35.0
+
+_MINUTES_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+
+
+@lru_cache(maxsize=256)
+def parse_delivery_minutes(delivery_time: Optional[str]) -> float:
+    """
+    Parse a restaurant deliveryTime string into minutes
+
+    Args:
+        delivery_time (str): Value such as "30-45 mins", "20 min" or "1 hour"
+
+    Returns:
+        float: Midpoint of the stated range in minutes, or the default when unparseable
+    """
+    if not delivery_time:
+        return DEFAULT_DELIVERY_MINUTES
+    numbers = [float(value) for value in _MINUTES_PATTERN.findall(str(delivery_time))]
+    if not numbers:
+        return DEFAULT_DELIVERY_MINUTES
+    minutes = sum(numbers[:2]) / len(numbers[:2])
+    if 'hour' in str(delivery_time).lower():
+        minutes *= 60
+    return minutes
+
+
+class StringTable:
+    """Interned strings: each distinct value is stored once and referenced by an int32 code"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._lowered: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def copy(self) -> 'StringTable':
+        """Independent copy; codes stay valid and new values can be added without touching the original"""
+        table = StringTable()
+        table.values = list(self.values)
+        table._lowered = list(self._lowered)
+        table._codes = dict(self._codes)
+        return table
+
+    def intern(self, value) -> int:
+        """Get the code for a value, adding it on first sight"""
+        value = '' if value is None else str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+            self._lowered.append(value.lower())
+        return code
+
+    def codes_equal(self, values: Iterable[str]) -> np.ndarray:
+        """Codes whose value equals any of the given values (case-insensitive)"""
+        wanted = {value.lower() for value in values}
+        return np.array([code for code, value in enumerate(self._lowered) if value in wanted], dtype=np.int32)
+
+    def codes_containing(self, needle: str) -> np.ndarray:
+        """Codes whose value contains the needle (case-insensitive)"""
+        needle = needle.lower()
+        return np.array([code for code, value in enumerate(self._lowered) if needle in value], dtype=np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the distinct strings"""
+        return sum(sys.getsizeof(value) for value in self.values)
+
+
+class RaggedStrings:
+    """Per-row string lists (tags, cuisines) as one flat code array plus row offsets"""
+
+    def __init__(self, rows: Sequence[Optional[Sequence[str]]], table: StringTable):
+        lengths = [len(row or []) for row in rows]
+        self.table = table
+        self.offsets = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.codes = np.array([table.intern(value) for row in rows for value in row or []], dtype=np.int32)
+        self.owners = np.repeat(np.arange(len(rows), dtype=np.int32), lengths)
+
+    @classmethod
+    def select(cls, parts: Sequence['RaggedStrings'], rows: np.ndarray, table: StringTable) -> 'RaggedStrings':
+        """
+        Build a column from rows of other columns by slicing their code arrays (no strings are touched)
+
+        Args:
+            parts (Sequence[RaggedStrings]): Source columns whose codes are valid in table
+            rows (np.ndarray): Row numbers into the parts laid end to end (parts[1] row 0 follows
+                the last row of parts[0])
+            table (StringTable): String table of the new column
+
+        Returns:
+            RaggedStrings: Column whose row i is source row rows[i]
+        """
+        starts = np.concatenate([
+            part.offsets[:-1].astype(np.int64) + base
+            for part, base in zip(parts, np.cumsum([0] + [len(part.codes) for part in parts[:-1]]))
+        ])
+        lengths = np.concatenate([np.diff(part.offsets) for part in parts]).astype(np.int64)
+        codes = np.concatenate([part.codes for part in parts])
+        rows = np.asarray(rows, dtype=np.int64)
+
+        column = cls([], table)
+        column.offsets = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum(lengths[rows], out=column.offsets[1:])
+        # Position of every kept code: its row's source start plus its index within the row
+        picked = np.repeat(starts[rows] - column.offsets[:-1], lengths[rows]) + np.arange(column.offsets[-1])
+        column.codes = codes[picked].astype(np.int32)
+        column.owners = np.repeat(np.arange(len(rows), dtype=np.int32), lengths[rows])
+        return column
+
+    def row(self, index: int) -> List[str]:
+        """Materialize one row's strings"""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return [self.table.values[code] for code in self.codes[start:end]]
+
+    def rows_with_any(self, codes: np.ndarray) -> np.ndarray:
+        """Boolean row mask: True where the row holds at least one of the codes"""
+        mask = np.zeros(len(self.offsets) - 1, dtype=bool)
+        mask[self.owners[np.isin(self.codes, codes)]] = True
+        return mask
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the offset and code arrays"""
+        return self.offsets.nbytes + self.codes.nbytes + self.owners.nbytes
+
+
+class CatalogSnapshot:
+    """
+    Immutable columnar view of the catalog at one version.
+    Food row i and restaurant row j are positions in every column of their table.
+    """
+
+    def __init__(
+        self,
+        food_docs: List[Dict],
+        restaurant_docs: List[Dict],
+        version: str = '',
+        tables: Optional[Tuple[StringTable, StringTable, StringTable]] = None,
+        restaurant_rows: Optional[Dict[str, int]] = None
+    ):
+        """
+        Build the columns from raw documents
+
+        Args:
+            food_docs (List[Dict]): fooditems documents (projected to FOOD_FIELDS)
+            restaurant_docs (List[Dict]): restaurants documents (projected to RESTAURANT_FIELDS)
+            version (str): Catalog version the documents were read at
+            tables (Tuple): names/labels/terms string tables to intern into (fresh ones by default)
+            restaurant_rows (Dict[str, int]): Restaurant id -> row map used to join food rows
+                (defaults to the restaurants in restaurant_docs)
+        """
+        self.version = version
+        self.built_at = time.time()
+        names, labels, terms = tables or (StringTable(), StringTable(), StringTable())
+        # Set on snapshots produced by with_changes(): the previous version and, per food row,
+        # the previous row it was carried over from unchanged (-1 for new or updated rows)
+        self.parent_version: Optional[str] = None
+        self.food_origin: Optional[np.ndarray] = None
+        self.watermarks = {
+            'food_items': _newest(doc.get('updatedAt') for doc in food_docs),
+            'restaurants': _newest(doc.get('updatedAt') for doc in restaurant_docs)
+        }
+
+        # Restaurants
+        self.restaurant_ids = [str(doc['_id']) for doc in restaurant_docs]
+        self._restaurant_rows = {rid: row for row, rid in enumerate(self.restaurant_ids)}
+        locations = [doc.get('location') or {} for doc in restaurant_docs]
+        self.restaurant_name = np.array([names.intern(doc.get('name')) for doc in restaurant_docs], dtype=np.int32)
+        self.restaurant_cuisine = RaggedStrings([doc.get('cuisine') for doc in restaurant_docs], labels)
+        self.restaurant_keywords = RaggedStrings([doc.get('keywords') for doc in restaurant_docs], terms)
+        self.restaurant_rating = _floats(doc.get('rating') for doc in restaurant_docs)
+        self.delivery_time = np.array(
+            [labels.intern(doc.get('deliveryTime') or '30-45 mins') for doc in restaurant_docs], dtype=np.int32
+        )
+        self.delivery_minutes = np.array(
+            [parse_delivery_minutes(labels.values[code]) for code in self.delivery_time], dtype=np.float32
+        )
+        self.price_range = np.array([labels.intern(doc.get('priceRange') or '$$') for doc in restaurant_docs], dtype=np.int32)
+        self.latitude = _floats((loc.get('latitude') for loc in locations), dtype=np.float64, missing=np.nan)
+        self.longitude = _floats((loc.get('longitude') for loc in locations), dtype=np.float64, missing=np.nan)
+        self.address = [loc.get('address', '') for loc in locations]
+        self.is_open = np.array([doc.get('isOpen', True) for doc in restaurant_docs], dtype=bool)
+        self.is_active = np.array([doc.get('isActive', True) for doc in restaurant_docs], dtype=bool)
+        self.delivery_fee = _floats((doc.get('deliveryFee', 3.99) for doc in restaurant_docs))
+        self.minimum_order = _floats((doc.get('minimumOrder', 15.0) for doc in restaurant_docs))
+        self.special_offers = RaggedStrings([doc.get('specialOffers') for doc in restaurant_docs], terms)
+        self.hours = [doc.get('hours') or {} for doc in restaurant_docs]
+
+        # Food items
+        self.food_ids = [str(doc['_id']) for doc in food_docs]
+        self._food_rows = {fid: row for row, fid in enumerate(self.food_ids)}
+        self.food_name = np.array([names.intern(doc.get('name')) for doc in food_docs], dtype=np.int32)
+        self.description = [doc.get('description', '') for doc in food_docs]
+        self.category = np.array([labels.intern(doc.get('category') or 'Food') for doc in food_docs], dtype=np.int32)
+        join = self._restaurant_rows if restaurant_rows is None else restaurant_rows
+        self.restaurant_row = np.array(
+            [join.get(str(doc.get('restaurant')), -1) for doc in food_docs], dtype=np.int32
+        )
+        self.price = _floats(doc.get('price') for doc in food_docs)
+        self.rating = _floats(doc.get('rating') for doc in food_docs)
+        self.calories = _floats((doc.get('calories') for doc in food_docs), missing=np.nan)
+        self.spice_level = np.array(
+            [SPICE_LEVELS.index(doc.get('spiceLevel')) if doc.get('spiceLevel') in SPICE_LEVELS else 0 for doc in food_docs],
+            dtype=np.int8
+        )
+        self.is_vegetarian = np.array([bool(doc.get('isVegetarian')) for doc in food_docs], dtype=bool)
+        self.is_vegan = np.array([bool(doc.get('isVegan')) for doc in food_docs], dtype=bool)
+        self.is_gluten_free = np.array([bool(doc.get('isGlutenFree')) for doc in food_docs], dtype=bool)
+        self.is_available = np.array([doc.get('isAvailable', True) for doc in food_docs], dtype=bool)
+        self.tags = RaggedStrings([doc.get('tags') for doc in food_docs], terms)
+        self.keywords = RaggedStrings([doc.get('keywords') for doc in food_docs], terms)
+        self.ingredients = RaggedStrings([doc.get('ingredients') for doc in food_docs], terms)
+
+        self.names = names
+        self.labels = labels
+        self.terms = terms
+
+    # -- incremental changes ----------------------------------------------------
+
+    def with_changes(
+        self,
+        food_docs: Sequence[Dict] = (),
+        restaurant_docs: Sequence[Dict] = (),
+        deleted_food_ids: Iterable[str] = (),
+        deleted_restaurant_ids: Iterable[str] = (),
+        version: str = ''
+    ) -> 'CatalogSnapshot':
+        """
+        Build the next snapshot by applying changed documents to copies of the columns
+
+        Updated rows keep their position, inserted rows are appended and deleted rows are
+        dropped; this snapshot is left untouched for readers still holding it.
+
+        Args:
+            food_docs (Sequence[Dict]): Inserted or updated fooditems documents
+            restaurant_docs (Sequence[Dict]): Inserted or updated restaurants documents
+            deleted_food_ids (Iterable[str]): Removed food item ids
+            deleted_restaurant_ids (Iterable[str]): Removed restaurant ids
+            version (str): Version of the resulting snapshot
+
+        Returns:
+            CatalogSnapshot: New snapshot
+        """
+        tables = (self.names.copy(), self.labels.copy(), self.terms.copy())
+        merged = copy.copy(self)
+        merged.names, merged.labels, merged.terms = tables
+        merged.version = version
+        merged.built_at = time.time()
+        merged.parent_version = self.version
+
+        restaurant_delta = CatalogSnapshot([], list(restaurant_docs), tables=tables)
+        restaurant_keep = self._merge_rows(
+            merged, restaurant_delta, 'restaurant_ids', RESTAURANT_ARRAYS, RESTAURANT_RAGGED,
+            RESTAURANT_LISTS, set(map(str, deleted_restaurant_ids))
+        )[0]
+        merged._restaurant_rows = {rid: row for row, rid in enumerate(merged.restaurant_ids)}
+
+        # Re-point carried-over food rows at the restaurants' new positions; the extra last
+        # slot maps the "unknown restaurant" row -1 to itself
+        remap = np.full(self.restaurant_count + 1, -1, dtype=np.int32)
+        remap[restaurant_keep] = np.arange(len(restaurant_keep), dtype=np.int32)
+        carried = copy.copy(self)
+        carried.restaurant_row = remap[self.restaurant_row]
+
+        food_delta = CatalogSnapshot(list(food_docs), [], tables=tables, restaurant_rows=merged._restaurant_rows)
+        _, merged.food_origin = carried._merge_rows(
+            merged, food_delta, 'food_ids', FOOD_ARRAYS, FOOD_RAGGED, FOOD_LISTS,
+            set(map(str, deleted_food_ids))
+        )
+        merged._food_rows = {fid: row for row, fid in enumerate(merged.food_ids)}
+
+        merged.watermarks = {
+            key: _newest([self.watermarks.get(key), food_delta.watermarks[key], restaurant_delta.watermarks[key]])
+            for key in self.watermarks
+        }
+        return merged
+
+    def _merge_rows(
+        self,
+        target: 'CatalogSnapshot',
+        delta: 'CatalogSnapshot',
+        ids_name: str,
+        arrays: Sequence[str],
+        ragged: Sequence[str],
+        lists: Sequence[str],
+        deleted: set
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Write one table's merged columns onto target; returns (kept old rows, row origins)"""
+        old_ids = getattr(self, ids_name)
+        delta_ids = getattr(delta, ids_name)
+        keep = np.array([row for row, row_id in enumerate(old_ids) if row_id not in deleted], dtype=np.int64)
+        position = {old_ids[row]: new_row for new_row, row in enumerate(keep)}
+        updates = [(position[row_id], row) for row, row_id in enumerate(delta_ids) if row_id in position]
+        inserts = np.array(
+            [row for row, row_id in enumerate(delta_ids) if row_id not in position and row_id not in deleted],
+            dtype=np.int64
+        )
+        update_at = np.array([at for at, _ in updates], dtype=np.int64)
+        update_from = np.array([row for _, row in updates], dtype=np.int64)
+
+        for name in arrays:
+            column = np.concatenate([getattr(self, name)[keep], getattr(delta, name)[inserts]])
+            column[update_at] = getattr(delta, name)[update_from]
+            setattr(target, name, column)
+        for name in lists:
+            old_values, new_values = getattr(self, name), getattr(delta, name)
+            column = [old_values[row] for row in keep] + [new_values[row] for row in inserts]
+            for at, row in updates:
+                column[at] = new_values[row]
+            setattr(target, name, column)
+        # Ragged columns are spliced as code slices: kept rows, then inserts, with updates in place
+        sources = np.concatenate([keep, len(old_ids) + inserts])
+        sources[update_at] = len(old_ids) + update_from
+        for name in ragged:
+            old_values, new_values = getattr(self, name), getattr(delta, name)
+            setattr(target, name, RaggedStrings.select([old_values, new_values], sources, new_values.table))
+
+        origin = np.concatenate([keep, np.full(len(inserts), -1, dtype=np.int64)])
+        origin[update_at] = -1
+        return keep, origin
+
+    # -- lookups and joins ----------------------------------------------------
+
+    @property
+    def food_count(self) -> int:
+        """Number of food rows"""
+        return len(self.food_ids)
+
+    @property
+    def restaurant_count(self) -> int:
+        """Number of restaurant rows"""
+        return len(self.restaurant_ids)
+
+    def food_row(self, item_id: str) -> Optional[int]:
+        """Row of a food item id, or None"""
+        return self._food_rows.get(str(item_id))
+
+    def restaurant_row_of(self, restaurant_id: str) -> Optional[int]:
+        """Row of a restaurant id, or None"""
+        return self._restaurant_rows.get(str(restaurant_id))
+
+    def food_restaurant_rating(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rating of each food row's restaurant (0 when the restaurant is unknown)"""
+        return self.join_restaurant_column(self.restaurant_rating, rows, 0.0)
+
+    def food_delivery_minutes(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Delivery minutes of each food row's restaurant (default when unknown)"""
+        return self.join_restaurant_column(self.delivery_minutes, rows, DEFAULT_DELIVERY_MINUTES)
+
+    def join_restaurant_column(self, column: np.ndarray, rows: Optional[np.ndarray], default: float) -> np.ndarray:
+        """Gather a restaurant column for food rows through restaurant_row"""
+        joined = self.restaurant_row if rows is None else self.restaurant_row[rows]
+        values = np.full(len(joined), default, dtype=np.float32)
+        known = joined >= 0
+        values[known] = column[joined[known]]
+        return values
+
+    # -- filters --------------------------------------------------------------
+
+    def food_mask(
+        self,
+        min_price: float = 0,
+        max_price: float = float('inf'),
+        flags: Sequence[str] = (),
+        tag_groups: Sequence[Iterable[str]] = (),
+        available_only: bool = False
+    ) -> np.ndarray:
+        """
+        Vectorized food filter
+
+        Args:
+            min_price (float): Inclusive lower price bound
+            max_price (float): Inclusive upper price bound
+            flags (Sequence[str]): Required boolean fields (isVegetarian, isVegan, isGlutenFree)
+            tag_groups (Sequence): Each group must match at least one of the row's tags
+            available_only (bool): Drop items marked unavailable
+
+        Returns:
+            np.ndarray: Boolean mask over food rows
+        """
+        mask = (self.price >= min_price) & (self.price <= max_price)
+        columns = {'isVegetarian': self.is_vegetarian, 'isVegan': self.is_vegan, 'isGlutenFree': self.is_gluten_free}
+        for flag in flags:
+            mask &= columns[flag]
+        for group in tag_groups:
+            mask &= self.tags.rows_with_any(self.terms.codes_equal(group))
+        if available_only:
+            mask &= self.is_available
+        return mask
+
+    def food_term_mask(self, tokens: Iterable[str]) -> np.ndarray:
+        """Food rows whose category, tags or name mention any of the tokens"""
+        mask = np.zeros(self.food_count, dtype=bool)
+        for token in tokens:
+            mask |= np.isin(self.category, self.labels.codes_containing(token))
+            mask |= np.isin(self.food_name, self.names.codes_containing(token))
+            mask |= self.tags.rows_with_any(self.terms.codes_equal([token]))
+        return mask
+
+    def restaurant_text_mask(self, query: str) -> np.ndarray:
+        """Restaurants whose name or any cuisine contains the query (case-insensitive)"""
+        if not query:
+            return np.ones(self.restaurant_count, dtype=bool)
+        return (
+            np.isin(self.restaurant_name, self.names.codes_containing(query))
+            | self.restaurant_cuisine.rows_with_any(self.labels.codes_containing(query))
+        )
+
+    def top_food_rows(self, limit: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows ordered by item rating, then restaurant rating, then price"""
+        rows = np.arange(self.food_count) if mask is None else np.flatnonzero(mask)
+        order = np.lexsort((self.price[rows], -self.food_restaurant_rating(rows), -self.rating[rows]))
+        return rows[order[:limit]]
+
+    def top_restaurant_rows(self, limit: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows ordered by restaurant rating"""
+        rows = np.arange(self.restaurant_count) if mask is None else np.flatnonzero(mask)
+        return rows[np.argsort(-self.restaurant_rating[rows], kind='stable')[:limit]]
+
+    # -- materialization ------------------------------------------------------
+
+    def food_document(self, row: int) -> Dict:
+        """Compact document for one food row (same keys as the raw fooditems fields in use)"""
+        restaurant = self.restaurant_row[row]
+        calories = self.calories[row]
+        return {
+            '_id': self.food_ids[row],
+            'name': self.names.values[self.food_name[row]],
+            'description': self.description[row],
+            'price': to_number(self.price[row]),
+            'category': self.labels.values[self.category[row]],
+            'restaurant': self.restaurant_ids[restaurant] if restaurant >= 0 else None,
+            'rating': to_number(self.rating[row]),
+            'tags': self.tags.row(row),
+            'keywords': self.keywords.row(row),
+            'ingredients': self.ingredients.row(row),
+            'calories': None if np.isnan(calories) else int(calories),
+            'spiceLevel': SPICE_LEVELS[self.spice_level[row]],
+            'isVegetarian': bool(self.is_vegetarian[row]),
+            'isVegan': bool(self.is_vegan[row]),
+            'isGlutenFree': bool(self.is_gluten_free[row]),
+            'isAvailable': bool(self.is_available[row])
+        }
+
+    def restaurant_document(self, row: int) -> Dict:
+        """Compact document for one restaurant row"""
+        return {
+            '_id': self.restaurant_ids[row],
+            'name': self.names.values[self.restaurant_name[row]],
+            'cuisine': self.restaurant_cuisine.row(row),
+            'keywords': self.restaurant_keywords.row(row),
+            'rating': to_number(self.restaurant_rating[row]),
+            'deliveryTime': self.labels.values[self.delivery_time[row]],
+            'priceRange': self.labels.values[self.price_range[row]],
+            'location': {
+                'latitude': float(self.latitude[row]),
+                'longitude': float(self.longitude[row]),
+                'address': self.address[row]
+            },
+            'isOpen': bool(self.is_open[row]),
+            'isActive': bool(self.is_active[row]),
+            'deliveryFee': to_number(self.delivery_fee[row]),
+            'minimumOrder': to_number(self.minimum_order[row]),
+            'specialOffers': self.special_offers.row(row),
+            'hours': self.hours[row]
+        }
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        Report memory held by the columns
+
+        Returns:
+            Dict[str, int]: Row counts and bytes per column group
+        """
+        arrays = [value for value in vars(self).values() if isinstance(value, np.ndarray)]
+        ragged = [value for value in vars(self).values() if isinstance(value, RaggedStrings)]
+        array_bytes = sum(array.nbytes for array in arrays) + sum(column.nbytes for column in ragged)
+        string_bytes = self.names.nbytes + self.labels.nbytes + self.terms.nbytes
+        text_bytes = sum(sys.getsizeof(text) for text in self.description + self.address)
+        return {
+            'food_rows': self.food_count,
+            'restaurant_rows': self.restaurant_count,
+            'array_bytes': array_bytes,
+            'string_table_bytes': string_bytes,
+            'text_bytes': text_bytes,
+            'total_bytes': array_bytes + string_bytes + text_bytes
+        }
+
+
+def to_number(value) -> float:
+    """Plain float from a float32 cell, rounded to cents so 4.2 does not print as 4.19999"""
+    return round(float(value), 2)
+
+
+def _newest(values: Iterable):
+    """Latest non-null timestamp, or None"""
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def _floats(values: Iterable, dtype=np.float32, missing: float = 0.0) -> np.ndarray:
+    """Build a float column, mapping None to the missing value"""
+    return np.array([missing if value is None else value for value in values], dtype=dtype)
+
+
+class CatalogStore:
+    """
+    Process-wide holder of the current catalog snapshot.
+    Readers grab the snapshot reference; reloads and incremental refreshes build a new one
+    off to the side and swap it in with a single reference assignment.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._load_lock = threading.Lock()
+        # True while a CatalogRefresher keeps the snapshot current; get() then never probes
+        self.live = False
+
+    def get(self) -> CatalogSnapshot:
+        """
+        Get the current snapshot, reloading it on first use or when the catalog version changes
+
+        Returns:
+            CatalogSnapshot: Current catalog columns
+        """
+        snapshot = self._snapshot
+        if self.live and snapshot is not None:
+            return snapshot
+        try:
+            version = catalog_version.current()
+        except Exception:
+            # Keep serving the last good snapshot while the database is unreachable
+            if snapshot is not None:
+                return snapshot
+            raise
+
+        if snapshot is None or snapshot.version != version:
+            with self._load_lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot.version != version:
+                    snapshot = self.load(version)
+        return snapshot
+
+    def peek(self) -> Optional[CatalogSnapshot]:
+        """Get the last loaded snapshot without touching the database (None before the first load)"""
+        return self._snapshot
+
+    def swap(self, snapshot: CatalogSnapshot) -> None:
+        """Publish a snapshot built elsewhere (e.g. by the incremental refresher)"""
+        self._snapshot = snapshot
+
+    def load(self, version: Optional[str] = None) -> CatalogSnapshot:
+        """
+        Read both catalog collections and swap in a fresh snapshot
+
+        Args:
+            version (str): Catalog version the load corresponds to
+
+        Returns:
+            CatalogSnapshot: Newly built snapshot
+        """
+        food_docs = list(mongo.collection('food_items').find({}, {field: 1 for field in FOOD_FIELDS}))
+        restaurant_docs = list(mongo.collection('restaurants').find({}, {field: 1 for field in RESTAURANT_FIELDS}))
+        snapshot = CatalogSnapshot(food_docs, restaurant_docs, version or catalog_version.current())
+        self._snapshot = snapshot
+        footprint = snapshot.memory_footprint()
+        print(
+            f"🗄️ Catalog store loaded: {footprint['food_rows']} items, {footprint['restaurant_rows']} restaurants, "
+            f"{footprint['total_bytes'] / 1024:.1f} KiB"
+        )
+        return snapshot
+
+    def stats(self) -> Dict:
+        """Get the loaded version and memory footprint"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {'loaded': False}
+        return {'loaded': True, 'live': self.live, 'version': snapshot.version, **snapshot.memory_footprint()}
+
+
+# Global instance; the single source for search indexes, search tools and fallbacks
+catalog_store = CatalogStore()
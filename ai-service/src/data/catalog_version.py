@@ -0,0 +1,109 @@
+"""
+Catalog version stamp.
+Tracks changes to the fooditems and restaurants collections so caches and indexes can invalidate.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..config.settings import config
+from .mongo import mongo
+
+
+class CatalogVersion:
+    """
+    Cheap change detector for the catalog collections.
+    The stamp combines document counts and the newest updatedAt of both collections, polled
+    at most once per poll interval; bump() forces a new version immediately.
+    While a catalog refresher is running it publishes the version of the snapshot it swapped
+    in, and that published stamp is served instead of probing.
+    """
+
+    def __init__(self, poll_seconds: float):
+        """
+        Initialize the tracker
+
+        Args:
+            poll_seconds (float): Minimum seconds between database probes
+        """
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._stamp: Optional[str] = None
+        self._checked_at = 0.0
+        self._local_bumps = 0
+        self._published: Optional[str] = None
+
+    def current(self) -> str:
+        """
+        Get the current catalog version
+
+        Returns:
+            str: Opaque version stamp; changes whenever the catalog changes
+        """
+        published = self._published
+        if published is not None:
+            return published
+        if self._stamp is None or time.time() - self._checked_at > self.poll_seconds:
+            with self._lock:
+                if self._stamp is None or time.time() - self._checked_at > self.poll_seconds:
+                    self._stamp = self._probe()
+                    self._checked_at = time.time()
+        return self._stamp
+
+    def bump(self) -> str:
+        """
+        Force a new version, e.g. after the service itself applied catalog changes
+
+        Returns:
+            str: New version stamp
+        """
+        with self._lock:
+            self._local_bumps += 1
+            self._stamp = self._probe()
+            self._checked_at = time.time()
+            return self._stamp
+
+    def publish(self, stamp: Optional[str]) -> None:
+        """
+        Serve a version computed by the catalog refresher instead of probing
+
+        Args:
+            stamp (str): Version of the snapshot just swapped in; None resumes probing
+        """
+        self._published = stamp
+
+    def _probe(self) -> str:
+        """Read counts and latest updatedAt of both catalog collections"""
+        counts = {}
+        watermarks = {}
+        for name in ('food_items', 'restaurants'):
+            collection = mongo.collection(name)
+            latest = collection.find_one({}, {'updatedAt': 1}, sort=[('updatedAt', -1)])
+            watermarks[name] = latest.get('updatedAt') if latest else None
+            counts[name] = collection.estimated_document_count()
+        return version_stamp(counts, watermarks, self._local_bumps)
+
+
+def version_stamp(counts: Dict[str, int], watermarks: Dict[str, Any], bumps: int = 0) -> str:
+    """
+    Format a catalog version from per-collection counts and newest updatedAt
+
+    Args:
+        counts (Dict[str, int]): Document count per catalog collection key
+        watermarks (Dict[str, Any]): Newest updatedAt per catalog collection key
+        bumps (int): Local bump counter
+
+    Returns:
+        str: Version stamp
+    """
+    parts = []
+    for name in ('food_items', 'restaurants'):
+        updated_at = watermarks.get(name)
+        stamp = updated_at.isoformat() if hasattr(updated_at, 'isoformat') else str(updated_at)
+        parts.append(f"{counts.get(name, 0)}@{stamp}")
+    return f"{'|'.join(parts)}#{bumps}"
+
+
+# Global instance shared by caches and indexes
+catalog_version = CatalogVersion(poll_seconds=config.CATALOG_VERSION_POLL_SECONDS)
@@ -0,0 +1,167 @@
+"""
+Shared MongoDB data-access layer.
+Owns one long-lived, pooled client for the whole process.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from pymongo import MongoClient, monitoring
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from ..config.settings import config
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool event listener that keeps running counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checked_out": 0,
+            "checkout_failures": 0,
+            "pools_cleared": 0
+        }
+
+    def _increment(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def pool_created(self, event): pass
+
+    def pool_ready(self, event): pass
+
+    def pool_cleared(self, event):
+        self._increment("pools_cleared")
+
+    def pool_closed(self, event): pass
+
+    def connection_created(self, event):
+        self._increment("connections_created")
+
+    def connection_ready(self, event): pass
+
+    def connection_closed(self, event):
+        self._increment("connections_closed")
+
+    def connection_check_out_started(self, event): pass
+
+    def connection_check_out_failed(self, event):
+        self._increment("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._increment("checked_out")
+
+    def connection_checked_in(self, event):
+        self._increment("checked_out", -1)
+
+
+class MongoDataAccess:
+    """
+    Process-wide MongoDB access point.
+    Connects lazily on first use; the FastAPI lifespan connects and closes it explicitly.
+    """
+
+    def __init__(self):
+        self._client: Optional[MongoClient] = None
+        self._lock = threading.Lock()
+        self._listener = PoolStatsListener()
+        self._connected_at: Optional[float] = None
+
+    def connect(self) -> MongoClient:
+        """
+        Create the shared client if it does not exist yet
+
+        Returns:
+            MongoClient: Shared pooled client
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = config.get_mongo_client(
+                        maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+                        minPoolSize=config.MONGO_MIN_POOL_SIZE,
+                        maxIdleTimeMS=config.MONGO_MAX_IDLE_TIME_MS,
+                        serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                        event_listeners=[self._listener]
+                    )
+                    self._connected_at = time.time()
+        return self._client
+
+    def close(self) -> None:
+        """Close the shared client and release all pooled connections"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+                self._connected_at = None
+
+    @property
+    def client(self) -> MongoClient:
+        return self.connect()
+
+    @property
+    def database(self) -> Database:
+        return self.client[config.DB_NAME]
+
+    def collection(self, name: str) -> Collection:
+        """
+        Get a collection handle from the shared client
+
+        Args:
+            name (str): Key of config.COLLECTIONS (e.g. "food_items") or a raw collection name
+
+        Returns:
+            Collection: Collection handle backed by the shared pool
+        """
+        return self.database[config.COLLECTIONS.get(name, name)]
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics
+
+        Returns:
+            Dict: Pool settings and event counters
+        """
+        counters = self._listener.snapshot()
+        return {
+            "connected": self._client is not None,
+            "uptime_seconds": round(time.time() - self._connected_at, 1) if self._connected_at else 0,
+            "max_pool_size": config.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": config.MONGO_MIN_POOL_SIZE,
+            "open_connections": counters["connections_created"] - counters["connections_closed"],
+            **counters
+        }
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Probe the database with a ping command
+
+        Returns:
+            Dict: Probe status and round-trip latency
+        """
+        started = time.perf_counter()
+        try:
+            self.client.admin.command("ping")
+            return {
+                "status": "healthy",
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        except Exception as e:
+            return {
+                "status": "unhealthy",
+                "error": str(e),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+
+
+# Global instance shared by all tools
+mongo = MongoDataAccess()
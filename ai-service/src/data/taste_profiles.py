@@ -0,0 +1,418 @@
+"""
+Materialized per-user taste profiles.
+Built once from the orders collection, then kept current from orders changed since the
+last updatedAt watermark, so personalization never queries MongoDB on the request path.
+"""
+
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from .catalog_store import CatalogSnapshot, catalog_store
+from .mongo import mongo
+
+
+# Order fields the profiles are built from
+ORDER_PROJECTION = {'user': 1, 'items': 1, 'restaurant': 1, 'orderStatus': 1, 'totalAmount': 1, 'createdAt': 1, 'updatedAt': 1}
+
+# Orders in these states do not count towards a profile
+IGNORED_STATUSES = ('cancelled',)
+
+# Log-spaced item price buckets; percentiles are read off the per-user histogram
+PRICE_BUCKETS = np.geomspace(1.0, 500.0, 64)
+
+# Item flags tracked as dietary signals (intent preference -> food item flag)
+DIETARY_FLAGS = {
+    'vegetarian': 'is_vegetarian',
+    'vegan': 'is_vegan',
+    'gluten-free': 'is_gluten_free'
+}
+
+# Share of ordered items that must carry a flag before it counts as a standing preference
+DIETARY_SIGNAL_SHARE = 0.8
+
+# Orders needed before a profile is trusted for ranking
+MIN_PROFILE_ORDERS = 2
+
+# Entries kept in the favourite cuisine / restaurant / category lists
+TOP_N = 5
+
+
+class CountedOrder(NamedTuple):
+    """What one order contributed to its user's accumulator, resolved against the catalog once"""
+    user_id: str
+    spend: float
+    restaurant_id: str
+    cuisines: Tuple[str, ...]
+    items: int
+    # (price bucket, quantity) per priced line
+    prices: Tuple[Tuple[int, int], ...]
+    # (category, quantity) and (dietary preference, quantity) per resolved line
+    categories: Tuple[Tuple[str, int], ...]
+    dietary: Tuple[Tuple[str, int], ...]
+    created: Optional[datetime]
+
+    @classmethod
+    def resolve(cls, order: Dict[str, Any], catalog: CatalogSnapshot) -> 'CountedOrder':
+        """
+        Resolve an order's cuisines, categories and dietary flags
+
+        Args:
+            order (Dict): Order document (ORDER_PROJECTION fields)
+            catalog (CatalogSnapshot): Catalog the order is counted against
+
+        Returns:
+            CountedOrder: The order's contribution, kept so it can be backed out exactly
+        """
+        restaurant_id = str(order.get('restaurant'))
+        restaurant = catalog.restaurant_row_of(restaurant_id)
+        cuisines = tuple(
+            cuisine.lower() for cuisine in catalog.restaurant_cuisine.row(restaurant)
+        ) if restaurant is not None else ()
+
+        items = 0
+        prices, categories, dietary = [], [], []
+        for line in order.get('items') or []:
+            quantity = int(line.get('quantity') or 1)
+            items += quantity
+            price = float(line.get('price') or 0)
+            if price > 0:
+                prices.append((int(np.searchsorted(PRICE_BUCKETS, price)), quantity))
+            row = catalog.food_row(str(line.get('foodItem')))
+            if row is None:
+                continue
+            categories.append((catalog.labels.values[catalog.category[row]].lower(), quantity))
+            for preference, column in DIETARY_FLAGS.items():
+                if getattr(catalog, column)[row]:
+                    dietary.append((preference, quantity))
+
+        created = order.get('createdAt')
+        return cls(
+            user_id=str(order.get('user')),
+            spend=float(order.get('totalAmount') or 0),
+            restaurant_id=restaurant_id,
+            cuisines=cuisines,
+            items=items,
+            prices=tuple(prices),
+            categories=tuple(categories),
+            dietary=tuple(dietary),
+            created=created if isinstance(created, datetime) else None
+        )
+
+
+class TasteAccumulator:
+    """Running order statistics of one user; every update is O(items in the order)"""
+
+    __slots__ = ('orders', 'spend', 'items', 'cuisines', 'restaurants', 'categories',
+                 'dietary', 'prices', 'first_order', 'last_order')
+
+    def __init__(self):
+        self.orders = 0
+        self.spend = 0.0
+        self.items = 0
+        self.cuisines: Counter = Counter()
+        self.restaurants: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.dietary: Counter = Counter()
+        self.prices = np.zeros(len(PRICE_BUCKETS) + 1, dtype=np.int32)
+        self.first_order: Optional[datetime] = None
+        self.last_order: Optional[datetime] = None
+
+    def add(self, order: CountedOrder, sign: int = 1) -> None:
+        """
+        Fold one order in (sign=1) or back out (sign=-1)
+
+        Args:
+            order (CountedOrder): The order's resolved contribution; backing out uses the one
+                recorded when it was added, so later catalog edits do not skew the counts
+            sign (int): 1 to add the order, -1 to remove it
+        """
+        self.orders += sign
+        self.spend += sign * order.spend
+        self.items += sign * order.items
+        self.restaurants[order.restaurant_id] += sign
+        for cuisine in order.cuisines:
+            self.cuisines[cuisine] += sign
+        for bucket, quantity in order.prices:
+            self.prices[bucket] += sign * quantity
+        for category, quantity in order.categories:
+            self.categories[category] += sign * quantity
+        for preference, quantity in order.dietary:
+            self.dietary[preference] += sign * quantity
+
+        if sign > 0 and order.created is not None:
+            self.first_order = min(self.first_order or order.created, order.created)
+            self.last_order = max(self.last_order or order.created, order.created)
+
+    def price_percentile(self, percentile: float) -> Optional[float]:
+        """Approximate item price at a percentile (upper edge of the bucket it falls in)"""
+        counts = np.maximum(self.prices, 0)
+        total = counts.sum()
+        if total == 0:
+            return None
+        bucket = int(np.searchsorted(np.cumsum(counts), total * percentile / 100.0))
+        return round(float(PRICE_BUCKETS[min(bucket, len(PRICE_BUCKETS) - 1)]), 2)
+
+
+class TasteProfileStore:
+    """
+    In-memory taste profiles for every user with orders.
+    A background thread applies new and updated orders; readers get the last computed
+    profile dict, recomputed only for users whose orders changed.
+    """
+
+    def __init__(self, enabled: bool, poll_seconds: float):
+        """
+        Initialize the store without loading anything
+
+        Args:
+            enabled (bool): Build profiles and follow order changes
+            poll_seconds (float): Seconds between order polls
+        """
+        self.enabled = enabled
+        self.poll_seconds = poll_seconds
+        self.loaded = False
+        self._accumulators: Dict[str, TasteAccumulator] = {}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        # Counted orders and what each contributed, so status changes and re-polls are applied once
+        self._counted: Dict[str, CountedOrder] = {}
+        self._watermark = None
+        self._seen_at_watermark: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {'orders_applied': 0, 'orders_removed': 0, 'refreshes': 0, 'errors': 0}
+
+    def start(self) -> None:
+        """Build every profile from the orders collection and start following changes"""
+        if not self.enabled or self._thread is not None:
+            return
+        started = time.perf_counter()
+        self._apply(mongo.collection('orders').find({}, ORDER_PROJECTION))
+        self.loaded = True
+        print(f"👤 Taste profiles built: {len(self._accumulators)} users from {len(self._counted)} orders "
+              f"in {time.perf_counter() - started:.2f}s")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="taste-profiles", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following order changes (profiles stay readable)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 5)
+            self._thread = None
+
+    def refresh_once(self) -> int:
+        """
+        Apply orders created or updated since the watermark
+
+        Returns:
+            int: Number of orders applied
+        """
+        query = {'updatedAt': {'$gte': self._watermark}} if self._watermark is not None else {}
+        orders = [
+            order for order in mongo.collection('orders').find(query, ORDER_PROJECTION)
+            if not (order.get('updatedAt') == self._watermark and str(order['_id']) in self._seen_at_watermark)
+        ]
+        applied = self._apply(orders)
+        if applied:
+            self._counters['refreshes'] += 1
+        return applied
+
+    def profile(self, user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's taste profile
+
+        Args:
+            user_id (str): User id string
+
+        Returns:
+            Optional[Dict]: Profile (cuisine affinities, price percentiles, dietary signals,
+            favourite restaurants, cadence), or None when the user has no counted orders
+        """
+        if not user_id:
+            return None
+        profile = self._profiles.get(str(user_id))
+        if profile is None:
+            with self._lock:
+                accumulator = self._accumulators.get(str(user_id))
+                if accumulator is None or accumulator.orders <= 0:
+                    return None
+                profile = self._build_profile(str(user_id), accumulator)
+                self._profiles[str(user_id)] = profile
+        return profile
+
+    def signals(self, user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Ranking signals for a user (intent['taste']), or None when there is too little history
+
+        Args:
+            user_id (str): User id string
+
+        Returns:
+            Optional[Dict]: cuisine affinities, favourite restaurant shares, typical price band
+            and standing dietary preferences
+        """
+        profile = self.profile(user_id)
+        if profile is None or profile['orders'] < MIN_PROFILE_ORDERS:
+            return None
+        return profile['signals']
+
+    def segment(self, user_id: Optional[str]) -> Optional[str]:
+        """
+        Coarse taste segment for cache and coalescing keys: users in the same segment rank alike
+
+        Args:
+            user_id (str): User id string
+
+        Returns:
+            Optional[str]: e.g. "italian|p4|vegetarian", or None without a usable profile
+        """
+        signals = self.signals(user_id)
+        if signals is None:
+            return None
+        top_cuisine = max(signals['cuisines'], key=signals['cuisines'].get) if signals['cuisines'] else '-'
+        price_band = f"p{round(math.log2(signals['price_p50']))}" if signals['price_p50'] else 'p-'
+        return '|'.join([top_cuisine, price_band, *signals['dietary']])
+
+    def describe(self, user_id: Optional[str]) -> Optional[str]:
+        """One-line summary of a user's ordering habits for LLM prompts"""
+        profile = self.profile(user_id)
+        if profile is None:
+            return None
+        parts = [f"{profile['orders']} past orders"]
+        if profile['favorite_cuisines']:
+            parts.append(f"usually orders {', '.join(entry['cuisine'] for entry in profile['favorite_cuisines'][:3])}")
+        if profile['price']['p50'] is not None:
+            parts.append(f"typical dish around ${profile['price']['p50']:.0f}")
+        if profile['dietary_preferences']:
+            parts.append(f"mostly {' and '.join(profile['dietary_preferences'])}")
+        return '; '.join(parts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get profile counts and refresh counters"""
+        return {
+            'enabled': self.enabled,
+            'loaded': self.loaded,
+            'users': len(self._accumulators),
+            'orders': len(self._counted),
+            **self._counters
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh_once()
+            except Exception as e:
+                self._counters['errors'] += 1
+                print(f"❌ Taste profile refresh failed: {e}")
+
+    def _apply(self, orders: Iterable[Dict[str, Any]]) -> int:
+        """Fold orders into their users' accumulators and invalidate those users' profiles"""
+        catalog = catalog_store.get()
+        applied = 0
+        with self._lock:
+            for order in orders:
+                order_id = str(order['_id'])
+                user_id = str(order.get('user'))
+                counts = order.get('orderStatus') not in IGNORED_STATUSES
+                counted = order_id in self._counted
+                if counts and not counted:
+                    contribution = CountedOrder.resolve(order, catalog)
+                    self._accumulators.setdefault(user_id, TasteAccumulator()).add(contribution)
+                    self._counted[order_id] = contribution
+                    self._counters['orders_applied'] += 1
+                elif counted and not counts:
+                    contribution = self._counted.pop(order_id)
+                    self._accumulators[contribution.user_id].add(contribution, sign=-1)
+                    self._profiles.pop(contribution.user_id, None)
+                    self._counters['orders_removed'] += 1
+                else:
+                    self._track_watermark(order)
+                    continue
+                self._profiles.pop(user_id, None)
+                self._track_watermark(order)
+                applied += 1
+        return applied
+
+    def _track_watermark(self, order: Dict[str, Any]) -> None:
+        updated = order.get('updatedAt')
+        if updated is None:
+            return
+        if self._watermark is None or updated > self._watermark:
+            self._watermark = updated
+            self._seen_at_watermark = {str(order['_id'])}
+        elif updated == self._watermark:
+            self._seen_at_watermark.add(str(order['_id']))
+
+    def _build_profile(self, user_id: str, accumulator: TasteAccumulator) -> Dict[str, Any]:
+        """Turn an accumulator into the served profile dict"""
+        catalog = catalog_store.get()
+        cuisine_total = sum(count for count in accumulator.cuisines.values() if count > 0) or 1
+        affinities = {
+            cuisine: round(count / cuisine_total, 3)
+            for cuisine, count in accumulator.cuisines.most_common() if count > 0
+        }
+        restaurant_total = max(accumulator.orders, 1)
+        favourite_restaurants = []
+        for restaurant_id, count in accumulator.restaurants.most_common(TOP_N):
+            if count <= 0:
+                continue
+            row = catalog.restaurant_row_of(restaurant_id)
+            favourite_restaurants.append({
+                'id': restaurant_id,
+                'name': catalog.names.values[catalog.restaurant_name[row]] if row is not None else None,
+                'orders': count,
+                'share': round(count / restaurant_total, 3)
+            })
+        items = max(accumulator.items, 1)
+        dietary_shares = {preference: round(accumulator.dietary[preference] / items, 3) for preference in DIETARY_FLAGS}
+        dietary_preferences = [
+            preference for preference, share in dietary_shares.items() if share >= DIETARY_SIGNAL_SHARE
+        ]
+        price = {f'p{p}': accumulator.price_percentile(p) for p in (25, 50, 75)}
+
+        mean_days = None
+        if accumulator.orders > 1 and accumulator.first_order and accumulator.last_order:
+            span = (accumulator.last_order - accumulator.first_order).total_seconds() / 86400
+            mean_days = round(span / (accumulator.orders - 1), 2)
+
+        return {
+            'user_id': user_id,
+            'orders': accumulator.orders,
+            'average_order_value': round(accumulator.spend / accumulator.orders, 2),
+            'cuisine_affinity': affinities,
+            'favorite_cuisines': [
+                {'cuisine': cuisine, 'affinity': affinity} for cuisine, affinity in list(affinities.items())[:TOP_N]
+            ],
+            'favorite_categories': [category for category, count in accumulator.categories.most_common(TOP_N) if count > 0],
+            'favorite_restaurants': favourite_restaurants,
+            'price': price,
+            'dietary_shares': dietary_shares,
+            'dietary_preferences': dietary_preferences,
+            'cadence': {
+                'first_order': accumulator.first_order.isoformat() if accumulator.first_order else None,
+                'last_order': accumulator.last_order.isoformat() if accumulator.last_order else None,
+                'mean_days_between_orders': mean_days
+            },
+            'signals': {
+                'cuisines': dict(list(affinities.items())[:TOP_N]),
+                'restaurants': {entry['id']: entry['share'] for entry in favourite_restaurants},
+                'price_p25': price['p25'],
+                'price_p50': price['p50'],
+                'price_p75': price['p75'],
+                'dietary': dietary_preferences
+            }
+        }
+
+
+# Global instance started by the FastAPI lifespan and read by the intent stage and the ranker
+taste_profiles = TasteProfileStore(enabled=config.TASTE_PROFILES_ENABLED, poll_seconds=config.TASTE_PROFILE_REFRESH_SECONDS)
@@ -0,0 +1,192 @@
+"""
+Persistent LLM completion cache.
+Content-addressed SQLite store for agent task completions, plus the CrewAI LLM that uses it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import config
+from .rate_limiter import RateLimitedLLM
+
+
+# Only refresh an entry's last_used stamp when it is older than this (keeps hits read-only)
+LAST_USED_RESOLUTION_SECONDS = 60
+
+# Evict down to this fraction of the size budget so eviction does not run on every insert
+EVICTION_TARGET = 0.9
+
+
+def completion_key(model: str, temperature: Optional[float], stop: Any, messages: List[Dict[str, Any]]) -> str:
+    """
+    Hash everything that determines a completion
+
+    Args:
+        model (str): LiteLLM model name
+        temperature (float): Sampling temperature
+        stop (Any): Stop sequences
+        messages (List[Dict]): Chat messages sent to the model
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {'model': model, 'temperature': temperature, 'stop': stop, 'messages': messages},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CompletionStore:
+    """
+    SQLite-backed completion cache bounded by total completion size.
+    Least recently used entries are evicted once the size budget is exceeded.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Open (or create) the cache file
+
+        Args:
+            path (str): SQLite database file
+            max_bytes (int): Budget for stored completion text
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                completion TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used)")
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a completion
+
+        Args:
+            key (str): Key from completion_key()
+
+        Returns:
+            Optional[str]: Cached completion, or None on miss
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT completion, last_used FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+            now = time.time()
+            if now - row[1] > LAST_USED_RESOLUTION_SECONDS:
+                self._db.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+            self._counters['hits'] += 1
+            return row[0]
+
+    def put(self, key: str, model: str, completion: str) -> None:
+        """
+        Store a completion, evicting old entries if over budget
+
+        Args:
+            key (str): Key from completion_key()
+            model (str): Model that produced the completion
+            completion (str): Completion text
+        """
+        size = len(completion.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM completions WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, completion, size, now, now)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._counters['stores'] += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            Dict: Counters, entry count and stored bytes
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'entries': entries,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hit_rate': round(self._counters['hits'] / lookups, 3) if lookups else 0.0
+            }
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to the eviction target (lock held)"""
+        target = self.max_bytes * EVICTION_TARGET
+        rows = self._db.execute("SELECT key, size FROM completions ORDER BY last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+        self._db.executemany("DELETE FROM completions WHERE key = ?", doomed)
+        self._counters['evictions'] += len(doomed)
+
+
+class CachedLLM(RateLimitedLLM):
+    """CrewAI LLM that answers repeated prompts from the completion store; misses go through the rate limiter"""
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = None) -> str:
+        """
+        Return a cached completion or call the model and cache its answer
+
+        Args:
+            messages (List[Dict]): Chat messages for the model
+            callbacks (List): CrewAI/LiteLLM callbacks
+
+        Returns:
+            str: Completion text
+        """
+        key = completion_key(self.model, self.temperature, self.stop, messages)
+        cached = completion_store.get(key)
+        if cached is not None:
+            return cached
+
+        completion = super().call(messages, callbacks=callbacks or [])
+        if completion:
+            completion_store.put(key, self.model, completion)
+        return completion
+
+
+# Global instance shared by every agent's LLM
+completion_store = CompletionStore(
+    path=config.LLM_CACHE_PATH,
+    max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024
+)
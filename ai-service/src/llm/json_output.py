@@ -0,0 +1,348 @@
+"""
+JSON extraction for LLM output.
+A single left-to-right scan finds the first balanced top-level object in free text (prose,
+code fences and trailing chatter around it are ignored) and repairs the usual LLM defects on
+the way: trailing commas, Python literals, single quotes, raw newlines in strings and output
+truncated mid-object. Payloads are then checked against a Gemini-style response schema.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Bare words accepted outside strings and their JSON spelling
+LITERALS = {
+    'true': 'true', 'false': 'false', 'null': 'null',
+    'True': 'true', 'False': 'false', 'None': 'null'
+}
+
+# Number or bare word starting at a scan position
+TOKEN_PATTERN = re.compile(r'-?(?:\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+)|[A-Za-z_]+')
+
+# Escapes kept as-is inside strings
+JSON_ESCAPES = set('"\\/bfnrtu')
+
+# Characters that must be escaped inside a JSON string
+CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+# Schema type names and the Python types they accept
+SCHEMA_TYPES = {
+    'OBJECT': (dict,),
+    'ARRAY': (list,),
+    'STRING': (str,),
+    'NUMBER': (int, float),
+    'INTEGER': (int,),
+    'BOOLEAN': (bool,)
+}
+
+
+class _Invalid(Exception):
+    """Candidate object is not JSON-like; the scan moves on to the next '{'"""
+
+
+def _scan_object(text: str, start: int) -> Tuple[str, int]:
+    """
+    Scan one object starting at text[start] == '{' and emit it as repaired JSON
+
+    Returns:
+        Tuple[str, int]: Repaired JSON text and the index just past the object (len(text) when truncated)
+
+    Raises:
+        _Invalid: When the text between the braces is not JSON-like
+    """
+    out: List[str] = []
+    # Open containers as [closer, expecting]; expecting is key/colon/value/comma
+    stack: List[List[str]] = []
+    # Last point where closing every open container yields a valid document
+    safe_length, safe_closers = 0, ''
+    pending_comma = False
+    position, length = start, len(text)
+
+    def mark_safe() -> None:
+        nonlocal safe_length, safe_closers
+        safe_length = len(out)
+        safe_closers = ''.join(closer for closer, _ in reversed(stack))
+
+    def value_done() -> None:
+        if stack:
+            stack[-1][1] = 'comma'
+            mark_safe()
+
+    while position < length:
+        char = text[position]
+        if char.isspace():
+            position += 1
+            continue
+        if not stack and out:
+            break
+        expecting = stack[-1][1] if stack else 'value'
+
+        if char in '{[':
+            if expecting != 'value':
+                raise _Invalid()
+            if pending_comma:
+                out.append(',')
+                pending_comma = False
+            out.append(char)
+            stack.append(['}', 'key'] if char == '{' else [']', 'value'])
+            mark_safe()
+            position += 1
+        elif char in '}]':
+            closer, _ = stack.pop()
+            if char != closer or expecting in ('colon',) or (expecting == 'value' and closer == '}'):
+                raise _Invalid()
+            # A pending comma before a closer is a trailing comma: dropped
+            pending_comma = False
+            out.append(closer)
+            position += 1
+            if stack:
+                value_done()
+        elif char == ',':
+            if expecting != 'comma' or pending_comma:
+                raise _Invalid()
+            pending_comma = True
+            stack[-1][1] = 'key' if stack[-1][0] == '}' else 'value'
+            position += 1
+        elif char == ':':
+            if expecting != 'colon':
+                raise _Invalid()
+            out.append(':')
+            stack[-1][1] = 'value'
+            position += 1
+        elif char in '"\'':
+            if expecting not in ('key', 'value'):
+                raise _Invalid()
+            quote, chunks = char, ['"']
+            position += 1
+            while position < length and text[position] != quote:
+                current = text[position]
+                if current == '\\' and position + 1 < length:
+                    escaped = text[position + 1]
+                    if escaped == quote and quote == "'":
+                        chunks.append("'")
+                    elif escaped in JSON_ESCAPES:
+                        chunks.append(current + escaped)
+                    else:
+                        chunks.append('\\\\' + escaped)
+                    position += 2
+                    continue
+                if current == '"':
+                    chunks.append('\\"')
+                elif current in CONTROL_ESCAPES:
+                    chunks.append(CONTROL_ESCAPES[current])
+                elif current != '\\':
+                    chunks.append(current)
+                position += 1
+            if position >= length:
+                # Truncated inside a string: drop the partial member
+                break
+            if pending_comma:
+                out.append(',')
+                pending_comma = False
+            out.append(''.join(chunks) + '"')
+            position += 1
+            if expecting == 'key':
+                stack[-1][1] = 'colon'
+            else:
+                value_done()
+        else:
+            match = TOKEN_PATTERN.match(text, position)
+            if match is None or expecting != 'value':
+                raise _Invalid()
+            token = match.group()
+            if match.end() >= length:
+                # Truncated number or literal
+                break
+            if token[0].isalpha() or token[0] == '_':
+                if token not in LITERALS:
+                    raise _Invalid()
+                token = LITERALS[token]
+            elif token.startswith('.') or token.startswith('-.'):
+                token = token.replace('.', '0.', 1)
+            elif token.endswith('.'):
+                token += '0'
+            if pending_comma:
+                out.append(',')
+                pending_comma = False
+            out.append(token)
+            position = match.end()
+            value_done()
+
+    if stack:
+        return ''.join(out[:safe_length]) + safe_closers, length
+    return ''.join(out), position
+
+
+def extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the first JSON object from LLM output, repairing it where needed
+
+    Args:
+        text (str): Model output: bare JSON, fenced JSON or JSON embedded in prose
+
+    Returns:
+        Optional[Dict]: The first object that parses, or None when the text holds none
+    """
+    if not isinstance(text, str):
+        return None
+    position = text.find('{')
+    while position != -1:
+        try:
+            repaired, end = _scan_object(text, position)
+            value = json.loads(repaired)
+            if isinstance(value, dict):
+                return value
+        except (_Invalid, IndexError, ValueError):
+            end = position + 1
+        position = text.find('{', max(end, position + 1))
+    return None
+
+
+def validate_schema(value: Any, schema: Dict[str, Any], path: str = '$') -> List[str]:
+    """
+    Check a parsed value against a Gemini-style response schema
+
+    Args:
+        value: Parsed JSON value
+        schema (Dict): Schema with type, properties, required, items and nullable
+        path (str): Location of the value, used in error messages
+
+    Returns:
+        List[str]: One message per violation; empty when the value conforms
+    """
+    if value is None:
+        return [] if schema.get('nullable') else [f"{path} must not be null"]
+    expected = SCHEMA_TYPES.get(schema.get('type', '').upper())
+    if expected is None:
+        return []
+    if not isinstance(value, expected) or (isinstance(value, bool) and bool not in expected):
+        return [f"{path} must be {schema['type'].lower()}"]
+
+    errors = []
+    if isinstance(value, dict):
+        for key in schema.get('required', []):
+            if key not in value:
+                errors.append(f"{path}.{key} is required")
+        for key, child in schema.get('properties', {}).items():
+            if key in value:
+                errors.extend(validate_schema(value[key], child, f"{path}.{key}"))
+    elif isinstance(value, list) and 'items' in schema:
+        for index, item in enumerate(value):
+            errors.extend(validate_schema(item, schema['items'], f"{path}[{index}]"))
+    return errors
+
+
+def parse_json_response(text: str, schema: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Extract and validate a JSON payload in one go
+
+    Args:
+        text (str): Model output
+        schema (Dict): Response schema the payload must satisfy
+
+    Returns:
+        Tuple[Optional[Dict], List[str]]: The payload (None when no object was found) and its schema errors
+    """
+    payload = extract_json(text)
+    if payload is None:
+        return None, ["no JSON object found"]
+    return payload, validate_schema(payload, schema)
+
+
+class JsonFieldStream:
+    """
+    Incremental decoder for one top-level string field of a JSON object that arrives in chunks.
+    Text before the first '{' is skipped, so prose or a "Final Answer:" prefix does no harm; the
+    field's value is handed out as it is decoded, before the rest of the object has arrived.
+    """
+
+    def __init__(self, field: str):
+        """
+        Initialize the decoder
+
+        Args:
+            field (str): Key of the top-level string value to stream, e.g. "message"
+        """
+        self.field = field
+        self._depth = 0
+        self._expect_key = False
+        self._in_string = False
+        self._key: Optional[List[str]] = None
+        self._last_key: Optional[str] = None
+        self._target = False
+        self._escape = ''
+        self._high_surrogate = ''
+        self._done = False
+
+    def feed(self, text: str) -> str:
+        """
+        Scan the next chunk of output
+
+        Args:
+            text (str): Next piece of model output
+
+        Returns:
+            str: Newly decoded characters of the field's value ('' when the chunk held none)
+        """
+        out: List[str] = []
+        for char in text or '':
+            if self._done:
+                break
+            if self._in_string:
+                self._string_char(char, out)
+            elif char in '{[':
+                self._depth += 1
+                self._expect_key = char == '{' and self._depth == 1
+            elif char in '}]' and self._depth:
+                self._depth -= 1
+                # The top-level object closed without the field
+                self._done = self._depth == 0
+            elif char == ',' and self._depth == 1:
+                self._expect_key = True
+            elif char == '"' and self._depth:
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key = []
+                    self._expect_key = False
+                else:
+                    self._target = self._depth == 1 and self._last_key == self.field
+        return ''.join(out)
+
+    def _string_char(self, char: str, out: List[str]) -> None:
+        if self._escape:
+            self._escape += char
+            if self._escape[1] == 'u' and len(self._escape) < 6:
+                return
+            try:
+                decoded = json.loads(f'"{self._escape}"')
+            except ValueError:
+                decoded = ''
+            self._escape = ''
+            self._append(decoded, out)
+        elif char == '\\':
+            self._escape = char
+        elif char == '"':
+            self._in_string = False
+            if self._key is not None:
+                self._last_key = ''.join(self._key)
+                self._key = None
+            elif self._target:
+                self._done = True
+        else:
+            self._append(char, out)
+
+    def _append(self, text: str, out: List[str]) -> None:
+        if self._key is not None:
+            self._key.append(text)
+            return
+        if not self._target:
+            return
+        # A \\uXXXX surrogate pair arrives as two escapes; hold the high half until its partner
+        text = self._high_surrogate + text
+        self._high_surrogate = ''
+        if text and '\ud800' <= text[-1] <= '\udbff':
+            self._high_surrogate = text[-1]
+            text = text[:-1]
+        if text:
+            out.append(text.encode('utf-16', 'surrogatepass').decode('utf-16'))
@@ -0,0 +1,484 @@
+"""
+Adaptive Gemini rate limiter and circuit breaker.
+A token bucket shared by every LLM call in the process and, through a locked state file, by every
+worker on the host. A 429 halves the rate and caps it at the request rate that triggered it;
+successes win the rate back. Repeated 429s open a breaker so callers switch to non-LLM paths
+up front instead of waiting for requests to fail.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import litellm
+from crewai import LLM
+
+from ..config.settings import config
+from .json_output import JsonFieldStream
+
+try:
+    import fcntl
+except ImportError:  # Windows: the budget is tracked per process
+    fcntl = None
+
+
+# Requests per minute won back after each successful call
+RECOVERY_RPM_PER_SUCCESS = 0.5
+
+# Without a 429 for this long, the learned ceiling is raised by one request per minute
+CEILING_PROBE_SECONDS = 300
+
+# Call history used to learn the limit from a 429
+WINDOW_SECONDS = 60
+
+# A half-open breaker lets one probe call through; another probe is allowed after this long
+PROBE_TIMEOUT_SECONDS = 60
+
+# Upper bound for one backoff sleep between retries
+MAX_BACKOFF_SECONDS = 30
+
+# "Please retry in 12.5s" / "retry_delay { seconds: 12 }" in Gemini and LiteLLM errors
+RETRY_AFTER_PATTERN = re.compile(r'retry[^0-9]{0,40}?(\d+(?:\.\d+)?)\s*s', re.IGNORECASE)
+
+# Exception class names raised for 429s by google-generativeai and LiteLLM
+RATE_LIMIT_ERRORS = ('RateLimitError', 'ResourceExhausted', 'TooManyRequests')
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the breaker is open, no request slot frees up in time or retries run out"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether an exception means Gemini is rate limiting or out of quota
+
+    Args:
+        error (BaseException): Exception raised by an LLM call
+
+    Returns:
+        bool: True for 429s, exhausted quota and limiter rejections
+    """
+    if isinstance(error, LLMUnavailableError):
+        return True
+    if getattr(error, 'status_code', None) == 429 or getattr(error, 'code', None) == 429:
+        return True
+    if type(error).__name__ in RATE_LIMIT_ERRORS:
+        return True
+    text = str(error).lower()
+    return '429' in text or 'quota' in text or 'rate limit' in text or 'resource_exhausted' in text
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    """Server-suggested delay in seconds, when the error carries one"""
+    retry_after = getattr(error, 'retry_after', None)
+    if isinstance(retry_after, (int, float)):
+        return float(retry_after)
+    match = RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class _MemoryStore:
+    """Limiter state for one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+
+    def update(self, func: Callable[[Dict[str, Any]], Any]) -> Any:
+        with self._lock:
+            return func(self._state)
+
+
+class _FileStore:
+    """Limiter state in a small JSON file under an exclusive flock, shared by every worker on the host"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def update(self, func: Callable[[Dict[str, Any]], Any]) -> Any:
+        with self._lock, os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644), 'r+') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                state = json.loads(handle.read() or '{}')
+            except ValueError:
+                state = {}
+            result = func(state)
+            handle.seek(0)
+            handle.truncate()
+            handle.write(json.dumps(state))
+            handle.flush()
+            return result
+
+
+class GeminiRateLimiter:
+    """
+    Token bucket with AIMD rate learning and a circuit breaker.
+    The bucket refills at the current rate (requests per minute) up to the burst size.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        min_rpm: float,
+        burst: int,
+        max_wait_seconds: float,
+        retry_attempts: int,
+        backoff_seconds: float,
+        breaker_threshold: int,
+        breaker_cooldown_seconds: float,
+        state_path: Optional[str] = None
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            rpm (float): Starting rate and the ceiling it may climb back to
+            min_rpm (float): Floor the learned rate never drops below
+            burst (int): Bucket capacity
+            max_wait_seconds (float): Longest a call waits for a slot before it is rejected
+            retry_attempts (int): Retries after a 429, with jittered exponential backoff
+            backoff_seconds (float): Base delay for the backoff
+            breaker_threshold (int): Consecutive 429s that open the breaker
+            breaker_cooldown_seconds (float): How long the breaker stays open
+            state_path (str): State file shared across workers (empty: per-process state)
+        """
+        self.rpm = rpm
+        self.min_rpm = min(min_rpm, rpm)
+        self.burst = max(1, burst)
+        self.max_wait = max_wait_seconds
+        self.retry_attempts = retry_attempts
+        self.backoff = backoff_seconds
+        self.breaker_threshold = max(1, breaker_threshold)
+        self.breaker_cooldown = breaker_cooldown_seconds
+        if state_path and fcntl is not None:
+            self._store = _FileStore(state_path)
+        else:
+            self._store = _MemoryStore()
+        self._lock = threading.Lock()
+        self._counters = {
+            'calls': 0, 'waits': 0, 'wait_seconds': 0.0, 'rate_limited': 0,
+            'retries': 0, 'rejected': 0, 'breaker_trips': 0
+        }
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run one Gemini call under the limiter, retrying 429s with jittered backoff
+
+        With stream=True (passed through to func) an iterator over the chunks is returned instead.
+        The first slot is taken before returning, so an open breaker raises here rather than on the
+        first chunk; a 429 raised mid-stream is counted like any other.
+
+        Args:
+            func (Callable): Function that performs the LLM request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Return value of func, or an iterator over its chunks when streaming
+
+        Raises:
+            LLMUnavailableError: Breaker open, no slot within max_wait_seconds, or retries exhausted
+        """
+        if kwargs.get('stream'):
+            self.acquire()
+            return self._stream(func, args, kwargs)
+        for attempt in range(self.retry_attempts + 1):
+            self.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self._back_off(e, attempt)
+                continue
+            self.record_success()
+            return result
+
+    def _stream(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Iterator[Any]:
+        """Generator form of call(), entered holding the first slot; success is recorded after the last chunk"""
+        for attempt in range(self.retry_attempts + 1):
+            if attempt:
+                self.acquire()
+            produced = False
+            try:
+                for chunk in func(*args, **kwargs):
+                    produced = True
+                    yield chunk
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                # Chunks already handed out cannot be taken back, so only an empty stream is retried
+                self._back_off(e, attempt, retry=not produced)
+                continue
+            self.record_success()
+            return
+
+    def _back_off(self, error: Exception, attempt: int, retry: bool = True) -> None:
+        """Record a 429, then sleep before the next attempt or raise LLMUnavailableError"""
+        retry_after = retry_after_of(error)
+        opened = self.record_rate_limited(retry_after)
+        if opened or not retry or attempt == self.retry_attempts:
+            raise LLMUnavailableError(f"Gemini rate limited: {error}", retry_after or self.breaker_cooldown) from error
+        # Full jitter keeps workers that were limited together from retrying together
+        delay = retry_after or random.uniform(0, min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt))
+        self._count('retries')
+        time.sleep(delay)
+
+    def acquire(self) -> None:
+        """
+        Take one request slot, waiting up to max_wait_seconds for the bucket to refill
+
+        Raises:
+            LLMUnavailableError: When the breaker is open or no slot frees up in time
+        """
+        deadline = time.time() + self.max_wait
+        waited = 0.0
+        while True:
+            granted, wait, breaker_open = self._store.update(self._take)
+            if granted:
+                self._count('calls')
+                if waited:
+                    self._count('waits')
+                    self._count('wait_seconds', waited)
+                return
+            if breaker_open or time.time() + wait > deadline:
+                self._count('rejected')
+                reason = "circuit breaker open" if breaker_open else "no request slot"
+                raise LLMUnavailableError(f"Gemini unavailable: {reason}, retry in {wait:.1f}s", wait)
+            # Small jitter so workers sleeping on the same empty bucket do not wake in lockstep
+            pause = wait * (1 + random.random() * 0.1)
+            time.sleep(pause)
+            waited += pause
+
+    def admits(self, calls: int = 1) -> bool:
+        """
+        Check, without taking slots, whether `calls` requests could start within max_wait_seconds
+
+        Args:
+            calls (int): LLM calls the caller is about to make
+
+        Returns:
+            bool: False when the breaker is open or the budget is too thin; route to a non-LLM path then
+        """
+        def check(state: Dict[str, Any]) -> bool:
+            now = time.time()
+            self._refill(state, now)
+            if self._breaker_blocks(state, now):
+                return False
+            return state['tokens'] + state['rate'] * self.max_wait / 60 >= calls
+
+        return self._store.update(check)
+
+    def record_success(self) -> None:
+        """Close the breaker and win back some rate after a successful call"""
+        def update(state: Dict[str, Any]) -> None:
+            self._refill(state, time.time())
+            state['failures'] = 0
+            state['probing_until'] = 0.0
+            state['rate'] = min(state['ceiling'], state['rate'] + RECOVERY_RPM_PER_SUCCESS)
+
+        self._store.update(update)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> bool:
+        """
+        Learn from a 429: cap the ceiling at the rate that hit it, halve the rate, empty the bucket
+
+        Args:
+            retry_after (float): Server-suggested delay, if any
+
+        Returns:
+            bool: True when this 429 opened the breaker
+        """
+        def update(state: Dict[str, Any]) -> bool:
+            now = time.time()
+            self._refill(state, now)
+            recent = len(state['window'])
+            if recent > 1:
+                state['ceiling'] = max(self.min_rpm, min(state['ceiling'], recent - 1))
+            state['rate'] = max(self.min_rpm, min(state['rate'] / 2, state['ceiling']))
+            state['tokens'] = 0.0
+            state['last_limited'] = now
+            state['failures'] += 1
+            state['probing_until'] = 0.0
+            if state['failures'] >= self.breaker_threshold:
+                state['open_until'] = now + max(self.breaker_cooldown, retry_after or 0)
+                return True
+            return False
+
+        self._count('rate_limited')
+        opened = self._store.update(update)
+        if opened:
+            self._count('breaker_trips')
+            print(f"🚦 Gemini circuit breaker open for {max(self.breaker_cooldown, retry_after or 0):.0f}s")
+        return opened
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the shared bucket state and this process's counters"""
+        def snapshot(state: Dict[str, Any]) -> Dict[str, Any]:
+            now = time.time()
+            self._refill(state, now)
+            if now < state['open_until']:
+                breaker = 'open'
+            elif state['failures'] >= self.breaker_threshold:
+                breaker = 'half_open'
+            else:
+                breaker = 'closed'
+            return {
+                'rpm': round(state['rate'], 2),
+                'ceiling_rpm': round(state['ceiling'], 2),
+                'tokens': round(state['tokens'], 2),
+                'requests_last_minute': len(state['window']),
+                'breaker': breaker,
+                'consecutive_429s': state['failures']
+            }
+
+        shared = self._store.update(snapshot)
+        with self._lock:
+            counters = dict(self._counters)
+        counters['wait_seconds'] = round(counters['wait_seconds'], 3)
+        return {**shared, **counters}
+
+    def _take(self, state: Dict[str, Any]) -> Tuple[bool, float, bool]:
+        """Try to take a slot: (granted, seconds to wait, breaker open)"""
+        now = time.time()
+        self._refill(state, now)
+        if self._breaker_blocks(state, now):
+            return False, max(state['open_until'], state['probing_until']) - now, True
+        if state['tokens'] >= 1:
+            state['tokens'] -= 1
+            state['window'].append(now)
+            if state['failures'] >= self.breaker_threshold:
+                # Half-open: this call is the probe
+                state['probing_until'] = now + PROBE_TIMEOUT_SECONDS
+            return True, 0.0, False
+        return False, (1 - state['tokens']) * 60 / state['rate'], False
+
+    def _breaker_blocks(self, state: Dict[str, Any], now: float) -> bool:
+        if now < state['open_until']:
+            return True
+        return state['failures'] >= self.breaker_threshold and now < state['probing_until']
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        """Initialize missing state, refill the bucket and trim the call window"""
+        if 'rate' not in state:
+            state.update(
+                rate=self.rpm, ceiling=self.rpm, tokens=float(self.burst), updated=now, window=[],
+                failures=0, open_until=0.0, probing_until=0.0, last_limited=0.0, ceiling_raised=0.0
+            )
+        state['tokens'] = min(self.burst, state['tokens'] + max(0.0, now - state['updated']) * state['rate'] / 60)
+        state['updated'] = now
+        window: List[float] = state['window']
+        state['window'] = [started for started in window if now - started < WINDOW_SECONDS]
+        if state['ceiling'] < self.rpm and now - max(state['last_limited'], state['ceiling_raised']) > CEILING_PROBE_SECONDS:
+            state['ceiling'] = min(self.rpm, state['ceiling'] + 1)
+            state['ceiling_raised'] = now
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+
+# Per-thread (field, listener) set by stream_field for the completions made on that thread
+_streaming = threading.local()
+
+
+@contextmanager
+def stream_field(field: str, listener: Callable[[str], None]) -> Iterator[None]:
+    """
+    Stream the RateLimitedLLM completions made on this thread (a crew kickoff runs its tasks on
+    the calling thread): the top-level JSON string `field` of each completion is passed to
+    listener piece by piece while the model is still writing
+
+    Args:
+        field (str): Key of the JSON string value to stream, e.g. "message"
+        listener (Callable): Receives each newly decoded piece of the value
+    """
+    previous = getattr(_streaming, 'target', None)
+    _streaming.target = (field, listener)
+    try:
+        yield
+    finally:
+        _streaming.target = previous
+
+
+class RateLimitedLLM(LLM):
+    """CrewAI LLM whose calls wait on the shared Gemini rate limiter"""
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = None) -> str:
+        """
+        Call the model once a request slot is free; inside stream_field the completion is streamed
+
+        Args:
+            messages (List[Dict]): Chat messages for the model
+            callbacks (List): CrewAI/LiteLLM callbacks
+
+        Returns:
+            str: Completion text
+        """
+        target = getattr(_streaming, 'target', None)
+        if target is None:
+            return gemini_limiter.call(super().call, messages, callbacks=callbacks or [])
+        return self._stream_call(messages, callbacks or [], *target)
+
+    def _stream_call(
+        self,
+        messages: List[Dict[str, str]],
+        callbacks: List[Any],
+        field: str,
+        listener: Callable[[str], None]
+    ) -> str:
+        """Same request as LLM.call with stream=True, passing the field's text to listener as it arrives"""
+        if callbacks:
+            litellm.callbacks = callbacks
+        params = {
+            'model': self.model,
+            'messages': messages,
+            'timeout': self.timeout,
+            'temperature': self.temperature,
+            'top_p': self.top_p,
+            'stop': self.stop,
+            'max_tokens': self.max_tokens or self.max_completion_tokens,
+            'api_base': self.base_url,
+            'api_key': self.api_key,
+            **self.kwargs
+        }
+        params = {key: value for key, value in params.items() if value is not None}
+        params['stream'] = True
+
+        decoder = JsonFieldStream(field)
+        parts = []
+        for chunk in gemini_limiter.call(litellm.completion, **params):
+            choices = getattr(chunk, 'choices', None) or [None]
+            text = getattr(getattr(choices[0], 'delta', None), 'content', None) or ''
+            parts.append(text)
+            piece = decoder.feed(text)
+            if piece:
+                listener(piece)
+        return ''.join(parts)
+
+
+# Global instance shared by every Gemini call (crew agents and the structured pipeline)
+gemini_limiter = GeminiRateLimiter(
+    rpm=config.GEMINI_RPM,
+    min_rpm=config.GEMINI_MIN_RPM,
+    burst=config.GEMINI_BURST,
+    max_wait_seconds=config.GEMINI_MAX_WAIT_SECONDS,
+    retry_attempts=config.GEMINI_RETRY_ATTEMPTS,
+    backoff_seconds=config.GEMINI_BACKOFF_SECONDS,
+    breaker_threshold=config.GEMINI_BREAKER_THRESHOLD,
+    breaker_cooldown_seconds=config.GEMINI_BREAKER_COOLDOWN_SECONDS,
+    state_path=config.GEMINI_LIMITER_STATE_PATH
+)
@@ -0,0 +1,176 @@
+"""
+Batch chat processing.
+Answers many chat requests against one catalog snapshot: requests with the same intent
+run once, the fast path is tried first, and pipeline runs share a bounded concurrency limit.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ..config.settings import config
+from ..crews.food_crew import food_crew
+from ..data.taste_profiles import taste_profiles
+from ..runtime.crew_executor import CrewQueueFullError, crew_executor
+from ..search.food_index import FoodIndexSnapshot, food_index
+from ..search.geo_index import user_location
+from ..utils.helpers import validate_user_context, validate_user_message
+from ..utils.metrics import stage_metrics
+from .fast_path import fast_path
+from .response_cache import cache_key, depersonalize, personalize
+
+
+# ChatResponse fields copied into each result record
+RESPONSE_FIELDS = ('message', 'recommendations', 'actionRequired', 'user_context', 'processed_at')
+
+# Times a group waits out a full crew queue before it is reported as an error
+BUSY_RETRIES = 3
+
+
+class BatchProcessor:
+    """
+    Runs a batch of chat requests and yields one NDJSON-ready record per request as soon as
+    its intent group finishes. Records carry the request's index, so callers can reorder them.
+    """
+
+    def __init__(self, max_concurrency: int, max_items: int):
+        """
+        Initialize the processor
+
+        Args:
+            max_concurrency (int): Default number of pipeline (LLM) runs in flight per batch
+            max_items (int): Largest accepted batch
+        """
+        self.max_concurrency = max_concurrency
+        self.max_items = max_items
+        self._counters = {'batches': 0, 'items': 0, 'groups': 0, 'fast_path': 0, 'pipeline': 0, 'errors': 0}
+
+    async def run(self, requests: List[Dict[str, Any]], concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a batch of chat requests
+
+        Args:
+            requests (List[Dict]): ChatRequest-shaped dicts (message, user_context, ...)
+            concurrency (int): Pipeline runs in flight (default: max_concurrency)
+
+        Yields:
+            Dict: {'index', 'status': ok|invalid|error, 'source', 'response' | 'error'} per request,
+            then a final {'summary': {...}} record
+        """
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        # Every request in the batch is answered from the same catalog snapshot
+        snapshot = await loop.run_in_executor(None, food_index.get)
+
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        counts = {'ok': 0, 'invalid': 0, 'error': 0}
+        for index, request in enumerate(requests):
+            message = request.get('message')
+            context = request.get('user_context') or {}
+            if not validate_user_message(message) or not validate_user_context(context):
+                counts['invalid'] += 1
+                yield {'index': index, 'status': 'invalid', 'error': 'Invalid message format or user context'}
+                continue
+            key = cache_key(message, snapshot.version, user_location(context), taste_profiles.segment(context.get('id')))
+            groups.setdefault(key, []).append((index, request))
+
+        self._counters['batches'] += 1
+        self._counters['items'] += len(requests)
+        self._counters['groups'] += len(groups)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_concurrency))
+        tasks = [asyncio.ensure_future(self._run_group(members, snapshot, semaphore)) for members in groups.values()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for record in await finished:
+                    counts[record['status']] += 1
+                    yield record
+        finally:
+            # The client went away: stop the groups that have not finished
+            for task in tasks:
+                task.cancel()
+
+        elapsed = time.perf_counter() - started
+        stage_metrics.record('batch.total', elapsed)
+        yield {'summary': {
+            'items': len(requests),
+            'intent_groups': len(groups),
+            **counts,
+            'catalog_version': snapshot.version,
+            'elapsed_ms': round(elapsed * 1000, 1)
+        }}
+
+    def stats(self) -> Dict[str, int]:
+        """Get batch, item and answer-source counters"""
+        return dict(self._counters)
+
+    async def _run_group(
+        self,
+        members: List[Tuple[int, Dict[str, Any]]],
+        snapshot: FoodIndexSnapshot,
+        semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        """Answer the first request of an intent group and personalize the answer for the rest"""
+        _, leader = members[0]
+        leader_context = leader.get('user_context') or {}
+        try:
+            result, source = await self._answer(leader['message'], leader_context, snapshot, semaphore)
+        except Exception as e:
+            self._counters['errors'] += 1
+            return [{'index': index, 'status': 'error', 'error': str(e)} for index, _ in members]
+
+        self._counters[source] += 1
+        template = depersonalize(result, leader_context.get('name') or 'friend')
+        processed_at = datetime.now().isoformat()
+        records = []
+        for position, (index, request) in enumerate(members):
+            context = request.get('user_context') or {}
+            response = personalize(template, context.get('name') or 'friend')
+            response['user_context'] = context
+            response['processed_at'] = processed_at
+            records.append({
+                'index': index,
+                'status': 'ok',
+                'source': source if position == 0 else 'deduplicated',
+                'response': {field: response.get(field) for field in RESPONSE_FIELDS}
+            })
+        return records
+
+    async def _answer(
+        self,
+        message: str,
+        user_context: Dict[str, Any],
+        snapshot: FoodIndexSnapshot,
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Dict[str, Any], str]:
+        """Fast path first; otherwise the configured pipeline, at most `concurrency` at a time"""
+        loop = asyncio.get_running_loop()
+        if config.FAST_PATH_ENABLED:
+            try:
+                result = await loop.run_in_executor(None, fast_path.respond, message, user_context, snapshot)
+            except Exception as e:
+                print(f"⚠️ Batch fast path failed, escalating: {e}")
+                result = None
+            if result:
+                return result, 'fast_path'
+
+        async with semaphore:
+            for attempt in range(BUSY_RETRIES + 1):
+                try:
+                    result = await crew_executor.run(
+                        food_crew.process_user_query,
+                        user_message=message,
+                        user_context=user_context,
+                        snapshot=snapshot
+                    )
+                    return result, 'pipeline'
+                except CrewQueueFullError as e:
+                    # Live traffic filled the queue; batch work yields to it
+                    if attempt == BUSY_RETRIES:
+                        raise
+                    await asyncio.sleep(e.retry_after)
+
+
+# Global instance used by /process-chat/batch and batch_chat.py
+batch_processor = BatchProcessor(max_concurrency=config.BATCH_MAX_CONCURRENCY, max_items=config.BATCH_MAX_ITEMS)
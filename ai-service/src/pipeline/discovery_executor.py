@@ -0,0 +1,93 @@
+"""
+Concurrent discovery executor.
+Fans out the independent searches an intent implies and merges their results.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import config
+from ..search.food_index import FoodIndexSnapshot, food_index
+from ..tools.food_search import search_food_items
+from ..tools.restaurant_search import search_restaurants
+from ..utils.metrics import stage_metrics
+
+
+class DiscoveryExecutor:
+    """
+    Runs food-by-query, food-by-foodType and restaurants-by-cuisine searches in parallel.
+    Wall time is the slowest search instead of the sum of all of them.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initialize the executor
+
+        Args:
+            max_workers (int): Threads shared by all concurrent discoveries
+        """
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="discovery")
+
+    def discover(
+        self,
+        query: Optional[str] = None,
+        food_type: Optional[str] = None,
+        cuisine: Optional[str] = None,
+        preferences: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every implied search concurrently and merge the results
+
+        Args:
+            query (str): Free-text food query
+            food_type (str): Food type or dish category
+            cuisine (str): Cuisine for the restaurant search (defaults to food_type)
+            preferences (Dict): Budget and dietary preferences applied to food searches
+
+        Returns:
+            Dict: De-duplicated 'food_items' and 'restaurants' plus per-search 'timings_ms'
+        """
+        started = time.perf_counter()
+        preferences = dict(preferences or {})
+        preferences.pop('foodType', None)
+
+        searches: List[Tuple[str, str, Callable[[], List[Dict]]]] = []
+        if query:
+            searches.append(('food', 'food_by_query', lambda: search_food_items(query, preferences)))
+        if food_type and food_type != query:
+            searches.append(('food', 'food_by_type', lambda: search_food_items(food_type, preferences)))
+        if cuisine or food_type:
+            searches.append(('restaurants', 'restaurants_by_cuisine', lambda: search_restaurants(cuisine or food_type)))
+
+        # The searches run on pool threads; give them the caller's snapshot, pinned or not
+        snapshot = food_index.get()
+        futures = [(kind, name, self._pool.submit(_timed, search, snapshot)) for kind, name, search in searches]
+
+        merged: Dict[str, Dict[str, Dict]] = {'food': {}, 'restaurants': {}}
+        timings = {}
+        for kind, name, future in futures:
+            results, seconds = future.result()
+            timings[name] = round(seconds * 1000, 2)
+            stage_metrics.record(f'discovery.{name}', seconds)
+            for result in results:
+                # First search to return an id wins; searches are ordered most specific first
+                merged[kind].setdefault(str(result.get('id')), result)
+
+        stage_metrics.record('discovery.fanout', time.perf_counter() - started)
+        return {
+            'food_items': list(merged['food'].values())[:config.MAX_FOOD_RESULTS * 2],
+            'restaurants': list(merged['restaurants'].values()),
+            'timings_ms': timings
+        }
+
+
+def _timed(search: Callable[[], List[Dict]], snapshot: FoodIndexSnapshot) -> Tuple[List[Dict], float]:
+    started = time.perf_counter()
+    with food_index.pinned(snapshot):
+        results = search()
+    return results, time.perf_counter() - started
+
+
+# Global instance used by the discover_options tool
+discovery_executor = DiscoveryExecutor(max_workers=config.DISCOVERY_MAX_WORKERS)
@@ -0,0 +1,268 @@
+"""
+Precomputed fallback answers for when the LLM is unavailable.
+Per catalog snapshot, the best-rated orderable items are ranked once per food type, cuisine,
+mood, dietary flag and budget bucket. A degraded request is then a keyword lookup and a short
+filter (open now, diet, budget) over a prebuilt pool, with no model and no catalog scan.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from ..search.food_index import FoodIndexSnapshot, food_index
+from ..search.inverted_index import tokenize
+from ..search.opening_hours import opening_hours
+from .fast_path import format_recommendations
+from .intent_parser import BUDGET_WORDS, FOOD_TYPES, MOOD_WORDS, PREFERENCE_WORDS
+from .structured import MOOD_QUERIES
+
+
+# Dietary preferences the fallback honours, and the item flag each one requires
+DIET_FLAGS = {'vegetarian': 'isVegetarian', 'vegan': 'isVegan', 'gluten-free': 'isGlutenFree'}
+
+# Keyword kinds in match priority: a named dish beats a cuisine, which beats a mood
+SUBJECT_KINDS = ('food', 'cuisine', 'mood')
+
+# Price quantiles separating the low / medium / high budget buckets
+BUDGET_QUANTILES = (1 / 3, 2 / 3)
+
+
+class FallbackEntry(NamedTuple):
+    """One pool item: its formatted recommendation plus what the serve-time filters need"""
+    recommendation: Dict[str, Any]
+    restaurant_row: int
+    budget: str
+    diets: frozenset
+
+
+class FallbackTable:
+    """Keyword table and ranked pools for one catalog snapshot"""
+
+    def __init__(self, snapshot: FoodIndexSnapshot, pool_size: int):
+        """
+        Rank the pools
+
+        Args:
+            snapshot (FoodIndexSnapshot): Snapshot to rank from
+            pool_size (int): Items kept per pool (head room for the serve-time filters)
+        """
+        catalog = snapshot.catalog
+        self.snapshot = snapshot
+        self.keywords: Dict[str, Tuple[str, str]] = {}
+        self.pools: Dict[Tuple[str, str], List[FallbackEntry]] = {}
+        available = catalog.is_available
+
+        prices = catalog.price[available] if available.any() else catalog.price
+        low, high = np.quantile(prices, BUDGET_QUANTILES) if len(prices) else (0.0, 0.0)
+        self._budget_of = lambda price: 'low' if price <= low else 'high' if price >= high else 'medium'
+
+        def add_pool(kind: str, key: str, mask: np.ndarray, why: str) -> bool:
+            rows = catalog.top_food_rows(pool_size, mask=available & mask)
+            if len(rows):
+                self.pools[(kind, key)] = self._pool(rows, why)
+            return len(rows) > 0
+
+        self.pools[('top', '')] = self._pool(
+            catalog.top_food_rows(pool_size, mask=available), "One of the best-rated dishes on the menu"
+        )
+        for cuisine in {value for restaurant in snapshot.restaurants.values() for value in restaurant.get('cuisine') or []}:
+            label = cuisine.lower()
+            restaurants = catalog.restaurant_cuisine.rows_with_any(catalog.labels.codes_equal([cuisine]))
+            mask = catalog.join_restaurant_column(restaurants.astype(np.float32), None, 0.0) > 0
+            if label not in self.keywords and add_pool('cuisine', label, mask, f"A top-rated {cuisine} favourite"):
+                self.keywords[label] = ('cuisine', label)
+        for word, food_type in FOOD_TYPES.items():
+            if word in self.keywords:
+                continue
+            if ('food', food_type) in self.pools or add_pool(
+                'food', food_type, catalog.food_term_mask(tokenize(food_type)),
+                f"One of the best-rated {food_type} dishes around"
+            ):
+                self.keywords[word] = ('food', food_type)
+        for category in {item.get('category') for item in snapshot.items if item.get('category')}:
+            label = category.lower()
+            codes = catalog.labels.codes_equal([category])
+            if label not in self.keywords and add_pool(
+                'food', label, np.isin(catalog.category, codes), f"One of the best-rated {label} dishes around"
+            ):
+                self.keywords[label] = ('food', label)
+                self.keywords.setdefault(f"{label}s", ('food', label))
+        for word, mood in MOOD_WORDS.items():
+            if mood in MOOD_QUERIES and (('mood', mood) in self.pools or add_pool(
+                'mood', mood, catalog.food_term_mask(tokenize(MOOD_QUERIES[mood])), f"A crowd favourite for a {mood} mood"
+            )):
+                self.keywords[word] = ('mood', mood)
+        for diet, flag in DIET_FLAGS.items():
+            add_pool('diet', diet, catalog.food_mask(flags=[flag], available_only=False), f"Top-rated and {diet}")
+        buckets = {
+            'low': catalog.price <= low,
+            'medium': (catalog.price > low) & (catalog.price < high),
+            'high': catalog.price >= high
+        }
+        for budget, in_bucket in buckets.items():
+            add_pool('budget', budget, in_bucket, "Top-rated and easy on the wallet" if budget == 'low' else "A top-rated pick")
+
+    def _pool(self, rows: np.ndarray, why: str) -> List[FallbackEntry]:
+        catalog = self.snapshot.catalog
+        items = [self.snapshot.items[row] for row in rows]
+        recommendations = format_recommendations(self.snapshot, items, {'preferences': []})
+        pool = []
+        for row, item, recommendation in zip(rows, items, recommendations):
+            recommendation['why_perfect'] = why
+            diets = frozenset(diet for diet, flag in DIET_FLAGS.items() if item.get(flag))
+            pool.append(FallbackEntry(
+                recommendation, int(catalog.restaurant_row[row]), self._budget_of(item['price']), diets
+            ))
+        return pool
+
+
+class FallbackEngine:
+    """
+    Serves catalog-backed answers in microseconds when Gemini is rate limited or down.
+    Tables are rebuilt in the background when the catalog changes; the previous one serves meanwhile.
+    """
+
+    def __init__(self, top_k: int, pool_size: int):
+        """
+        Initialize the engine
+
+        Args:
+            top_k (int): Recommendations per answer
+            pool_size (int): Items ranked per keyword pool
+        """
+        self.top_k = top_k
+        self.pool_size = pool_size
+        self._table: Optional[FallbackTable] = None
+        self._building = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._counters = {'served': 0, 'matched': 0, 'builds': 0, 'build_ms': 0.0}
+
+    def respond(self, user_message: str, user_context: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Answer a chat message from the precomputed pools
+
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): User context (name, id, address)
+
+        Returns:
+            Dict: ChatResponse-shaped dict marked with fallback=True
+        """
+        user_name = user_context.get('name', 'friend') if user_context else 'friend'
+        table = self.table()
+        recommendations: List[Dict[str, Any]] = []
+        subject = None
+        if table is not None:
+            tokens = tokenize(user_message)
+            matches = [table.keywords[token] for token in tokens if token in table.keywords]
+            subject = next((match for kind in SUBJECT_KINDS for match in matches if match[0] == kind), None)
+            budget = next((BUDGET_WORDS[token] for token in tokens if token in BUDGET_WORDS), None)
+            diets = {PREFERENCE_WORDS[token] for token in tokens if PREFERENCE_WORDS.get(token) in DIET_FLAGS}
+            recommendations = self._pick(table, subject, budget, diets)
+
+        with self._lock:
+            self._counters['served'] += 1
+            self._counters['matched'] += subject is not None
+
+        if subject is None:
+            message = f"Hey {user_name}! My AI chef is taking a quick break, but here are some of our best-rated dishes 🍽️"
+        elif subject[0] == 'mood':
+            message = f"Hey {user_name}! My AI chef is taking a quick break, but these are crowd favourites for a {subject[1]} mood 🍽️"
+        else:
+            message = f"Hey {user_name}! My AI chef is taking a quick break, but here are the best-rated {subject[1]} picks right now 🍽️"
+        return {
+            "message": message,
+            "recommendations": recommendations,
+            "actionRequired": {
+                "type": "add_to_cart",
+                "message": f"Would you like me to add the {recommendations[0]['name']} to your cart?",
+                "item_id": recommendations[0]['id']
+            } if recommendations else None,
+            "fallback": True,
+            "original_message": user_message,
+            "user_context": user_context,
+            "processed_at": datetime.now().isoformat()
+        }
+
+    def table(self) -> Optional[FallbackTable]:
+        """Get the table for the current snapshot, building the first one inline and later ones in the background"""
+        table = self._table
+        try:
+            snapshot = food_index.get()
+        except Exception as e:
+            print(f"⚠️ Fallback engine cannot read the catalog: {e}")
+            return table
+        if table is None:
+            with self._build_lock:
+                if self._table is None:
+                    self._build(snapshot)
+            return self._table
+        if table.snapshot is not snapshot:
+            with self._lock:
+                start = not self._building
+                self._building = True
+            if start:
+                threading.Thread(target=self._build, args=(snapshot,), name="fallback-build", daemon=True).start()
+        return table
+
+    def warm(self) -> None:
+        """Build the table for the current snapshot"""
+        self.table()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool sizes and served/matched counters"""
+        table = self._table
+        with self._lock:
+            counters = dict(self._counters)
+        builds = counters.pop('build_ms')
+        return {
+            'pools': len(table.pools) if table else 0,
+            'keywords': len(table.keywords) if table else 0,
+            'avg_build_ms': round(builds / counters['builds'], 2) if counters['builds'] else 0.0,
+            **counters
+        }
+
+    def _pick(self, table: FallbackTable, subject: Optional[Tuple[str, str]], budget: Optional[str], diets: set) -> List[Dict]:
+        """First top_k pool entries that pass the filters, topping up from broader pools"""
+        pools = [subject] if subject else []
+        pools += [('diet', diet) for diet in sorted(diets)] + [('budget', budget), ('top', '')]
+        open_restaurants = opening_hours.open_mask(table.snapshot.catalog) if config.OPEN_HOURS_FILTER else None
+
+        picked: List[Dict] = []
+        seen = set()
+        for key in pools:
+            for entry in table.pools.get(key, []):
+                recommendation = entry.recommendation
+                if recommendation['id'] in seen or not diets <= entry.diets:
+                    continue
+                if budget and entry.budget != budget:
+                    continue
+                if open_restaurants is not None and entry.restaurant_row >= 0 and not open_restaurants[entry.restaurant_row]:
+                    continue
+                seen.add(recommendation['id'])
+                picked.append({**recommendation, 'restaurant': dict(recommendation['restaurant'])})
+                if len(picked) == self.top_k:
+                    return picked
+        return picked
+
+    def _build(self, snapshot: FoodIndexSnapshot) -> None:
+        started = time.perf_counter()
+        try:
+            table = FallbackTable(snapshot, self.pool_size)
+            with self._lock:
+                self._table = table
+                self._counters['builds'] += 1
+                self._counters['build_ms'] += (time.perf_counter() - started) * 1000
+        except Exception as e:
+            print(f"❌ Fallback table build failed: {e}")
+        finally:
+            self._building = False
+
+
+# Global instance used whenever a chat answer has to be given without the LLM
+fallback_engine = FallbackEngine(top_k=3, pool_size=24)
@@ -0,0 +1,241 @@
+"""
+Deterministic fast-path tier.
+Answers simple, explicit requests from the local index without invoking the agent crew.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from ..data.taste_profiles import taste_profiles
+from ..search.food_index import FoodIndexSnapshot, build_item_mask, food_index
+from ..search.geo_index import food_distances, restaurants_within_mask, user_location
+from ..ranking.scoring import scoring_engine
+from .intent_parser import IntentParser
+
+
+class FastPathResponder:
+    """
+    Rule/lexicon intent parsing plus a local ranker.
+    Returns a complete chat response when confident, otherwise None so the caller escalates.
+    """
+
+    def __init__(self, min_confidence: float, max_results: int = 3):
+        """
+        Initialize the responder
+
+        Args:
+            min_confidence (float): Parser confidence required to answer without the crew
+            max_results (int): Number of recommendations to return
+        """
+        self.min_confidence = min_confidence
+        self.max_results = max_results
+        self._parser: Optional[IntentParser] = None
+        self._parser_snapshot: Optional[FoodIndexSnapshot] = None
+        self._lock = threading.Lock()
+        self._counters = {'answered': 0, 'escalated': 0, 'no_candidates': 0}
+
+    def respond(
+        self,
+        user_message: str,
+        user_context: Dict = None,
+        snapshot: Optional[FoodIndexSnapshot] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Try to answer a message without the crew
+
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): User context (name, id, address)
+            snapshot (FoodIndexSnapshot): Index snapshot to answer from (default: the current one)
+
+        Returns:
+            Optional[Dict]: ChatResponse-shaped dict, or None to escalate to the crew
+        """
+        snapshot = snapshot or food_index.get()
+        intent = apply_user_context(self.parser_for(snapshot).parse(user_message), user_context)
+        if intent['confidence'] < self.min_confidence:
+            self._count('escalated')
+            return None
+
+        ranked = rank_candidates(snapshot, intent, self.max_results)
+        if not ranked:
+            self._count('no_candidates')
+            return None
+
+        self._count('answered')
+        user_name = user_context.get('name', 'friend') if user_context else 'friend'
+        recommendations = format_recommendations(snapshot, [item for item, _ in ranked], intent)
+        return {
+            'message': _compose_message(user_name, intent, len(recommendations)),
+            'recommendations': recommendations,
+            'actionRequired': {
+                'type': 'add_to_cart',
+                'message': f"Would you like me to add the {recommendations[0]['name']} to your cart?",
+                'item_id': recommendations[0]['id']
+            },
+            'user_context': user_context,
+            'processed_at': datetime.now().isoformat(),
+            'fast_path': True,
+            'intent': intent
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Get answered/escalated counters"""
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def parser_for(self, snapshot: FoodIndexSnapshot) -> IntentParser:
+        """Get a parser that also knows the current catalog's categories"""
+        if self._parser is None or self._parser_snapshot is not snapshot:
+            categories = {item.get('category') for item in snapshot.items if item.get('category')}
+            self._parser = IntentParser(extra_food_types=categories)
+            self._parser_snapshot = snapshot
+        return self._parser
+
+
+def apply_user_context(intent: Dict, user_context: Optional[Dict]) -> Dict:
+    """
+    Add what is known about the user to a parsed intent
+
+    Args:
+        intent (Dict): Parsed intent
+        user_context (Dict): User context (id, address)
+
+    Returns:
+        Dict: The same intent with 'location' (address coordinates) and 'taste'
+        (taste profile ranking signals), each None when unknown
+    """
+    intent['location'] = user_location(user_context)
+    intent['taste'] = taste_profiles.signals((user_context or {}).get('id'))
+    return intent
+
+
+def match_candidates(
+    snapshot: FoodIndexSnapshot,
+    intent: Dict,
+    query: Optional[str] = None
+) -> List[Tuple[Dict, float]]:
+    """
+    Find available catalog items that respect an intent's budget, dietary and distance filters
+
+    Args:
+        snapshot (FoodIndexSnapshot): Current catalog snapshot
+        intent (Dict): Parsed intent with foodType, budget, preferences and optional location
+        query (str): Search text; defaults to the intent's foodType, empty matches the whole catalog
+
+    Returns:
+        List[Tuple[Dict, float]]: (item, text relevance) pairs, most relevant first
+    """
+    mask = build_item_mask(snapshot.catalog, intent, available_only=True)
+    if intent.get('location') is not None and config.GEO_SEARCH_RADIUS_KM > 0:
+        nearby = mask & restaurants_within_mask(snapshot.catalog, intent['location'], config.GEO_SEARCH_RADIUS_KM)
+        # Nothing delivers that far out: keep the wider set and let proximity ranking sort it
+        if nearby.any():
+            mask = nearby
+    query = intent.get('foodType') if query is None else query
+    if query:
+        return snapshot.search(query, mask=mask)
+    return [(snapshot.items[row], 1.0) for row in np.flatnonzero(mask)]
+
+
+def rank_candidates(
+    snapshot: FoodIndexSnapshot,
+    intent: Dict,
+    limit: int,
+    query: Optional[str] = None
+) -> List[Tuple[Dict, float]]:
+    """
+    Rank catalog items for a parsed intent
+
+    Args:
+        snapshot (FoodIndexSnapshot): Current catalog snapshot
+        intent (Dict): Parsed intent with foodType, budget and preferences
+        limit (int): Number of items to return
+        query (str): Search text; defaults to the intent's foodType, empty ranks the whole catalog
+
+    Returns:
+        List[Tuple[Dict, float]]: (item, score) pairs, best first
+    """
+    ranked = scoring_engine.rank(snapshot, match_candidates(snapshot, intent, query), intent, limit)
+    return [(entry['item'], entry['score']) for entry in ranked]
+
+
+def format_recommendation(snapshot: FoodIndexSnapshot, item: Dict, intent: Dict) -> Dict:
+    """Format an item in the advisor task's recommendation shape"""
+    return format_recommendations(snapshot, [item], intent)[0]
+
+
+def format_recommendations(snapshot: FoodIndexSnapshot, items: List[Dict], intent: Dict) -> List[Dict]:
+    """
+    Format items in the advisor task's recommendation shape, with one distance lookup for all of them
+
+    Args:
+        snapshot (FoodIndexSnapshot): Snapshot the items belong to
+        items (List[Dict]): Food item documents
+        intent (Dict): Parsed intent (preferences, budget, location)
+
+    Returns:
+        List[Dict]: One recommendation per item, in order; every field comes from the catalog
+    """
+    distances = [None] * len(items)
+    if intent.get('location') is not None and items:
+        rows = [snapshot.catalog.food_row(item['_id']) for item in items]
+        known = [position for position, row in enumerate(rows) if row is not None]
+        if known:
+            looked_up = food_distances(snapshot.catalog, np.array([rows[position] for position in known]), intent['location'])
+            for position, distance in zip(known, looked_up):
+                distances[position] = None if np.isnan(distance) else float(distance)
+    return [_recommendation(snapshot, item, intent, distance) for item, distance in zip(items, distances)]
+
+
+def _recommendation(snapshot: FoodIndexSnapshot, item: Dict, intent: Dict, distance: Optional[float]) -> Dict:
+    restaurant = snapshot.restaurant_for(item) or {}
+    reasons = [pref.capitalize() for pref in intent['preferences']]
+    if intent.get('max_price'):
+        reasons.append(f"under ${intent['max_price']:g}")
+    elif intent.get('budget') == 'low':
+        reasons.append('easy on the wallet')
+    if restaurant.get('rating'):
+        reasons.append(f"{restaurant['name']} is rated {restaurant['rating']}")
+    if distance is not None:
+        reasons.append(f"{distance:.1f} km away")
+
+    recommendation = {
+        'id': str(item['_id']),
+        'name': item['name'],
+        'price': item['price'],
+        'restaurant': {
+            'name': restaurant.get('name', 'Restaurant'),
+            'rating': restaurant.get('rating', 4.0),
+            'deliveryTime': restaurant.get('deliveryTime', '25-35 mins')
+        },
+        'description': item.get('description', ''),
+        'why_perfect': ', '.join(reasons) or f"A top {intent.get('foodType') or 'menu'} pick",
+        'tags': item.get('tags', [])
+    }
+    if distance is not None:
+        recommendation['restaurant']['distanceKm'] = round(distance, 2)
+    return recommendation
+
+
+def _compose_message(user_name: str, intent: Dict, count: int) -> str:
+    """Build the short advisor-style message"""
+    qualifiers = ' '.join(intent['preferences'])
+    subject = f"{qualifiers} {intent['foodType']}".strip()
+    if intent.get('max_price'):
+        subject += f" under ${intent['max_price']:g}"
+    elif intent.get('budget') == 'low':
+        subject = f"wallet-friendly {subject}"
+    return f"Hey {user_name}! Found {count} {subject} picks you'll love 🍽️"
+
+
+# Global instance used by the FastAPI endpoints
+fast_path = FastPathResponder(min_confidence=config.FAST_PATH_MIN_CONFIDENCE)
@@ -0,0 +1,128 @@
+"""
+Compact candidate handles for inter-stage LLM context.
+Agents see each candidate as one short line keyed by a handle (the shortest unique id suffix);
+full recommendations are hydrated from the catalog by id once the LLM is done.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from ..search.food_index import FoodIndexSnapshot, food_index
+from ..utils.snapshot_cache import SnapshotCache
+
+
+# Minimum handle length; ObjectId suffixes are the per-process insert counter, so 6 hex
+# characters are almost always unique and collisions just get a longer suffix
+HANDLE_LENGTH = 6
+
+# Tags shown per candidate line
+LINE_TAGS = 3
+
+
+class HandleTable:
+    """Bidirectional item id <-> handle map for one catalog snapshot"""
+
+    def __init__(self, item_ids: Iterable[str]):
+        """
+        Assign every item its shortest unique suffix of at least HANDLE_LENGTH characters
+
+        Args:
+            item_ids (Iterable[str]): Food item id strings
+        """
+        pending = list(dict.fromkeys(str(item_id) for item_id in item_ids))
+        self._handles: Dict[str, str] = {}
+        length = HANDLE_LENGTH
+        while pending:
+            groups: Dict[str, List[str]] = {}
+            for item_id in pending:
+                groups.setdefault(item_id[-length:], []).append(item_id)
+            pending = []
+            for handle, members in groups.items():
+                if len(members) == 1 or all(len(member) <= length for member in members):
+                    self._handles[members[0]] = handle
+                else:
+                    pending.extend(members)
+            length += 2
+        self._ids = {handle: item_id for item_id, handle in self._handles.items()}
+
+    def handle(self, item_id: str) -> str:
+        """Handle of an item id (the id itself when the item is unknown)"""
+        return self._handles.get(str(item_id), str(item_id))
+
+    def resolve(self, token) -> Optional[str]:
+        """
+        Map a handle, or a full id, as written back by the LLM to an item id
+
+        Args:
+            token: Handle or id, possibly with stray quotes, '#' or whitespace
+
+        Returns:
+            Optional[str]: Item id, or None when the token matches nothing
+        """
+        if token is None:
+            return None
+        token = str(token).strip().strip('"\'#')
+        if token in self._handles:
+            return token
+        return self._ids.get(token)
+
+
+_tables = SnapshotCache()
+
+
+def handle_table(snapshot: Optional[FoodIndexSnapshot] = None) -> HandleTable:
+    """
+    Get the handle table of an index snapshot (default: the current one), built once per snapshot
+
+    Args:
+        snapshot (FoodIndexSnapshot): Snapshot whose item ids are mapped
+
+    Returns:
+        HandleTable: Handles for every item in the snapshot
+    """
+    return _tables.get(snapshot or food_index.get(), lambda built: HandleTable(item['_id'] for item in built.items))
+
+
+def compact_line(table: HandleTable, item: Dict, restaurant: Optional[Dict]) -> str:
+    """
+    One-line candidate summary for LLM context
+
+    Args:
+        table (HandleTable): Handle table for the item's snapshot
+        item (Dict): Food item document (or a tool result with 'id'/'_id')
+        restaurant (Dict): Restaurant document or summary, if known
+
+    Returns:
+        str: e.g. "3f9a2c | Margherita Pizza | $12.00 | Roma 4.5★ 25-30 mins | vegetarian, cheesy"
+    """
+    restaurant = restaurant or {}
+    tags = ', '.join((item.get('tags') or [])[:LINE_TAGS])
+    line = (
+        f"{table.handle(item.get('_id') or item.get('id'))} | {item['name']} | ${float(item['price']):.2f} | "
+        f"{restaurant.get('name', 'Restaurant')} {restaurant.get('rating', '?')}★ {restaurant.get('deliveryTime', '?')}"
+    )
+    return f"{line} | {tags}" if tags else line
+
+
+def compact_restaurant_line(restaurant: Dict) -> str:
+    """One-line restaurant summary for LLM context"""
+    cuisine = restaurant.get('cuisine') or []
+    cuisine = ', '.join(cuisine) if isinstance(cuisine, list) else str(cuisine)
+    return (
+        f"{restaurant.get('name', 'Restaurant')} | {cuisine} | {restaurant.get('rating', '?')}★ | "
+        f"{restaurant.get('deliveryTime', '?')}"
+    )
+
+
+def compact_results(results: Iterable[Dict], snapshot: Optional[FoodIndexSnapshot] = None) -> List[str]:
+    """
+    Compact tool results (dicts with 'id', 'name', 'price' and an embedded 'restaurant' summary)
+
+    Args:
+        results (Iterable[Dict]): Formatted food items from search_food_items, discovery or similarity
+        snapshot (FoodIndexSnapshot): Snapshot the results came from (default: the current one)
+
+    Returns:
+        List[str]: One compact_line per result
+    """
+    table = handle_table(snapshot)
+    return [compact_line(table, result, result.get('restaurant')) for result in results]
@@ -0,0 +1,116 @@
+"""
+Hydration of LLM-picked recommendations.
+Models only name item ids (or handles); every id is checked against the catalog snapshot and
+all displayed fields are filled from it in one batched lookup. Unknown ids are counted as
+hallucinations and replaced with the next unused candidate.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Collection, Dict, List, Optional
+
+from ..search.food_index import FoodIndexSnapshot
+from ..utils.metrics import stage_metrics
+from .fast_path import format_recommendations
+
+
+class RecommendationHydrator:
+    """Validates LLM picks against the catalog and counts hallucinated ids per pipeline"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def hydrate(
+        self,
+        source: str,
+        snapshot: FoodIndexSnapshot,
+        picks: Optional[List[Any]],
+        intent: Dict,
+        candidates: List[Dict],
+        resolve: Optional[Callable[[Any], Optional[str]]] = None,
+        allowed: Optional[Collection[str]] = None,
+        default_count: int = 3
+    ) -> List[Dict]:
+        """
+        Turn model picks into catalog-backed recommendations
+
+        Args:
+            source (str): Pipeline reporting the picks ('crew', 'structured'), used for the counters
+            snapshot (FoodIndexSnapshot): Snapshot the picks were made from
+            picks (List): Model output [{id, why_perfect}]; None when the model gave no usable list
+            intent (Dict): Parsed intent used for the reasons and distances
+            candidates (List[Dict]): Ranked items offered to the model, used as replacements
+            resolve (Callable): Maps a model-written id (e.g. a handle) to an item id (default: str)
+            allowed (Collection[str]): Item ids the model may pick (default: the whole catalog)
+            default_count (int): Candidates returned when picks is None
+
+        Returns:
+            List[Dict]: Recommendations in pick order; an explicit empty list stays empty
+        """
+        started = time.perf_counter()
+        if picks is None:
+            return format_recommendations(snapshot, candidates[:default_count], intent)
+
+        resolve = resolve or (lambda token: None if token is None else str(token).strip())
+        tokens = [pick.get('id') if isinstance(pick, dict) else None for pick in picks]
+        item_ids = [resolve(token) for token in tokens]
+        if allowed is not None:
+            item_ids = [item_id if item_id in allowed else None for item_id in item_ids]
+        items = snapshot.items_by_ids(item_ids)
+
+        # None slots are unknown ids; they take the best candidates the model did not pick
+        chosen: List[Optional[Dict]] = []
+        reasons: List[Optional[str]] = []
+        seen = set()
+        unknown = duplicates = 0
+        for pick, item in zip(picks, items):
+            if item is None:
+                unknown += 1
+                chosen.append(None)
+                reasons.append(None)
+            elif str(item['_id']) in seen:
+                duplicates += 1
+            else:
+                seen.add(str(item['_id']))
+                chosen.append(item)
+                reasons.append(pick.get('why_perfect') or None)
+        spare = iter([item for item in candidates if str(item['_id']) not in seen])
+        replaced = 0
+        for position, item in enumerate(chosen):
+            if item is None:
+                chosen[position] = next(spare, None)
+                replaced += chosen[position] is not None
+        kept = [(item, reason) for item, reason in zip(chosen, reasons) if item is not None]
+
+        recommendations = format_recommendations(snapshot, [item for item, _ in kept], intent)
+        for recommendation, (_, reason) in zip(recommendations, kept):
+            if reason:
+                recommendation['why_perfect'] = reason
+
+        self._count(source, picks=len(picks), unknown=unknown, duplicates=duplicates, replaced=replaced)
+        stage_metrics.record(f'hydration.{source}', time.perf_counter() - started)
+        if unknown:
+            print(f"⚠️ {source}: {unknown}/{len(picks)} recommended ids not in the catalog, {replaced} replaced")
+        return recommendations
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get pick counters and the hallucination rate (unknown / picks) per source"""
+        with self._lock:
+            counters = {source: dict(values) for source, values in self._counters.items()}
+        for values in counters.values():
+            values['hallucination_rate'] = round(values['unknown'] / values['picks'], 4) if values['picks'] else 0.0
+        return counters
+
+    def _count(self, source: str, **increments: int) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                source, {'responses': 0, 'picks': 0, 'unknown': 0, 'duplicates': 0, 'replaced': 0}
+            )
+            counters['responses'] += 1
+            for key, value in increments.items():
+                counters[key] += value
+
+
+# Global instance used by the crew and structured pipelines
+recommendation_hydrator = RecommendationHydrator()
@@ -0,0 +1,196 @@
+"""
+Rule-based intent parser.
+Reads foodType, budget and dietary preferences straight from short, explicit messages.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from ..search.inverted_index import tokenize
+
+
+# Food types and cuisines the catalog is organised around (synonym -> canonical foodType)
+FOOD_TYPES = {
+    'pizza': 'pizza', 'pizzas': 'pizza',
+    'burger': 'burger', 'burgers': 'burger',
+    'sushi': 'sushi', 'sashimi': 'sushi', 'maki': 'sushi',
+    'ramen': 'ramen', 'noodles': 'noodles', 'noodle': 'noodles',
+    'pasta': 'pasta', 'spaghetti': 'pasta', 'lasagna': 'pasta',
+    'taco': 'tacos', 'tacos': 'tacos', 'burrito': 'burrito', 'burritos': 'burrito',
+    'curry': 'curry', 'biryani': 'biryani', 'paneer': 'paneer', 'tikka': 'tikka',
+    'salad': 'salad', 'salads': 'salad', 'bowl': 'bowl',
+    'sandwich': 'sandwich', 'sandwiches': 'sandwich', 'wrap': 'wrap',
+    'wings': 'wings', 'chicken': 'chicken', 'steak': 'steak', 'seafood': 'seafood',
+    'dessert': 'dessert', 'desserts': 'dessert', 'cake': 'cake', 'ice': 'ice cream',
+    'indian': 'indian', 'italian': 'italian', 'chinese': 'chinese', 'mexican': 'mexican',
+    'japanese': 'japanese', 'thai': 'thai', 'korean': 'korean', 'american': 'american',
+    'mediterranean': 'mediterranean', 'asian': 'asian'
+}
+
+BUDGET_WORDS = {
+    'cheap': 'low', 'budget': 'low', 'affordable': 'low', 'inexpensive': 'low', 'broke': 'low',
+    'moderate': 'medium', 'reasonable': 'medium',
+    'fancy': 'high', 'premium': 'high', 'gourmet': 'high', 'splurge': 'high',
+    'expensive': 'high', 'luxury': 'high'
+}
+
+PREFERENCE_WORDS = {
+    'vegetarian': 'vegetarian', 'veg': 'vegetarian', 'veggie': 'vegetarian',
+    'vegan': 'vegan', 'plant': 'vegan',
+    'spicy': 'spicy', 'hot': 'spicy', 'fiery': 'spicy',
+    'healthy': 'healthy', 'light': 'healthy', 'lean': 'healthy',
+    'gluten': 'gluten-free'
+}
+
+MOOD_WORDS = {
+    'sad': 'comfort', 'down': 'comfort', 'depressed': 'comfort', 'stressed': 'comfort',
+    'tired': 'comfort', 'lonely': 'comfort', 'upset': 'comfort', 'comfort': 'comfort', 'cozy': 'comfort',
+    'celebrate': 'celebration', 'celebrating': 'celebration', 'celebration': 'celebration',
+    'birthday': 'celebration', 'anniversary': 'celebration', 'party': 'celebration',
+    'adventurous': 'adventurous', 'new': 'adventurous', 'different': 'adventurous',
+    'casual': 'casual', 'chill': 'casual'
+}
+
+URGENCY_WORDS = {'quick', 'fast', 'asap', 'hurry', 'now', 'quickly'}
+
+MEAL_WORDS = {'breakfast': 'breakfast', 'brunch': 'breakfast', 'lunch': 'lunch',
+              'dinner': 'dinner', 'supper': 'dinner', 'snack': 'snack'}
+
+# Filler words that carry no intent but should not count against confidence
+STOPWORDS = {
+    'i', 'a', 'an', 'the', 'some', 'any', 'want', 'wanna', 'need', 'get', 'me', 'for', 'please',
+    'food', 'order', 'under', 'below', 'less', 'than', 'max', 'up', 'to', 'with', 'and', 'or',
+    'something', 'dish', 'dishes', 'meal', 'options', 'show', 'find', 'like', 'would', 'id', 'd',
+    'free', 'based', 'cream', 'can', 'you', 'of', 'in', 'my', 'is', 'its', 'it', 'today', 'tonight'
+}
+
+# Phrases that need empathy or judgement: always escalate to the full crew
+ESCALATION_WORDS = {
+    'feel', 'feeling', 'felt', 'sad', 'depressed', 'stressed', 'tired', 'lonely', 'upset',
+    'angry', 'anxious', 'bored', 'mood', 'celebrate', 'celebrating', 'celebration', 'breakup',
+    'sick', 'hungover', 'birthday', 'anniversary', 'date', 'party', 'surprise', 'recommend',
+    'suggest', 'should', 'what', 'why', 'not', 'no', 'without', 'except', 'allergic', 'allergy'
+}
+
+# Escalation words that only frame the request and add nothing to its meaning
+FRAMING_WORDS = {'feel', 'feeling', 'felt', 'mood', 'recommend', 'suggest', 'should', 'what', 'why'}
+
+PRICE_PATTERN = re.compile(
+    r'(?:under|below|less than|max|upto|up to|<)?\s*\$\s*(\d+(?:\.\d+)?)|'
+    r'(?:under|below|less than|max|upto|up to)\s+(\d+(?:\.\d+)?)'
+)
+
+
+class IntentParser:
+    """
+    Lexicon-driven parser producing the same intent fields the intent-analysis task asks the LLM for.
+    Emits a confidence score so callers can decide whether to trust it or escalate.
+    """
+
+    def __init__(self, extra_food_types: Optional[Iterable[str]] = None):
+        """
+        Initialize the parser
+
+        Args:
+            extra_food_types (Iterable[str]): Additional food type terms, e.g. catalog categories
+        """
+        self.food_types = dict(FOOD_TYPES)
+        for term in extra_food_types or []:
+            for token in tokenize(term):
+                self.food_types.setdefault(token, token)
+
+    def parse(self, message: str) -> Dict:
+        """
+        Parse a user message into structured intent
+
+        Args:
+            message (str): Raw user message
+
+        Returns:
+            Dict: Intent fields, leftover 'keywords', 'confidence' (0-1) and 'escalate_reason'
+        """
+        text = message.lower()
+        tokens = tokenize(text)
+        intent = {
+            'mood': None,
+            'budget': None,
+            'max_price': None,
+            'foodType': None,
+            'preferences': [],
+            'urgency': 'normal',
+            'emotional_context': None,
+            'meal_type': None,
+            'serving_size': None,
+            'health_goals': None,
+            'keywords': [],
+            'confidence': 0.0,
+            'escalate_reason': None
+        }
+
+        food_types: List[str] = []
+        keywords: List[str] = []
+        escalations: List[str] = []
+        for token in tokens:
+            if token in ESCALATION_WORDS:
+                escalations.append(token)
+            if token in MOOD_WORDS:
+                intent['mood'] = MOOD_WORDS[token]
+            if token in self.food_types:
+                canonical = self.food_types[token]
+                if canonical not in food_types:
+                    food_types.append(canonical)
+            elif token in BUDGET_WORDS:
+                intent['budget'] = BUDGET_WORDS[token]
+            elif token in PREFERENCE_WORDS:
+                preference = PREFERENCE_WORDS[token]
+                if preference not in intent['preferences']:
+                    intent['preferences'].append(preference)
+            elif token in URGENCY_WORDS:
+                intent['urgency'] = 'fast'
+            elif token in MEAL_WORDS:
+                intent['meal_type'] = MEAL_WORDS[token]
+            elif token not in STOPWORDS and token not in MOOD_WORDS and not token.isdigit():
+                keywords.append(token)
+
+        price_match = PRICE_PATTERN.search(text)
+        if price_match:
+            intent['max_price'] = float(price_match.group(1) or price_match.group(2))
+            if intent['budget'] is None:
+                intent['budget'] = _budget_for_price(intent['max_price'])
+
+        if 'healthy' in intent['preferences'] and intent['mood'] is None:
+            intent['mood'] = 'healthy'
+        if food_types:
+            intent['foodType'] = ' '.join(food_types)
+        intent['keywords'] = sorted(set(keywords) - FRAMING_WORDS)
+
+        if escalations or '?' in text:
+            intent['escalate_reason'] = f"needs judgement: {escalations[0] if escalations else 'question'}"
+            return intent
+        if not food_types:
+            intent['escalate_reason'] = 'no food type recognised'
+            return intent
+
+        unknown = len(keywords)
+        confidence = 0.5
+        if intent['budget']:
+            confidence += 0.2
+        if intent['preferences']:
+            confidence += 0.15
+        if len(tokens) <= 8:
+            confidence += 0.15
+        if unknown == 0:
+            confidence += 0.2
+        # Unrecognised words mean the message says something we did not understand
+        confidence *= 1.0 - unknown / max(len(tokens), 1)
+        intent['confidence'] = round(min(confidence, 1.0), 2)
+        return intent
+
+
+def _budget_for_price(max_price: float) -> str:
+    """Map an explicit price ceiling to a budget bucket"""
+    if max_price <= 15:
+        return 'low'
+    if max_price <= 25:
+        return 'medium'
+    return 'high'
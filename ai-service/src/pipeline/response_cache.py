@@ -0,0 +1,194 @@
+"""
+Recommendation response cache.
+Serves repeat intents without a crew run; entries are keyed on normalized intent and catalog version.
+"""
+
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.settings import config
+from .intent_parser import IntentParser
+
+
+# Placeholder stored in cached messages instead of the requesting user's name
+USER_NAME_PLACEHOLDER = "{user_name}"
+
+# Intent fields that identify a request; everything else is presentation or bookkeeping
+KEY_FIELDS = ('mood', 'budget', 'max_price', 'foodType', 'preferences', 'urgency', 'meal_type', 'keywords')
+
+# Users in the same cell (about 1 km) share cached answers
+LOCATION_CELL_DEGREES = 0.01
+
+_parser = IntentParser()
+
+
+def intent_signature(user_message: str) -> Dict[str, Any]:
+    """
+    Normalize a message to the intent fields that determine the crew's answer
+
+    Args:
+        user_message (str): Raw user message
+
+    Returns:
+        Dict: Canonical intent fields (lists sorted)
+    """
+    intent = _parser.parse(user_message)
+    signature = {field: intent.get(field) for field in KEY_FIELDS}
+    signature['preferences'] = sorted(signature['preferences'] or [])
+    return signature
+
+
+def cache_key(
+    user_message: str,
+    version: str,
+    location: Optional[Tuple[float, float]] = None,
+    taste: Optional[str] = None
+) -> str:
+    """
+    Build the cache key for a message at a catalog version
+
+    Args:
+        user_message (str): Raw user message
+        version (str): Catalog version stamp
+        location (Tuple[float, float]): User coordinates; answers differ by neighbourhood
+        taste (str): Taste segment (taste_profiles.segment); answers differ by ordering habits
+
+    Returns:
+        str: Hex digest identifying (intent, catalog version, location cell, taste segment)
+    """
+    cell = [round(value / LOCATION_CELL_DEGREES) for value in location] if location else None
+    payload = json.dumps(
+        {'intent': intent_signature(user_message), 'catalog': version, 'cell': cell, 'taste': taste},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def depersonalize(response: Dict[str, Any], user_name: str) -> Dict[str, Any]:
+    """Strip per-user fields from a response before caching it"""
+    stored = copy.deepcopy(response)
+    stored.pop('user_context', None)
+    stored.pop('processed_at', None)
+    if user_name and isinstance(stored.get('message'), str):
+        name_pattern = re.compile(rf"\b{re.escape(user_name)}\b")
+        stored['message'] = name_pattern.sub(USER_NAME_PLACEHOLDER, stored['message'])
+    return stored
+
+
+def personalize(response: Dict[str, Any], user_name: str) -> Dict[str, Any]:
+    """Fill a cached response back in for a specific user"""
+    served = copy.deepcopy(response)
+    if isinstance(served.get('message'), str):
+        served['message'] = served['message'].replace(USER_NAME_PLACEHOLDER, user_name or 'friend')
+    return served
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL.
+    The whole cache is dropped when the catalog version moves on, so stale dishes are never served.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum cached responses before LRU eviction
+            ttl_seconds (float): Lifetime of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def get(self, key: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a depersonalized response
+
+        Args:
+            key (str): Cache key from cache_key()
+            version (str): Current catalog version
+
+        Returns:
+            Optional[Dict]: Cached response, or None on miss
+        """
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            stored_at, response = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return response
+
+    def put(self, key: str, version: str, response: Dict[str, Any]) -> None:
+        """
+        Store a depersonalized response
+
+        Args:
+            key (str): Cache key from cache_key()
+            version (str): Catalog version the response was computed against
+            response (Dict): Response with per-user fields removed
+        """
+        with self._lock:
+            # A crew run that started before the catalog changed must not repopulate the cache
+            if version != self._version:
+                return
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss metrics
+
+        Returns:
+            Dict: Counters, size and hit rate
+        """
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': round(self._counters['hits'] / lookups, 3) if lookups else 0.0,
+                'catalog_version': self._version
+            }
+
+    def _check_version(self, version: str) -> None:
+        """Invalidate everything when the catalog version changes (lock held)"""
+        if version != self._version:
+            if self._entries:
+                self._counters['invalidations'] += 1
+            self._entries.clear()
+            self._version = version
+
+
+# Global instance used by the food crew
+response_cache = ResponseCache(
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS
+)
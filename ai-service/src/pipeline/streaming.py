@@ -0,0 +1,66 @@
+"""
+Progress events for Server-Sent Events.
+The recommendation pipelines report their stages through a progress callback; these helpers
+build the event payloads so crew and structured runs stream the same shapes.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Receives (event name, event data) from the worker thread running the pipeline
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# Intent fields shown in the "intent" event
+INTENT_EVENT_FIELDS = ('mood', 'budget', 'max_price', 'foodType', 'preferences', 'urgency')
+
+
+def report(progress: Optional[ProgressCallback], event: str, data: Dict[str, Any]) -> None:
+    """
+    Send one progress event, if anyone is listening
+
+    A failing listener (e.g. a client that disconnected) never fails the pipeline.
+
+    Args:
+        progress (ProgressCallback): Listener, or None
+        event (str): Event name
+        data (Dict): Event data
+    """
+    if progress is None:
+        return
+    try:
+        progress(event, data)
+    except Exception as e:
+        print(f"⚠️ Progress listener failed: {e}")
+
+
+def intent_event(intent: Dict) -> Dict[str, Any]:
+    """Payload of the "intent" event"""
+    return {key: intent.get(key) for key in INTENT_EVENT_FIELDS}
+
+
+def candidates_event(items: Iterable[Dict]) -> Dict[str, Any]:
+    """Payload of the "candidates" event: the ranked shortlist the advisor picks from"""
+    listed = [{'id': str(item['_id']), 'name': item['name']} for item in items]
+    return {'count': len(listed), 'items': listed}
+
+
+def ranking_event(ranked: Iterable[Tuple[Dict, float]]) -> Dict[str, Any]:
+    """Payload of the "ranking" event: the shortlist as the scoring engine ranked it, best first"""
+    listed = [
+        {'id': str(item['_id']), 'name': item['name'], 'score': round(float(score), 4)}
+        for item, score in ranked
+    ]
+    return {'count': len(listed), 'items': listed}
+
+
+def picks_event(result: Dict[str, Any]) -> Dict[str, Any]:
+    """"ranking" payload for answers that ran no ranking stage (fast path, cache hits): the final picks"""
+    listed = [
+        {'id': rec.get('id'), 'name': rec.get('name'), 'score': None}
+        for rec in result.get('recommendations', [])
+    ]
+    return {'count': len(listed), 'items': listed}
+
+
+def token_event(text: str) -> Dict[str, Any]:
+    """Payload of a "token" event: the next piece of the advisor message"""
+    return {'text': text}
@@ -0,0 +1,269 @@
+"""
+Single-call structured recommendation pipeline.
+Retrieves candidates in code, then asks Gemini once for schema-constrained JSON, streamed so
+the message can be shown while the rest of the payload is still being written.
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import config
+from ..llm.json_output import JsonFieldStream, parse_json_response
+from ..llm.rate_limiter import gemini_limiter
+from ..search.food_index import FoodIndexSnapshot, food_index
+from ..utils.metrics import stage_metrics
+from .fast_path import apply_user_context, fast_path, rank_candidates
+from .hydration import recommendation_hydrator
+from .streaming import ProgressCallback, candidates_event, intent_event, ranking_event, report, token_event
+
+
+# Search text used when the message names a mood but no food type
+MOOD_QUERIES = {
+    'comfort': 'pizza indian mexican dessert',
+    'celebration': 'dessert steak sushi',
+    'healthy': 'salad bowl healthy',
+    'adventurous': 'thai korean japanese',
+    'casual': 'burger pizza sandwich'
+}
+
+# Gemini response schema: the model only picks candidate ids, the rest is hydrated in code
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "message": {"type": "STRING"},
+        "recommendations": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "id": {"type": "STRING"},
+                    "why_perfect": {"type": "STRING"}
+                },
+                "required": ["id", "why_perfect"]
+            }
+        },
+        "actionRequired": {
+            "type": "OBJECT",
+            "nullable": True,
+            "properties": {
+                "type": {"type": "STRING"},
+                "message": {"type": "STRING"},
+                "item_id": {"type": "STRING"}
+            }
+        }
+    },
+    "required": ["message", "recommendations"]
+}
+
+
+def candidate_query(intent: Dict) -> str:
+    """Pick the search text for an intent: food type, then keywords, then the mood's usual dishes"""
+    return intent['foodType'] or ' '.join(intent['keywords']) or MOOD_QUERIES.get(intent['mood'], '')
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text of one streamed response chunk; chunks without parts (e.g. the closing one) have none"""
+    try:
+        return chunk.text or ''
+    except ValueError:
+        return ''
+
+
+class StructuredRecommendationPipeline:
+    """
+    Alternative to the sequential agent crew.
+    Same input and output contract as FoodRecommendationCrew.process_user_query.
+    """
+
+    def __init__(self, max_candidates: int):
+        """
+        Initialize the pipeline
+
+        Args:
+            max_candidates (int): Candidates retrieved and shown to the model
+        """
+        self.max_candidates = max_candidates
+        self._model = None
+
+    def process_user_query(self, user_message: str, user_context: Dict = None) -> Dict[str, Any]:
+        """
+        Produce recommendations with one retrieval step and one LLM call
+
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): Additional context about the user (name, id, address, etc.)
+
+        Returns:
+            Dict: Recommendation response with message, recommendations, and actions
+        """
+        return self.run(user_message, user_context)[0]
+
+    def run(
+        self,
+        user_message: str,
+        user_context: Dict = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """
+        Same as process_user_query, also returning the tokens Gemini reported for the call
+
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): Additional context about the user
+            progress (ProgressCallback): Receives "intent", "candidates" and "ranking" once retrieval is
+                done, then "token" events as the message streams in
+
+        Returns:
+            Tuple: (recommendation response, (prompt tokens, completion tokens))
+        """
+        started = time.perf_counter()
+        user_name = user_context.get('name', 'friend') if user_context else 'friend'
+
+        snapshot, intent, candidates = self.retrieve(user_message, user_context)
+        report(progress, 'intent', intent_event(intent))
+        report(progress, 'candidates', candidates_event(item for item, _ in candidates))
+        report(progress, 'ranking', ranking_event(candidates))
+        try:
+            payload, usage = self._generate(user_message, user_name, intent, snapshot, candidates, progress)
+            result = self._hydrate(payload, snapshot, intent, candidates)
+        except Exception as e:
+            print(f"❌ Structured pipeline LLM call failed: {e}")
+            usage = (0, 0)
+            result = self._hydrate({}, snapshot, intent, candidates)
+            result['message'] = f"Hey {user_name}! Here are some top picks while my AI chef catches its breath 🍽️"
+            result['fallback'] = True
+
+        result['user_context'] = user_context
+        result['processed_at'] = datetime.now().isoformat()
+        stage_metrics.record('pipeline.structured', time.perf_counter() - started, *usage)
+        return result, usage
+
+    def retrieve(
+        self,
+        user_message: str,
+        user_context: Dict = None
+    ) -> Tuple[FoodIndexSnapshot, Dict, List[Tuple[Dict, float]]]:
+        """
+        Parse intent and pull ranked candidates from the local index
+
+        Args:
+            user_message (str): User's food request message
+            user_context (Dict): User context; address coordinates enable distance filtering and
+                the user id selects the taste profile used in ranking
+
+        Returns:
+            Tuple: (snapshot, intent, ranked (item, score) candidates)
+        """
+        snapshot = food_index.get()
+        intent = apply_user_context(fast_path.parser_for(snapshot).parse(user_message), user_context)
+        query = candidate_query(intent)
+        candidates = rank_candidates(snapshot, intent, self.max_candidates, query=query)
+        if not candidates and query:
+            # Nothing matched the text: fall back to the best-rated items that respect the filters
+            candidates = rank_candidates(snapshot, intent, self.max_candidates, query='')
+        return snapshot, intent, candidates
+
+    def _generate(
+        self,
+        user_message: str,
+        user_name: str,
+        intent: Dict,
+        snapshot: FoodIndexSnapshot,
+        candidates: List[Tuple[Dict, float]],
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """Make the single schema-constrained Gemini call, streaming the message as "token" events"""
+        if self._model is None:
+            self._model = config.get_gemini_direct()
+
+        lines = []
+        for item, _ in candidates:
+            restaurant = snapshot.restaurant_for(item) or {}
+            lines.append(
+                f"{item['_id']} | {item['name']} | ${item['price']:.2f} | "
+                f"{restaurant.get('name', 'Restaurant')} ({restaurant.get('rating', '?')}★, "
+                f"{restaurant.get('deliveryTime', '?')}) | {', '.join(item.get('tags') or [])}"
+            )
+        intent_fields = {key: intent[key] for key in ('mood', 'budget', 'max_price', 'foodType', 'preferences')}
+
+        prompt = f"""You are Jarvis, a witty, warm food advisor for a delivery app.
+User "{user_name}" wrote: "{user_message}"
+Parsed intent: {json.dumps(intent_fields)}
+
+Candidate dishes (id | name | price | restaurant (rating, delivery) | tags):
+{chr(10).join(lines) if lines else 'none'}
+
+Pick the 3-5 candidates that best fit the user, best first, using only ids from the list.
+- message: 1-2 short sentences (max 50 words) addressed to {user_name}, at most 2 emojis, a little sarcastic
+- recommendations: id and a why_perfect line under 20 words each
+- actionRequired: offer to add the top pick to the cart (type "add_to_cart"), or null if they are just browsing"""
+
+        chunks = gemini_limiter.call(
+            self._model.generate_content,
+            prompt,
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": RESPONSE_SCHEMA,
+                "temperature": config.TEMPERATURE,
+                "max_output_tokens": config.MAX_TOKENS
+            },
+            stream=True
+        )
+        message = JsonFieldStream('message')
+        parts = []
+        usage = None
+        for chunk in chunks:
+            text = _chunk_text(chunk)
+            parts.append(text)
+            piece = message.feed(text)
+            if piece:
+                report(progress, 'token', token_event(piece))
+            # Every chunk carries the running totals; the last one has the final counts
+            usage = getattr(chunk, 'usage_metadata', None) or usage
+        tokens = (
+            getattr(usage, 'prompt_token_count', 0) or 0,
+            getattr(usage, 'candidates_token_count', 0) or 0
+        )
+        payload, errors = parse_json_response(''.join(parts), RESPONSE_SCHEMA)
+        if errors:
+            raise ValueError(f"Unusable structured response: {'; '.join(errors[:3])}")
+        return payload, tokens
+
+    def _hydrate(
+        self,
+        payload: Dict[str, Any],
+        snapshot: FoodIndexSnapshot,
+        intent: Dict,
+        candidates: List[Tuple[Dict, float]]
+    ) -> Dict[str, Any]:
+        """Turn the model's id picks into full recommendations from the candidate set"""
+        items = [item for item, _ in candidates]
+        recommendations = recommendation_hydrator.hydrate(
+            'structured',
+            snapshot,
+            payload.get('recommendations') or None,
+            intent,
+            items,
+            allowed={str(item['_id']) for item in items}
+        )
+
+        # An explicit null means the user is just browsing; otherwise offer the top pick
+        action = None
+        if recommendations and (not payload or payload.get('actionRequired')):
+            top = recommendations[0]
+            action = {
+                'type': 'add_to_cart',
+                'message': f"Would you like me to add the {top['name']} to your cart?",
+                'item_id': top['id']
+            }
+        return {
+            'message': payload.get('message') or "Found some great options for you!",
+            'recommendations': recommendations,
+            'actionRequired': action
+        }
+
+
+# Global instance used when PIPELINE_MODE is "structured"
+structured_pipeline = StructuredRecommendationPipeline(max_candidates=config.STRUCTURED_MAX_CANDIDATES)
@@ -0,0 +1,317 @@
+"""
+Vectorized candidate scoring engine.
+Replaces the LLM evaluation stage: candidates become a feature matrix scored with per-intent weights.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from ..search.food_index import PREFERENCE_FLAGS, PREFERENCE_TAGS, FoodIndexSnapshot
+from ..search.geo_index import food_distances
+
+
+# Feature columns, each normalized to [0, 1]
+FEATURES = (
+    'relevance',
+    'price_fit',
+    'item_rating',
+    'restaurant_rating',
+    'delivery_speed',
+    'dietary_match',
+    'tag_overlap',
+    'proximity',
+    'taste_match'
+)
+
+# Default weight per feature (normalized to sum 1 after intent adjustments)
+BASE_WEIGHTS = {
+    'relevance': 0.35,
+    'price_fit': 0.15,
+    'item_rating': 0.15,
+    'restaurant_rating': 0.15,
+    'delivery_speed': 0.05,
+    'dietary_match': 0.05,
+    'tag_overlap': 0.10,
+    # Only weighted when the user's location is known
+    'proximity': 0.0,
+    # Only weighted when the user has a taste profile
+    'taste_match': 0.0
+}
+
+# Extra weight added when an intent signal is present
+INTENT_ADJUSTMENTS = {
+    'budget_conscious': {'price_fit': 0.15},
+    'urgent': {'delivery_speed': 0.20},
+    'celebration': {'item_rating': 0.10, 'restaurant_rating': 0.05},
+    'comfort': {'item_rating': 0.05},
+    'healthy': {'dietary_match': 0.10, 'tag_overlap': 0.05},
+    'dietary': {'dietary_match': 0.10},
+    'located': {'proximity': 0.15},
+    'personalized': {'taste_match': 0.15}
+}
+
+# Delivery window used to scale delivery_speed: 15 minutes or less scores 1, 60 or more scores 0
+FASTEST_DELIVERY_MINUTES = 15.0
+SLOWEST_DELIVERY_MINUTES = 60.0
+
+# Price at which a high-budget ("treat yourself") request is fully satisfied
+SPLURGE_PRICE = 30.0
+
+# Center of the medium budget bucket
+MEDIUM_BUDGET_CENTER = 17.5
+
+# Distance at which proximity scores 0 when no search radius is configured
+DEFAULT_PROXIMITY_KM = 10.0
+
+# Share of taste_match from cuisine affinity, favourite restaurants, usual price band and dietary habits
+TASTE_COMPONENTS = {'cuisine': 0.4, 'restaurant': 0.25, 'price': 0.2, 'dietary': 0.15}
+
+
+def weights_for(intent: Dict) -> np.ndarray:
+    """
+    Build the weight vector for a parsed intent
+
+    Args:
+        intent (Dict): Parsed intent (budget, max_price, urgency, mood, preferences, location, taste)
+
+    Returns:
+        np.ndarray: Weights aligned with FEATURES, summing to 1
+    """
+    weights = dict(BASE_WEIGHTS)
+    preferences = set(intent.get('preferences') or [])
+    signals = {
+        'budget_conscious': intent.get('budget') == 'low' or intent.get('max_price') is not None,
+        'urgent': intent.get('urgency') == 'fast',
+        'celebration': intent.get('mood') == 'celebration',
+        'comfort': intent.get('mood') == 'comfort',
+        'healthy': intent.get('mood') == 'healthy' or 'healthy' in preferences,
+        'dietary': bool(preferences & set(PREFERENCE_FLAGS)),
+        'located': intent.get('location') is not None,
+        'personalized': bool(intent.get('taste'))
+    }
+    for signal, active in signals.items():
+        if active:
+            for feature, extra in INTENT_ADJUSTMENTS[signal].items():
+                weights[feature] += extra
+
+    vector = np.array([weights[feature] for feature in FEATURES], dtype=np.float64)
+    return vector / vector.sum()
+
+
+def build_feature_matrix(
+    snapshot: FoodIndexSnapshot,
+    items: Sequence[Dict],
+    relevance: Sequence[float],
+    intent: Dict
+) -> np.ndarray:
+    """
+    Turn candidate items into a feature matrix
+
+    Args:
+        snapshot (FoodIndexSnapshot): Index snapshot whose catalog columns supply the features
+        items (Sequence[Dict]): Candidate food item documents
+        relevance (Sequence[float]): Text relevance per item (any non-negative scale)
+        intent (Dict): Parsed intent
+
+    Returns:
+        np.ndarray: Matrix of shape (len(items), len(FEATURES))
+    """
+    catalog = snapshot.catalog
+    rows = np.array([catalog.food_row(item['_id']) for item in items], dtype=np.int64)
+    price = catalog.price[rows].astype(np.float64)
+    item_rating = catalog.rating[rows].astype(np.float64)
+    restaurant_rating = catalog.food_restaurant_rating(rows).astype(np.float64)
+    delivery = catalog.food_delivery_minutes(rows).astype(np.float64)
+
+    relevance = np.asarray(relevance, dtype=np.float64)
+    top = relevance.max() if relevance.size else 0.0
+    relevance = relevance / top if top > 0 else np.ones_like(relevance)
+
+    preferences = list(intent.get('preferences') or [])
+    flag_columns = {
+        'isVegetarian': catalog.is_vegetarian,
+        'isVegan': catalog.is_vegan,
+        'isGlutenFree': catalog.is_gluten_free
+    }
+    dietary = np.ones(len(items), dtype=np.float64)
+    if preferences:
+        satisfied = np.zeros(len(items), dtype=np.float64)
+        for pref in preferences:
+            # A preference is met by its item flag, its tag group, or a tag with the same name
+            group = PREFERENCE_TAGS.get(pref, set()) | {pref}
+            hit = catalog.tags.rows_with_any(catalog.terms.codes_equal(group))[rows]
+            if pref in PREFERENCE_FLAGS:
+                hit = hit | flag_columns[PREFERENCE_FLAGS[pref]][rows]
+            satisfied += hit
+        dietary = satisfied / len(preferences)
+
+    wanted_tags = {tag.lower() for tag in preferences + list(intent.get('keywords') or [])}
+    if intent.get('foodType'):
+        wanted_tags.add(intent['foodType'].lower())
+    overlap = np.zeros(len(items), dtype=np.float64)
+    for tag in wanted_tags:
+        overlap += catalog.tags.rows_with_any(catalog.terms.codes_equal([tag]))[rows]
+    if wanted_tags:
+        overlap /= len(wanted_tags)
+
+    # 1 next door, 0 at the edge of the search radius; neutral when either location is unknown
+    proximity = np.full(len(items), 0.5, dtype=np.float64)
+    if intent.get('location') is not None:
+        distance = food_distances(catalog, rows, intent['location']).astype(np.float64)
+        known = ~np.isnan(distance)
+        proximity[known] = 1.0 - distance[known] / (config.GEO_SEARCH_RADIUS_KM or DEFAULT_PROXIMITY_KM)
+
+    taste = np.full(len(items), 0.5, dtype=np.float64)
+    if intent.get('taste'):
+        taste = _taste_match(catalog, rows, price, intent['taste'], flag_columns)
+
+    matrix = np.column_stack([
+        relevance,
+        _price_fit(price, intent),
+        item_rating / 5.0,
+        restaurant_rating / 5.0,
+        1.0 - (delivery - FASTEST_DELIVERY_MINUTES) / (SLOWEST_DELIVERY_MINUTES - FASTEST_DELIVERY_MINUTES),
+        dietary,
+        overlap,
+        proximity,
+        taste
+    ])
+    return np.clip(matrix, 0.0, 1.0)
+
+
+def _taste_match(
+    catalog,
+    rows: np.ndarray,
+    price: np.ndarray,
+    taste: Dict,
+    flag_columns: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """How well each candidate fits the user's ordering history (see taste_profiles.signals)"""
+    restaurant_rows = catalog.restaurant_row[rows]
+    known = restaurant_rows >= 0
+
+    cuisine = np.zeros(len(rows), dtype=np.float64)
+    top_affinity = max(taste['cuisines'].values(), default=0.0)
+    for name, affinity in taste['cuisines'].items():
+        serves = catalog.restaurant_cuisine.rows_with_any(catalog.labels.codes_equal([name]))
+        hit = np.zeros(len(rows), dtype=bool)
+        hit[known] = serves[restaurant_rows[known]]
+        cuisine = np.maximum(cuisine, hit * (affinity / top_affinity if top_affinity else 0.0))
+
+    favourite = np.zeros(len(rows), dtype=np.float64)
+    top_share = max(taste['restaurants'].values(), default=0.0)
+    for restaurant_id, share in taste['restaurants'].items():
+        row = catalog.restaurant_row_of(restaurant_id)
+        if row is not None and top_share:
+            favourite[restaurant_rows == row] = share / top_share
+
+    # 1 inside the user's usual p25-p75 band, fading out over a factor of 3 beyond it
+    band = np.full(len(rows), 0.5, dtype=np.float64)
+    if taste.get('price_p50'):
+        low, high = taste.get('price_p25') or taste['price_p50'], taste.get('price_p75') or taste['price_p50']
+        clipped = np.clip(price, 1e-6, None)
+        outside = np.maximum(np.log(low / clipped), np.log(clipped / high)).clip(min=0.0)
+        band = 1.0 - outside / np.log(3.0)
+
+    dietary = np.ones(len(rows), dtype=np.float64)
+    habits = [PREFERENCE_FLAGS[pref] for pref in taste.get('dietary') or [] if pref in PREFERENCE_FLAGS]
+    if habits:
+        dietary = sum(flag_columns[flag][rows].astype(np.float64) for flag in habits) / len(habits)
+
+    return np.clip(
+        TASTE_COMPONENTS['cuisine'] * cuisine
+        + TASTE_COMPONENTS['restaurant'] * favourite
+        + TASTE_COMPONENTS['price'] * band
+        + TASTE_COMPONENTS['dietary'] * dietary,
+        0.0, 1.0
+    )
+
+
+def _price_fit(price: np.ndarray, intent: Dict) -> np.ndarray:
+    """How well each price fits the stated ceiling or budget bucket"""
+    ceiling = intent.get('max_price')
+    if ceiling:
+        return 1.0 - np.minimum(price / ceiling, 1.0) * 0.5
+    budget = intent.get('budget')
+    if budget == 'low':
+        return 1.0 / (1.0 + price / 10.0)
+    if budget == 'medium':
+        return 1.0 - np.abs(price - MEDIUM_BUDGET_CENTER) / MEDIUM_BUDGET_CENTER
+    if budget == 'high':
+        return price / SPLURGE_PRICE
+    return np.full_like(price, 0.5)
+
+
+class ScoringEngine:
+    """
+    Deterministic replacement for the evaluator agent.
+    Scores are reproducible and every pick comes with its per-feature contributions.
+    """
+
+    def rank(
+        self,
+        snapshot: FoodIndexSnapshot,
+        candidates: Sequence[Tuple[Dict, float]],
+        intent: Dict,
+        k: int
+    ) -> List[Dict]:
+        """
+        Score candidates and return the top k
+
+        Args:
+            snapshot (FoodIndexSnapshot): Index snapshot whose catalog supplies the features
+            candidates (Sequence[Tuple[Dict, float]]): (item, text relevance) pairs
+            intent (Dict): Parsed intent
+            k (int): Number of results
+
+        Returns:
+            List[Dict]: Best first; each has 'item', 'score' and a per-feature 'breakdown'
+        """
+        if not candidates or k <= 0:
+            return []
+        items = [item for item, _ in candidates]
+        matrix = build_feature_matrix(snapshot, items, [score for _, score in candidates], intent)
+        weights = weights_for(intent)
+        contributions = matrix * weights
+        scores = contributions.sum(axis=1)
+
+        k = min(k, len(items))
+        if k < len(items):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(items))
+        # Stable order among the selected rows: score desc, then original (relevance) order
+        top = top[np.lexsort((top, -scores[top]))]
+
+        return [
+            {
+                'item': items[row],
+                'score': float(scores[row]),
+                'breakdown': {
+                    feature: round(float(contributions[row, column]), 4)
+                    for column, feature in enumerate(FEATURES)
+                }
+            }
+            for row in top
+        ]
+
+
+def describe_breakdown(breakdown: Dict[str, float], limit: int = 2) -> str:
+    """
+    Summarize the features that contributed most to a score
+
+    Args:
+        breakdown (Dict[str, float]): Per-feature contributions from ScoringEngine.rank
+        limit (int): Number of features to mention
+
+    Returns:
+        str: e.g. "relevance 0.31, price_fit 0.22"
+    """
+    strongest = sorted(breakdown.items(), key=lambda pair: -pair[1])[:limit]
+    return ', '.join(f"{feature} {value:.2f}" for feature, value in strongest)
+
+
+# Global instance shared by the fast path, the structured pipeline and the crew
+scoring_engine = ScoringEngine()
@@ -0,0 +1,166 @@
+"""
+Shared HTTP client for the Node backend.
+One long-lived httpx.AsyncClient (HTTP/2 when available, keep-alive pool) opened by the app
+lifespan; blocking callers such as CrewAI tools reach it through run_sync.
+"""
+
+import asyncio
+import importlib.util
+import threading
+import time
+from typing import Any, Awaitable, Dict, Optional
+
+import httpx
+
+from ..config.settings import config
+from ..utils.metrics import stage_metrics
+
+
+class BackendClient:
+    """
+    Pooled async HTTP client bound to one event loop.
+    Inside the service that is the app loop; standalone scripts get a private loop thread on first use.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str],
+        http2: bool,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_seconds: float,
+        timeout_seconds: float
+    ):
+        """
+        Initialize the client (no connections are opened until start)
+
+        Args:
+            base_url (str): Node backend URL
+            http2 (bool): Negotiate HTTP/2 when the h2 package is installed
+            max_connections (int): Upper bound on open connections
+            max_keepalive (int): Idle connections kept for reuse
+            keepalive_seconds (float): How long an idle connection is kept
+            timeout_seconds (float): Per-request timeout
+        """
+        self.base_url = (base_url or '').rstrip('/')
+        self.http2 = http2 and importlib.util.find_spec('h2') is not None
+        if http2 and not self.http2:
+            print("⚠️ h2 is not installed, backend client falls back to HTTP/1.1")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_seconds
+        )
+        self.timeout = timeout_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'errors': 0}
+
+    async def start(self) -> None:
+        """Open the connection pool on the running event loop"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout
+            )
+            self._loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        """Close pooled connections"""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+    async def request(self, name: str, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send one request through the pool and record its latency as backend.<name>
+
+        Args:
+            name (str): Call name for the metrics, e.g. 'cart.add'
+            method (str): HTTP method
+            path (str): Path relative to the backend URL
+            **kwargs: Passed to httpx (json, params, ...)
+
+        Returns:
+            httpx.Response: The backend's response
+
+        Raises:
+            httpx.HTTPError: On connection failures and timeouts
+        """
+        if self._client is None:
+            await self.start()
+        started = time.perf_counter()
+        try:
+            return await self._client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            self._count('errors')
+            raise
+        finally:
+            self._count('requests')
+            stage_metrics.record(f'backend.{name}', time.perf_counter() - started)
+
+    def run_sync(self, coroutine: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the client's loop from a blocking thread (CrewAI tools, scripts)
+
+        Args:
+            coroutine (Awaitable): Coroutine that uses this client
+            timeout (float): Seconds to wait for the result (default: twice the request timeout)
+
+        Returns:
+            Any: The coroutine's result
+
+        Raises:
+            RuntimeError: When called on the client's own loop, where it would deadlock
+        """
+        loop = self._loop or self._standalone_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coroutine.close()
+            raise RuntimeError("BackendClient.run_sync called on its event loop; await the coroutine instead")
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        return future.result(timeout or self.timeout * 2)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool configuration and request counters"""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            'open': self._client is not None,
+            'http2': self.http2,
+            'max_connections': self.limits.max_connections,
+            'max_keepalive': self.limits.max_keepalive_connections,
+            **counters
+        }
+
+    def _standalone_loop(self) -> asyncio.AbstractEventLoop:
+        """Start a private loop thread when no app lifespan opened the client"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="backend-client", daemon=True)
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+            return self._loop
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+
+# Global instance used by the cart tool and the /add-to-cart endpoint
+backend_client = BackendClient(
+    base_url=config.NODE_BACKEND_URL,
+    http2=config.BACKEND_HTTP2,
+    max_connections=config.BACKEND_MAX_CONNECTIONS,
+    max_keepalive=config.BACKEND_MAX_KEEPALIVE,
+    keepalive_seconds=config.BACKEND_KEEPALIVE_SECONDS,
+    timeout_seconds=config.BACKEND_TIMEOUT_SECONDS
+)
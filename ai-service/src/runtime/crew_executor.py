@@ -0,0 +1,148 @@
+"""
+Bounded executor for blocking crew workflows.
+Keeps crew.kickoff() off the event loop and rejects work once the wait queue is full.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from ..config.settings import config
+
+
+class CrewQueueFullError(Exception):
+    """Raised when the executor cannot admit another crew run"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Crew queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedCrewExecutor:
+    """
+    Fixed-size thread pool with a bounded admission queue.
+    At most max_workers runs execute at once and at most max_queue wait behind them.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, retry_after: int):
+        """
+        Initialize the executor
+
+        Args:
+            max_workers (int): Concurrent crew runs
+            max_queue (int): Runs allowed to wait for a free worker
+            retry_after (int): Seconds suggested to rejected clients
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop
+
+        Args:
+            func (Callable): Blocking function to execute
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Return value of func
+
+        Raises:
+            CrewQueueFullError: If all workers are busy and the wait queue is full
+        """
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise CrewQueueFullError(self.retry_after)
+            self._admitted += 1
+
+        submitted_at = time.perf_counter()
+        started = []
+
+        def job():
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self._running += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+                self._started += 1
+                started.append(True)
+            return func(*args, **kwargs)
+
+        def release(future: Future) -> None:
+            # Runs when the job finishes, or is dropped from the queue, even if its caller went away
+            with self._lock:
+                self._admitted -= 1
+                if started:
+                    self._running -= 1
+                if future.cancelled():
+                    self._cancelled += 1
+                elif future.exception() is not None:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+        try:
+            future = self._pool.submit(job)
+        except RuntimeError:
+            # Pool already shut down
+            with self._lock:
+                self._admitted -= 1
+            raise
+        future.add_done_callback(release)
+        # Cancelling the awaiting request cancels a run that has not started yet; a running crew
+        # keeps its slot until it returns
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue and worker statistics
+
+        Returns:
+            Dict: Current queue depth, worker usage and wait times
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._admitted - self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / self._started * 1000, 2) if self._started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2)
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work
+
+        Args:
+            wait (bool): Block until running and queued crews finish (call off the event loop)
+        """
+        self._pool.shutdown(wait=wait)
+
+
+# Global instance used by the FastAPI endpoints
+crew_executor = BoundedCrewExecutor(
+    max_workers=config.CREW_MAX_WORKERS,
+    max_queue=config.CREW_MAX_QUEUE,
+    retry_after=config.CREW_RETRY_AFTER_SECONDS
+)
@@ -0,0 +1,90 @@
+"""
+Single-flight request coalescing.
+Concurrent callers with the same key share one in-flight execution.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..search.inverted_index import tokenize
+
+
+# User context fields left out of the key; the id only matters through the taste segment
+PERSONAL_CONTEXT_FIELDS = ('id', 'name')
+
+
+def coalescing_key(user_message: str, user_context: Dict = None, taste: Optional[str] = None) -> str:
+    """
+    Build the key under which identical chat requests are coalesced
+
+    Args:
+        user_message (str): Raw user message
+        user_context (Dict): User context; personal fields are ignored
+        taste (str): Taste segment of the user (taste_profiles.segment); differently ranked
+            users are not coalesced
+
+    Returns:
+        str: Hex digest of the normalized message and remaining context
+    """
+    context = {
+        key: value for key, value in (user_context or {}).items()
+        if key not in PERSONAL_CONTEXT_FIELDS and value is not None
+    }
+    payload = json.dumps(
+        {'message': ' '.join(tokenize(user_message)), 'context': context, 'taste': taste},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """
+    Event-loop-local registry of in-flight executions.
+    The first caller for a key starts the work; later callers await the same future.
+    The work runs as its own task, so a disconnecting leader does not cancel it for followers.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+        self._counters = {'leaders': 0, 'coalesced': 0}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run func once per key among concurrent callers
+
+        Args:
+            key (str): Coalescing key
+            func (Callable): Coroutine factory performing the work
+
+        Returns:
+            Tuple[Any, bool]: (result, shared) where shared is True for callers that joined
+            another caller's execution
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._counters['coalesced'] += 1
+            return await asyncio.shield(flight), True
+
+        flight = asyncio.ensure_future(func())
+        self._flights[key] = flight
+        self._counters['leaders'] += 1
+        flight.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(flight), False
+
+    def stats(self) -> Dict[str, int]:
+        """Get leader/coalesced counters and the number of flights in progress"""
+        return {**self._counters, 'in_flight': len(self._flights)}
+
+    def _finish(self, key: str, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            flight.exception()
+
+
+# Global instance used by /process-chat
+chat_flights = SingleFlight()
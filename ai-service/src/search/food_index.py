@@ -0,0 +1,322 @@
+"""
+Food catalog search index.
+Builds the inverted index over the columnar catalog store and keeps it in memory.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from ..data.catalog_store import CatalogSnapshot, catalog_store
+from ..data.catalog_version import catalog_version
+from .inverted_index import InvertedIndex
+from .opening_hours import opening_hours
+
+
+# Per-field term weights: a hit in the dish name matters more than one in the description
+FOOD_FIELD_WEIGHTS = {
+    'name': 3.0,
+    'category': 2.0,
+    'tags': 2.0,
+    'keywords': 1.5,
+    'ingredients': 1.0,
+    'description': 1.0
+}
+
+# Tag groups that satisfy a dietary/mood preference
+PREFERENCE_TAGS = {
+    'spicy': {'spicy', 'hot', 'chili'},
+    'healthy': {'healthy', 'low-calorie', 'organic'}
+}
+
+# Boolean item flags required by a dietary preference
+PREFERENCE_FLAGS = {
+    'vegetarian': 'isVegetarian',
+    'vegan': 'isVegan',
+    'gluten-free': 'isGlutenFree'
+}
+
+# Inclusive price bounds per budget bucket
+BUDGET_RANGES = {
+    'low': (0, 15),
+    'medium': (10, 25),
+    'high': (20, float('inf'))
+}
+
+
+def build_item_mask(catalog: CatalogSnapshot, preferences: Dict, available_only: bool = False) -> np.ndarray:
+    """
+    Build a food row mask for budget and dietary preferences
+
+    Args:
+        catalog (CatalogSnapshot): Catalog columns to filter
+        preferences (Dict): Intent fields - budget, max_price and the preferences list
+        available_only (bool): Also drop items marked unavailable and, with OPEN_HOURS_FILTER,
+            items from restaurants that are closed right now
+
+    Returns:
+        np.ndarray: Boolean mask over the catalog's food rows
+    """
+    low, high = BUDGET_RANGES.get(preferences.get('budget'), (0, float('inf')))
+    if preferences.get('max_price') is not None:
+        # An explicit ceiling ("under $15") replaces the bucket bounds
+        low, high = 0, preferences['max_price']
+    user_prefs = preferences.get('preferences') or []
+    mask = catalog.food_mask(
+        min_price=low,
+        max_price=high,
+        flags=[PREFERENCE_FLAGS[pref] for pref in user_prefs if pref in PREFERENCE_FLAGS],
+        tag_groups=[PREFERENCE_TAGS[pref] for pref in user_prefs if pref in PREFERENCE_TAGS],
+        available_only=available_only
+    )
+    if available_only and config.OPEN_HOURS_FILTER:
+        mask &= opening_hours.food_open_mask(catalog)
+    return mask
+
+
+class FoodIndexSnapshot:
+    """Immutable view of the indexed catalog; replaced wholesale on rebuild"""
+
+    def __init__(self, catalog: CatalogSnapshot, previous: Optional['FoodIndexSnapshot'] = None):
+        """
+        Index the food rows of a catalog snapshot
+
+        Args:
+            catalog (CatalogSnapshot): Columnar catalog; items[i] is food row i
+            previous (FoodIndexSnapshot): Snapshot of the parent catalog; documents of rows
+                carried over unchanged by an incremental refresh are reused from it
+        """
+        self.catalog = catalog
+        if previous is not None and (catalog.food_origin is None or catalog.parent_version != previous.version):
+            previous = None
+        self.items = [self._document(catalog, row, previous) for row in range(catalog.food_count)]
+        self.restaurants = {
+            catalog.restaurant_ids[row]: catalog.restaurant_document(row)
+            for row in range(catalog.restaurant_count)
+        }
+        self.version = catalog.version
+        # Index doc ids are slots that survive incremental refreshes; _slot_rows maps them to rows
+        self.index = self._updated_index(previous) if previous is not None else None
+        if self.index is None:
+            self.index = InvertedIndex(FOOD_FIELD_WEIGHTS)
+            self.index.build(self.items)
+            self._row_slots = np.arange(len(self.items), dtype=np.int64)
+        self._slot_rows = np.full(self.index.slot_count, -1, dtype=np.int64)
+        self._slot_rows[self._row_slots] = np.arange(len(self.items), dtype=np.int64)
+        self.built_at = time.time()
+        self._by_id = {item['_id']: item for item in self.items}
+
+    @staticmethod
+    def _document(catalog: CatalogSnapshot, row: int, previous: Optional['FoodIndexSnapshot']) -> Dict:
+        if previous is not None:
+            origin = catalog.food_origin[row]
+            restaurant = catalog.restaurant_row[row]
+            if origin >= 0:
+                item = previous.items[origin]
+                # A deleted restaurant changes the item's reference, so only reuse matching ones
+                if item['restaurant'] == (catalog.restaurant_ids[restaurant] if restaurant >= 0 else None):
+                    return item
+        return catalog.food_document(row)
+
+    def _updated_index(self, previous: 'FoodIndexSnapshot') -> Optional[InvertedIndex]:
+        """
+        Apply an incremental refresh to the previous snapshot's index, re-indexing changed rows only
+
+        Returns:
+            Optional[InvertedIndex]: The updated index (self._row_slots set), or None when enough
+            slots have been freed by deletions that a compacting rebuild is due
+        """
+        origin = self.catalog.food_origin
+        previous_rows = previous.catalog
+        slots = np.full(len(self.items), -1, dtype=np.int64)
+        carried = np.flatnonzero(origin >= 0)
+        slots[carried] = previous._row_slots[origin[carried]]
+        retired = np.ones(len(previous.items), dtype=bool)
+        retired[origin[carried]] = False
+
+        removed: Dict[int, Dict] = {}
+        added: Dict[int, Dict] = {}
+        for row in carried:
+            # Carried rows keep their document unless its restaurant reference changed
+            if self.items[row] is not previous.items[origin[row]]:
+                removed[slots[row]] = previous.items[origin[row]]
+                added[slots[row]] = self.items[row]
+        next_slot = previous.index.slot_count
+        for row in np.flatnonzero(origin < 0):
+            old_row = previous_rows.food_row(self.items[row]['_id'])
+            if old_row is not None:
+                # Updated in place: re-index it in its old slot
+                retired[old_row] = False
+                slots[row] = previous._row_slots[old_row]
+                removed[slots[row]] = previous.items[old_row]
+            else:
+                slots[row] = next_slot
+                next_slot += 1
+            added[slots[row]] = self.items[row]
+        for old_row in np.flatnonzero(retired):
+            removed[previous._row_slots[old_row]] = previous.items[old_row]
+
+        if next_slot > 2 * max(len(self.items), 1):
+            return None
+        self._row_slots = slots
+        return previous.index.updated(
+            {int(slot): document for slot, document in removed.items()},
+            {int(slot): document for slot, document in added.items()}
+        )
+
+    def item_by_id(self, item_id: str) -> Optional[Dict]:
+        """Get a food item document by its id string"""
+        return self._by_id.get(str(item_id))
+
+    def items_by_ids(self, item_ids: Iterable[Optional[str]]) -> List[Optional[Dict]]:
+        """Get food item documents for many id strings at once (None for unknown ids)"""
+        by_id = self._by_id
+        return [by_id.get(str(item_id)) if item_id is not None else None for item_id in item_ids]
+
+    def restaurant_for(self, item: Dict) -> Optional[Dict]:
+        """Get the restaurant document an item belongs to"""
+        return self.restaurants.get(str(item.get('restaurant')))
+
+    def restaurant_rating(self, item: Dict) -> float:
+        """Get the rating of the restaurant serving an item"""
+        restaurant = self.restaurant_for(item)
+        return restaurant.get('rating', 0) if restaurant else 0
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Rank food items against a free-text query
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results
+            predicate (Callable): Optional filter over item documents
+            mask (np.ndarray): Optional boolean mask over food rows (see build_item_mask)
+
+        Returns:
+            List[Tuple[Dict, float]]: (item, score) pairs, best first
+        """
+        slot_rows = self._slot_rows
+        doc_filter = None
+        if mask is not None:
+            doc_filter = lambda slot: mask[slot_rows[slot]]
+        elif predicate:
+            doc_filter = lambda slot: predicate(self.items[slot_rows[slot]])
+        return [
+            (self.items[slot_rows[slot]], score)
+            for slot, score in self.index.search(query, limit=limit, predicate=doc_filter)
+        ]
+
+
+class FoodIndex:
+    """
+    Process-wide holder of the current food index snapshot.
+    Readers grab the snapshot reference; rebuilds construct a new one and swap it in.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        """
+        Initialize the holder without loading anything
+
+        Args:
+            ttl_seconds (int): Age after which the snapshot is rebuilt on next access
+        """
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[FoodIndexSnapshot] = None
+        self._build_lock = threading.Lock()
+        self._pins = threading.local()
+
+    def get(self) -> FoodIndexSnapshot:
+        """
+        Get the current snapshot, rebuilding it on first use, when the catalog version
+        changes, or once it is older than the TTL
+
+        Returns:
+            FoodIndexSnapshot: Current catalog snapshot, or the one pinned on this thread
+        """
+        pinned = getattr(self._pins, 'snapshot', None)
+        if pinned is not None:
+            return pinned
+
+        snapshot = self._snapshot
+        try:
+            version = catalog_version.current()
+        except Exception:
+            # Keep serving the last good snapshot while the database is unreachable
+            if snapshot is not None:
+                return snapshot
+            raise
+
+        if self._is_stale(snapshot, version):
+            with self._build_lock:
+                # Another thread may have finished the rebuild while we waited
+                snapshot = self._snapshot
+                if self._is_stale(snapshot, version):
+                    snapshot = self.rebuild(version)
+        return snapshot
+
+    @contextmanager
+    def pinned(self, snapshot: FoodIndexSnapshot) -> Iterator[FoodIndexSnapshot]:
+        """
+        Make get() on the calling thread return snapshot until the block exits
+
+        Lets one run (tools, ranking, handles and cache keys) answer from a single snapshot while
+        refreshes swap in newer ones for everyone else.
+
+        Args:
+            snapshot (FoodIndexSnapshot): Snapshot to serve
+
+        Yields:
+            FoodIndexSnapshot: The pinned snapshot
+        """
+        previous = getattr(self._pins, 'snapshot', None)
+        self._pins.snapshot = snapshot
+        try:
+            yield snapshot
+        finally:
+            self._pins.snapshot = previous
+
+    def rebuild(self, version: Optional[str] = None) -> FoodIndexSnapshot:
+        """
+        Index the current catalog store snapshot and swap it in
+
+        Args:
+            version (str): Catalog version the rebuild corresponds to
+
+        Returns:
+            FoodIndexSnapshot: Newly built snapshot
+        """
+        catalog = catalog_store.get()
+        previous = self._snapshot
+        if previous is not None and previous.catalog is catalog:
+            if catalog_store.live:
+                # The refresher publishes every change, so an unchanged catalog is current
+                previous.built_at = time.time()
+                return previous
+            # TTL expiry without a detected change: reload in case the version probe missed an edit
+            catalog = catalog_store.load(version)
+
+        snapshot = FoodIndexSnapshot(catalog, previous)
+        self._snapshot = snapshot
+        print(f"🔎 Food index built: {len(snapshot.items)} items, {snapshot.index.vocabulary_size} terms")
+        return snapshot
+
+    def _is_stale(self, snapshot: Optional[FoodIndexSnapshot], version: str) -> bool:
+        return (
+            snapshot is None
+            or snapshot.version != version
+            or time.time() - snapshot.built_at > self.ttl_seconds
+        )
+
+
+# Global instance shared by the search tools
+food_index = FoodIndex(ttl_seconds=config.SEARCH_INDEX_TTL)
@@ -0,0 +1,360 @@
+"""
+Geo-proximity index over restaurant coordinates.
+A grid hash of Restaurant.location answers radius and k-nearest queries; distances are
+vectorized haversine. An optional 2dsphere-backed path runs the same queries in MongoDB.
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from ..data.catalog_store import CatalogSnapshot, catalog_store
+from ..data.mongo import mongo
+from ..utils.snapshot_cache import SnapshotCache
+
+
+# Mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+# Grid cell edge (about 5.5 km of latitude)
+GRID_CELL_DEGREES = 0.05
+
+# Farthest two points on Earth can be; a kNN search this wide is a full scan
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+# Keys that may hold coordinates inside user_context.address
+LATITUDE_KEYS = ('latitude', 'lat')
+LONGITUDE_KEYS = ('longitude', 'lng', 'lon')
+
+_LON_CELLS = int(math.ceil(360 / GRID_CELL_DEGREES))
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distance from one point to many
+
+    Args:
+        latitude (float): Origin latitude in degrees
+        longitude (float): Origin longitude in degrees
+        latitudes (np.ndarray): Target latitudes in degrees
+        longitudes (np.ndarray): Target longitudes in degrees
+
+    Returns:
+        np.ndarray: Distances in km (nan where a target coordinate is nan)
+    """
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=np.float64) - longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def user_location(user_context: Optional[Dict]) -> Optional[Tuple[float, float]]:
+    """
+    Extract the user's coordinates from user_context.address
+
+    The Node backend forwards the selected Address document as address.full_address;
+    plain {latitude, longitude} (or lat/lng) dicts and a nested "location" work too.
+
+    Args:
+        user_context (Dict): Chat user context
+
+    Returns:
+        Optional[Tuple[float, float]]: (latitude, longitude), or None if unknown
+    """
+    pending = [(user_context or {}).get('address')]
+    while pending:
+        value = pending.pop()
+        if not isinstance(value, dict):
+            continue
+        latitude = next((value[key] for key in LATITUDE_KEYS if value.get(key) is not None), None)
+        longitude = next((value[key] for key in LONGITUDE_KEYS if value.get(key) is not None), None)
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            pending.extend(value.get(key) for key in ('full_address', 'location', 'coordinates'))
+            continue
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return latitude, longitude
+    return None
+
+
+def _cell_keys(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    lat_cells = np.floor((np.asarray(latitudes) + 90) / GRID_CELL_DEGREES).astype(np.int64)
+    lon_cells = np.floor((np.asarray(longitudes) + 180) / GRID_CELL_DEGREES).astype(np.int64) % _LON_CELLS
+    return lat_cells * _LON_CELLS + lon_cells
+
+
+class GeoGrid:
+    """Grid hash of the restaurants of one catalog snapshot; rows are catalog restaurant rows"""
+
+    def __init__(self, catalog: CatalogSnapshot):
+        """
+        Bucket every restaurant with known coordinates into its grid cell
+
+        Args:
+            catalog (CatalogSnapshot): Catalog whose latitude/longitude columns are indexed
+        """
+        self.catalog = catalog
+        located = np.flatnonzero(~(np.isnan(catalog.latitude) | np.isnan(catalog.longitude)))
+        self.latitude = catalog.latitude[located].astype(np.float64)
+        self.longitude = catalog.longitude[located].astype(np.float64)
+        keys = _cell_keys(self.latitude, self.longitude)
+        order = np.argsort(keys, kind='stable')
+        # CSR layout: points sorted by cell, cells[i] spans points[starts[i]:starts[i + 1]]
+        self.points = order.astype(np.int32)
+        self.rows = located.astype(np.int32)
+        self.cells, starts = np.unique(keys[order], return_index=True)
+        self.starts = np.append(starts, len(order)).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Restaurants within a radius, nearest first
+
+        Args:
+            latitude (float): Origin latitude
+            longitude (float): Origin longitude
+            radius_km (float): Search radius in km
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Catalog restaurant rows and their distances in km
+        """
+        points = self._candidate_points(latitude, longitude, radius_km)
+        distances = haversine_km(latitude, longitude, self.latitude[points], self.longitude[points])
+        keep = distances <= radius_km
+        points, distances = points[keep], distances[keep]
+        order = np.lexsort((self.rows[points], distances))
+        return self.rows[points[order]], distances[order]
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k restaurants closest to a point, nearest first
+
+        Args:
+            latitude (float): Origin latitude
+            longitude (float): Origin longitude
+            k (int): Number of restaurants
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Catalog restaurant rows and their distances in km
+        """
+        k = min(k, len(self))
+        radius = GRID_CELL_DEGREES * 111.0
+        while True:
+            # Everything inside the radius is found, so once k are inside, those are the k nearest
+            rows, distances = self.within(latitude, longitude, radius)
+            if len(rows) >= k or radius >= MAX_DISTANCE_KM:
+                return rows[:k], distances[:k]
+            radius = min(radius * 4, MAX_DISTANCE_KM)
+
+    def _candidate_points(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Points in the grid cells overlapping the radius' bounding box"""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        lat_low = max(latitude - dlat, -90.0)
+        lat_high = min(latitude + dlat, 90.0)
+        if lat_low <= -90.0 or lat_high >= 90.0:
+            # The box touches a pole: every longitude qualifies
+            dlon = 180.0
+        else:
+            # Longitude degrees shrink towards the poles, so size the box at its poleward edge
+            narrowest = min(math.cos(math.radians(lat_low)), math.cos(math.radians(lat_high)))
+            dlon = min(dlat / narrowest, 180.0)
+
+        lat_cells = np.arange(
+            math.floor((lat_low + 90) / GRID_CELL_DEGREES),
+            math.floor((lat_high + 90) / GRID_CELL_DEGREES) + 1,
+            dtype=np.int64
+        )
+        lon_start = math.floor((longitude - dlon + 180) / GRID_CELL_DEGREES)
+        lon_span = math.floor((longitude + dlon + 180) / GRID_CELL_DEGREES) - lon_start + 1
+        if dlon >= 180.0 or len(lat_cells) * min(lon_span, _LON_CELLS) > len(self.cells):
+            # The box covers more cells than are occupied: scanning every point is cheaper
+            return np.arange(len(self.rows))
+
+        lon_cells = (np.arange(lon_start, lon_start + lon_span, dtype=np.int64)) % _LON_CELLS
+        wanted = (lat_cells[:, None] * _LON_CELLS + lon_cells[None, :]).ravel()
+        slots = np.searchsorted(self.cells, wanted)
+        slots = slots[slots < len(self.cells)]
+        slots = np.unique(slots[np.isin(self.cells[slots], wanted)])
+        if not len(slots):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.points[self.starts[slot]:self.starts[slot + 1]] for slot in slots])
+
+
+class GeoIndex:
+    """
+    Process-wide holder of one grid per recently used catalog snapshot.
+    With GEO_BACKEND=mongo, radius and nearest queries run against a 2dsphere index instead.
+    """
+
+    def __init__(self, backend: str, point_field: str):
+        """
+        Initialize the holder without building anything
+
+        Args:
+            backend (str): "memory" (grid) or "mongo" (2dsphere $geoNear)
+            point_field (str): GeoJSON point field on restaurants used by the mongo backend
+        """
+        self.backend = backend
+        self.point_field = point_field
+        self._grids = SnapshotCache()
+        self._counters = {'builds': 0, 'memory_queries': 0, 'mongo_queries': 0, 'mongo_failures': 0}
+
+    def grid(self, catalog: Optional[CatalogSnapshot] = None) -> GeoGrid:
+        """
+        Get the grid for a catalog snapshot (default: the current one)
+
+        Args:
+            catalog (CatalogSnapshot): Snapshot to index
+
+        Returns:
+            GeoGrid: Grid over that snapshot's restaurants
+        """
+        return self._grids.get(catalog or catalog_store.get(), self._build)
+
+    def _build(self, catalog: CatalogSnapshot) -> GeoGrid:
+        self._counters['builds'] += 1
+        return GeoGrid(catalog)
+
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+        catalog: Optional[CatalogSnapshot] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Restaurants within a radius, nearest first
+
+        Args:
+            latitude (float): Origin latitude
+            longitude (float): Origin longitude
+            radius_km (float): Search radius in km
+            limit (int): Maximum number of restaurants (None for all)
+            catalog (CatalogSnapshot): Snapshot the returned rows refer to
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Catalog restaurant rows and distances in km
+        """
+        catalog = catalog or catalog_store.get()
+        if self.backend == 'mongo':
+            result = self._geo_near(catalog, latitude, longitude, radius_km, limit)
+            if result is not None:
+                return result
+        self._counters['memory_queries'] += 1
+        rows, distances = self.grid(catalog).within(latitude, longitude, radius_km)
+        return (rows, distances) if limit is None else (rows[:limit], distances[:limit])
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        catalog: Optional[CatalogSnapshot] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k restaurants closest to a point, nearest first
+
+        Args:
+            latitude (float): Origin latitude
+            longitude (float): Origin longitude
+            k (int): Number of restaurants
+            catalog (CatalogSnapshot): Snapshot the returned rows refer to
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Catalog restaurant rows and distances in km
+        """
+        catalog = catalog or catalog_store.get()
+        if self.backend == 'mongo':
+            result = self._geo_near(catalog, latitude, longitude, None, k)
+            if result is not None:
+                return result
+        self._counters['memory_queries'] += 1
+        return self.grid(catalog).nearest(latitude, longitude, k)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the backend, indexed restaurant count and query counters"""
+        grid = self._grids.latest()
+        return {'backend': self.backend, 'indexed': len(grid) if grid else 0, **self._counters}
+
+    def _geo_near(
+        self,
+        catalog: CatalogSnapshot,
+        latitude: float,
+        longitude: float,
+        radius_km: Optional[float],
+        limit: Optional[int]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """$geoNear over the 2dsphere index; None (use the grid) if the query fails"""
+        near = {
+            'near': {'type': 'Point', 'coordinates': [longitude, latitude]},
+            'distanceField': 'distance',
+            'key': self.point_field,
+            'spherical': True
+        }
+        if radius_km is not None:
+            near['maxDistance'] = radius_km * 1000
+        pipeline = [{'$geoNear': near}]
+        if limit is not None:
+            pipeline.append({'$limit': int(limit)})
+        pipeline.append({'$project': {'_id': 1, 'distance': 1}})
+        try:
+            results = list(mongo.collection('restaurants').aggregate(pipeline))
+        except Exception as e:
+            self._counters['mongo_failures'] += 1
+            print(f"⚠️ 2dsphere query failed, using the in-memory grid: {e}")
+            return None
+
+        self._counters['mongo_queries'] += 1
+        rows, distances = [], []
+        for doc in results:
+            row = catalog.restaurant_row_of(str(doc['_id']))
+            if row is not None:
+                rows.append(row)
+                distances.append(doc['distance'] / 1000)
+        return np.array(rows, dtype=np.int32), np.array(distances, dtype=np.float64)
+
+
+def food_distances(catalog: CatalogSnapshot, rows: np.ndarray, location: Tuple[float, float]) -> np.ndarray:
+    """
+    Distance from a location to the restaurant of each food row
+
+    Args:
+        catalog (CatalogSnapshot): Catalog columns
+        rows (np.ndarray): Food rows
+        location (Tuple[float, float]): (latitude, longitude)
+
+    Returns:
+        np.ndarray: Distances in km (nan when the restaurant or its coordinates are unknown)
+    """
+    restaurants = haversine_km(location[0], location[1], catalog.latitude, catalog.longitude)
+    return catalog.join_restaurant_column(restaurants, rows, np.nan)
+
+
+def restaurants_within_mask(catalog: CatalogSnapshot, location: Tuple[float, float], radius_km: float) -> np.ndarray:
+    """
+    Boolean mask over food rows whose restaurant is known to be within a radius
+
+    Args:
+        catalog (CatalogSnapshot): Catalog columns
+        location (Tuple[float, float]): (latitude, longitude)
+        radius_km (float): Delivery radius in km
+
+    Returns:
+        np.ndarray: Boolean mask aligned with the food rows
+    """
+    rows, _ = geo_index.within(location[0], location[1], radius_km, catalog=catalog)
+    nearby = np.zeros(catalog.restaurant_count, dtype=np.float32)
+    nearby[rows] = 1.0
+    return catalog.join_restaurant_column(nearby, None, 0.0) > 0
+
+
+# Global instance used by the ranking, the chat pipelines and /restaurants/nearby
+geo_index = GeoIndex(backend=config.GEO_BACKEND, point_field=config.GEO_POINT_FIELD)
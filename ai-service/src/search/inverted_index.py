@@ -0,0 +1,332 @@
+"""
+In-memory inverted index for catalog text search.
+Tokenizes document fields, supports prefix expansion and ranks matches with BM25.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Minimum query token length before prefix expansion kicks in ("pi" -> pizza, pita, ...)
+MIN_PREFIX_LENGTH = 2
+
+# Score multiplier applied to prefix expansions; search() also ranks exact-term matches ahead of prefix-only ones
+PREFIX_PENALTY = 0.6
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase alphanumeric tokens
+
+    Args:
+        text (str): Raw text to tokenize
+
+    Returns:
+        List[str]: Tokens in their original order
+    """
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def intersect_postings(postings: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Intersect sorted posting lists, smallest list first
+
+    Args:
+        postings (Sequence[Sequence[int]]): Sorted document id lists
+
+    Returns:
+        List[int]: Sorted document ids present in every list
+    """
+    if not postings:
+        return []
+
+    ordered = sorted(postings, key=len)
+    result = list(ordered[0])
+    for posting in ordered[1:]:
+        if not result:
+            break
+        merged = []
+        start = 0
+        for doc_id in result:
+            # Gallop forward through the longer list instead of scanning it
+            start = bisect_left(posting, doc_id, start)
+            if start == len(posting):
+                break
+            if posting[start] == doc_id:
+                merged.append(doc_id)
+        result = merged
+    return result
+
+
+def union_postings(postings: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Merge sorted posting lists into one sorted, de-duplicated list
+
+    Args:
+        postings (Sequence[Sequence[int]]): Sorted document id lists
+
+    Returns:
+        List[int]: Sorted document ids present in any list
+    """
+    if len(postings) == 1:
+        return list(postings[0])
+    merged = set()
+    for posting in postings:
+        merged.update(posting)
+    return sorted(merged)
+
+
+class InvertedIndex:
+    """
+    Field-weighted inverted index with BM25 ranking.
+    Documents are addressed by dense integer ids assigned in insertion order.
+    """
+
+    def __init__(self, field_weights: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index
+
+        Args:
+            field_weights (Dict[str, float]): Indexed fields and their term-frequency weight
+            k1 (float): BM25 term-frequency saturation
+            b (float): BM25 length normalization
+        """
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[int]] = {}
+        self._frequencies: Dict[str, List[float]] = {}
+        self._doc_lengths: List[float] = []
+        self._vocabulary: List[str] = []
+        self._live = 0
+        self._total_length = 0.0
+        self._avg_length = 0.0
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocabulary)
+
+    @property
+    def slot_count(self) -> int:
+        """Doc ids handed out so far, including ones freed by removals"""
+        return len(self._doc_lengths)
+
+    def build(self, documents: Iterable[Dict]) -> None:
+        """
+        Index documents, replacing any previous content
+
+        Args:
+            documents (Iterable[Dict]): Documents whose fields match field_weights
+        """
+        term_docs: Dict[str, Dict[int, float]] = {}
+        doc_lengths: List[float] = []
+
+        for doc_id, document in enumerate(documents):
+            terms, length = self._analyze(document)
+            for term, frequency in terms.items():
+                term_docs.setdefault(term, {})[doc_id] = frequency
+            doc_lengths.append(length)
+
+        # Doc ids are assigned in order, so each posting list is already sorted
+        self._postings = {term: list(docs.keys()) for term, docs in term_docs.items()}
+        self._frequencies = {term: list(docs.values()) for term, docs in term_docs.items()}
+        self._doc_lengths = doc_lengths
+        self._vocabulary = sorted(term_docs)
+        self._set_totals(len(doc_lengths), sum(doc_lengths))
+
+    def updated(self, removed: Dict[int, Dict], added: Dict[int, Dict]) -> 'InvertedIndex':
+        """
+        Build the next index from this one by re-indexing only changed documents
+
+        Posting lists of untouched terms are shared with this index, which stays valid for
+        readers still holding it. A removed doc id that is not re-added stays free.
+
+        Args:
+            removed (Dict[int, Dict]): Doc id -> document as it was indexed, for removed or updated documents
+            added (Dict[int, Dict]): Doc id -> new document, for updated documents (same id)
+                and inserted ones (new ids from slot_count up)
+
+        Returns:
+            InvertedIndex: Index with the changes applied
+        """
+        index = InvertedIndex(self.field_weights, self.k1, self.b)
+        postings = dict(self._postings)
+        frequencies = dict(self._frequencies)
+        doc_lengths = list(self._doc_lengths)
+        live, total_length = self._live, self._total_length
+        touched = set()
+
+        def own(term: str) -> None:
+            # Copy a posting list before its first edit
+            if term not in touched:
+                touched.add(term)
+                postings[term] = list(postings.get(term, ()))
+                frequencies[term] = list(frequencies.get(term, ()))
+
+        for doc_id, document in removed.items():
+            for term in self._analyze(document)[0]:
+                own(term)
+                position = bisect_left(postings[term], doc_id)
+                if position < len(postings[term]) and postings[term][position] == doc_id:
+                    del postings[term][position]
+                    del frequencies[term][position]
+            live -= 1
+            total_length -= doc_lengths[doc_id]
+            doc_lengths[doc_id] = 0.0
+
+        for doc_id, document in added.items():
+            terms, length = self._analyze(document)
+            for term, frequency in terms.items():
+                own(term)
+                position = bisect_left(postings[term], doc_id)
+                postings[term].insert(position, doc_id)
+                frequencies[term].insert(position, frequency)
+            if doc_id >= len(doc_lengths):
+                doc_lengths.extend([0.0] * (doc_id + 1 - len(doc_lengths)))
+            doc_lengths[doc_id] = length
+            live += 1
+            total_length += length
+
+        vocabulary_changed = False
+        for term in touched:
+            if not postings[term]:
+                del postings[term]
+                del frequencies[term]
+                vocabulary_changed = True
+            elif term not in self._postings:
+                vocabulary_changed = True
+
+        index._postings = postings
+        index._frequencies = frequencies
+        index._doc_lengths = doc_lengths
+        index._vocabulary = sorted(postings) if vocabulary_changed else self._vocabulary
+        index._set_totals(live, total_length)
+        return index
+
+    def _analyze(self, document: Dict) -> Tuple[Dict[str, float], float]:
+        """Weighted term frequencies and field-weighted length of one document"""
+        terms: Dict[str, float] = {}
+        length = 0.0
+        for field, weight in self.field_weights.items():
+            value = document.get(field)
+            if isinstance(value, (list, tuple)):
+                tokens = [token for entry in value for token in tokenize(entry)]
+            else:
+                tokens = tokenize(value)
+            for token in tokens:
+                terms[token] = terms.get(token, 0.0) + weight
+            length += weight * len(tokens)
+        return terms, length
+
+    def _set_totals(self, live: int, total_length: float) -> None:
+        self._live = live
+        self._total_length = total_length
+        self._avg_length = (total_length / live) if live else 0.0
+
+    def expand(self, token: str) -> List[Tuple[str, float]]:
+        """
+        Expand a query token into indexed terms
+
+        Args:
+            token (str): Normalized query token
+
+        Returns:
+            List[Tuple[str, float]]: Matching terms and their score multiplier
+        """
+        terms = []
+        if token in self._postings:
+            terms.append((token, 1.0))
+        if len(token) >= MIN_PREFIX_LENGTH:
+            position = bisect_left(self._vocabulary, token)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(token):
+                term = self._vocabulary[position]
+                if term != token:
+                    terms.append((term, PREFIX_PENALTY))
+                position += 1
+        return terms
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        predicate: Optional[Callable[[int], bool]] = None,
+        require_all: bool = True
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank documents matching a free-text query
+
+        Every query token must match (directly or by prefix) unless require_all is
+        False or the conjunction is empty, in which case any token may match.
+        Documents matching more query tokens exactly rank first, so a short document reached
+        only through a prefix ("pizzas" for "pizza") never outranks an exact hit; BM25 orders
+        documents within each tier. Scores of a lower tier are capped below the tier above.
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results, None for all
+            predicate (Callable): Optional filter applied to candidate doc ids
+            require_all (bool): Whether to intersect token matches before ranking
+
+        Returns:
+            List[Tuple[int, float]]: (doc_id, score) pairs, best first
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        expansions = [terms for terms in (self.expand(token) for token in tokens) if terms]
+        if not expansions:
+            return []
+
+        token_postings = [
+            union_postings([self._postings[term] for term, _ in terms]) for terms in expansions
+        ]
+        candidates = intersect_postings(token_postings) if require_all else []
+        if not candidates:
+            candidates = union_postings(token_postings)
+        if predicate is not None:
+            candidates = [doc_id for doc_id in candidates if predicate(doc_id)]
+        if not candidates:
+            return []
+
+        scores = dict.fromkeys(candidates, 0.0)
+        for terms in expansions:
+            for term, multiplier in terms:
+                self._accumulate(term, multiplier, scores)
+
+        exact_hits = dict.fromkeys(candidates, 0)
+        for token in tokens:
+            for doc_id in self._postings.get(token, ()):
+                if doc_id in exact_hits:
+                    exact_hits[doc_id] += 1
+
+        ranked = sorted(scores.items(), key=lambda pair: (-exact_hits[pair[0]], -pair[1], pair[0]))
+        # Cap each lower tier below the one above it, so callers that re-sort or normalize the
+        # scores keep the tiered order
+        tiered = []
+        ceiling = math.inf
+        for position, (doc_id, score) in enumerate(ranked):
+            if position and exact_hits[doc_id] != exact_hits[ranked[position - 1][0]]:
+                ceiling = tiered[-1][1] * PREFIX_PENALTY
+            tiered.append((doc_id, min(score, ceiling)))
+        return tiered[:limit] if limit is not None else tiered
+
+    def _accumulate(self, term: str, multiplier: float, scores: Dict[int, float]) -> None:
+        """Add the BM25 contribution of one term to candidate scores"""
+        postings = self._postings[term]
+        frequencies = self._frequencies[term]
+        total = self._live
+        idf = math.log(1.0 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+        avg_length = self._avg_length or 1.0
+
+        for doc_id, frequency in zip(postings, frequencies):
+            if doc_id not in scores:
+                continue
+            norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+            scores[doc_id] += multiplier * idf * frequency * (self.k1 + 1.0) / (frequency + norm)
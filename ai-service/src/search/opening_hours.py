@@ -0,0 +1,258 @@
+"""
+Opening-hours interval index.
+Restaurant.hours strings are parsed once per catalog snapshot into minute-of-week
+intervals, so "open now" / "open at T" for every restaurant is one vectorized pass.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from ..data.catalog_store import CatalogSnapshot, catalog_store
+from ..utils.snapshot_cache import SnapshotCache
+
+
+# Restaurant.hours keys in datetime.weekday() order
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Day strings meaning closed all day / open all day
+CLOSED_WORDS = ('closed', 'off', 'holiday')
+ALL_DAY_PATTERN = re.compile(r'24\s*(?:hours|hrs|h|/7)|open\s+all\s+day|all\s+day')
+
+_TIME = r'(\d{1,2})(?:[:.](\d{2}))?\s*(a\.?m\.?|p\.?m\.?)?'
+_RANGE_PATTERN = re.compile(rf'{_TIME}\s*(?:-|–|—|to)\s*{_TIME}')
+
+
+def _minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[int]:
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.startswith('p') else 0)
+    if hour > 24 or minute > 59 or (hour == 24 and minute):
+        return None
+    return hour * 60 + minute
+
+
+@lru_cache(maxsize=4096)
+def parse_day(text: Optional[str]) -> Optional[Tuple[Tuple[int, int], ...]]:
+    """
+    Parse one day's hours string into minute intervals
+
+    Handles "11:00-23:00", "10:00-00:00" (midnight close), "9am - 10:30pm",
+    "11:00-15:00, 18:00-02:00" (split shifts, past midnight), "Closed" and "24 hours".
+
+    Args:
+        text (str): Hours string for one weekday
+
+    Returns:
+        Optional[Tuple[Tuple[int, int], ...]]: (open, close) minutes after the day's midnight;
+        close may exceed 1440 when the restaurant closes after midnight. Empty when closed,
+        None when the string is missing or unreadable.
+    """
+    if not text or not str(text).strip():
+        return None
+    value = str(text).strip().lower().replace('noon', '12:00pm').replace('midnight', '12:00am')
+    if ALL_DAY_PATTERN.search(value):
+        return ((0, MINUTES_PER_DAY),)
+    if any(word == value or value.startswith(word) for word in CLOSED_WORDS):
+        return ()
+
+    intervals = []
+    for match in _RANGE_PATTERN.finditer(value):
+        start_hour, start_minute, start_meridiem, end_hour, end_minute, end_meridiem = match.groups()
+        if start_meridiem is None and end_meridiem is not None:
+            # "11-10pm": borrow the closing meridiem when that keeps the opening before it
+            borrowed = _minutes(start_hour, start_minute, end_meridiem)
+            closing = _minutes(end_hour, end_minute, end_meridiem)
+            if borrowed is not None and closing is not None and borrowed < closing:
+                start_meridiem = end_meridiem
+        start = _minutes(start_hour, start_minute, start_meridiem)
+        end = _minutes(end_hour, end_minute, end_meridiem)
+        if start is None or end is None:
+            continue
+        if end <= start:
+            end += MINUTES_PER_DAY
+        intervals.append((start, end))
+    return tuple(intervals) if intervals else None
+
+
+class HoursTable:
+    """Weekly open intervals of every restaurant in one catalog snapshot"""
+
+    def __init__(self, catalog: CatalogSnapshot):
+        """
+        Parse every restaurant's hours
+
+        Args:
+            catalog (CatalogSnapshot): Catalog whose hours column is compiled
+        """
+        self.catalog = catalog
+        n = catalog.restaurant_count
+        # Days whose hours are missing or unreadable fall back to the static isOpen flag
+        self.unknown_day = np.zeros((n, 7), dtype=bool)
+        owners: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        for row, hours in enumerate(catalog.hours):
+            hours = hours if isinstance(hours, dict) else {}
+            for day, name in enumerate(WEEKDAYS):
+                intervals = parse_day(hours.get(name))
+                if intervals is None:
+                    self.unknown_day[row, day] = True
+                    continue
+                for start, end in intervals:
+                    offset = day * MINUTES_PER_DAY
+                    start, end = offset + start, offset + end
+                    if end > MINUTES_PER_WEEK:
+                        # Sunday night past midnight continues on Monday morning
+                        owners.append(row)
+                        starts.append(0)
+                        ends.append(end - MINUTES_PER_WEEK)
+                        end = MINUTES_PER_WEEK
+                    owners.append(row)
+                    starts.append(start)
+                    ends.append(end)
+        self.owners = np.array(owners, dtype=np.int32)
+        # A week has 10080 minutes, so int16 bounds are enough
+        self.starts = np.array(starts, dtype=np.int16)
+        self.ends = np.array(ends, dtype=np.int16)
+        self.base = catalog.is_open & catalog.is_active
+        # (minute of week, read-only mask) of the last open_mask call on this table
+        self.last_mask: Optional[Tuple[int, np.ndarray]] = None
+
+    def open_at_minute(self, minute_of_week: int) -> np.ndarray:
+        """
+        Restaurants open at a minute of the week (0 = Monday 00:00)
+
+        Args:
+            minute_of_week (int): Minute since Monday midnight
+
+        Returns:
+            np.ndarray: Boolean mask over restaurant rows
+        """
+        hit = (self.starts <= minute_of_week) & (minute_of_week < self.ends)
+        open_rows = np.zeros(self.catalog.restaurant_count, dtype=bool)
+        open_rows[self.owners[hit]] = True
+        open_rows |= self.unknown_day[:, minute_of_week // MINUTES_PER_DAY]
+        return open_rows & self.base
+
+    def hours_on(self, row: int, day: int) -> Optional[str]:
+        """Raw hours string of a restaurant for a weekday (0 = Monday)"""
+        hours = self.catalog.hours[row]
+        return hours.get(WEEKDAYS[day]) if isinstance(hours, dict) else None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the interval arrays"""
+        return self.owners.nbytes + self.starts.nbytes + self.ends.nbytes + self.unknown_day.nbytes
+
+
+def minute_of_week(moment: datetime) -> int:
+    """Minute since Monday midnight of a local datetime"""
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+class OpeningHours:
+    """
+    Process-wide holder of the hours table, recompiled whenever the catalog snapshot changes.
+    The last computed mask is kept, so repeated "open now" checks within a minute are free.
+    """
+
+    def __init__(self, timezone: str):
+        """
+        Initialize the holder without parsing anything
+
+        Args:
+            timezone (str): IANA zone the hours strings are written in ("" = server local time)
+        """
+        self.timezone = None
+        if timezone:
+            from zoneinfo import ZoneInfo
+            self.timezone = ZoneInfo(timezone)
+        self._tables = SnapshotCache()
+        self._counters = {'builds': 0, 'mask_computations': 0, 'mask_reuses': 0}
+
+    def now(self) -> datetime:
+        """Current time in the restaurants' timezone"""
+        return datetime.now(self.timezone)
+
+    def table(self, catalog: Optional[CatalogSnapshot] = None) -> HoursTable:
+        """
+        Get the hours table for a catalog snapshot (default: the current one)
+
+        Args:
+            catalog (CatalogSnapshot): Snapshot to compile
+
+        Returns:
+            HoursTable: Compiled intervals for that snapshot
+        """
+        return self._tables.get(catalog or catalog_store.get(), self._build)
+
+    def _build(self, catalog: CatalogSnapshot) -> HoursTable:
+        self._counters['builds'] += 1
+        return HoursTable(catalog)
+
+    def open_mask(self, catalog: Optional[CatalogSnapshot] = None, at: Optional[datetime] = None) -> np.ndarray:
+        """
+        Restaurants open at a time
+
+        Args:
+            catalog (CatalogSnapshot): Snapshot the mask is aligned with (default: current)
+            at (datetime): Moment to check; naive values are read in the restaurants' timezone.
+                Defaults to now.
+
+        Returns:
+            np.ndarray: Boolean mask over restaurant rows
+        """
+        table = self.table(catalog)
+        if at is None:
+            at = self.now()
+        elif at.tzinfo is not None and self.timezone is not None:
+            at = at.astimezone(self.timezone)
+        minute = minute_of_week(at)
+
+        last = table.last_mask
+        if last is not None and last[0] == minute:
+            self._counters['mask_reuses'] += 1
+            return last[1]
+        mask = table.open_at_minute(minute)
+        mask.flags.writeable = False
+        table.last_mask = (minute, mask)
+        self._counters['mask_computations'] += 1
+        return mask
+
+    def food_open_mask(self, catalog: CatalogSnapshot, at: Optional[datetime] = None) -> np.ndarray:
+        """
+        Food rows whose restaurant is open at a time (items without a known restaurant are kept)
+
+        Args:
+            catalog (CatalogSnapshot): Catalog columns
+            at (datetime): Moment to check (default: now)
+
+        Returns:
+            np.ndarray: Boolean mask over food rows
+        """
+        restaurants = self.open_mask(catalog, at).astype(np.float32)
+        return catalog.join_restaurant_column(restaurants, None, 1.0) > 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get table size and mask counters"""
+        table = self._tables.latest()
+        return {
+            'restaurants': table.catalog.restaurant_count if table else 0,
+            'intervals': len(table.owners) if table else 0,
+            'bytes': table.nbytes if table else 0,
+            **self._counters
+        }
+
+
+# Global instance used by candidate filtering, restaurant search and /restaurants/open
+opening_hours = OpeningHours(timezone=config.RESTAURANT_TIMEZONE)
@@ -0,0 +1,277 @@
+"""
+Filter-based recommendation query engine.
+Answers the filter panels (cuisine, price, dietary flags, spice, rating) straight from the
+catalog columns: vectorized filter masks, presorted orders per sort key and keyset cursors.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from ..config.settings import config
+from ..data.catalog_store import SPICE_LEVELS, CatalogSnapshot
+from ..utils.metrics import stage_metrics
+from .food_index import FoodIndexSnapshot, food_index
+from .geo_index import food_distances
+from .opening_hours import opening_hours
+
+
+# Sort keys: column accessor and direction (-1 = highest first); ties break on item id
+SORT_KEYS = {
+    'rating': (lambda catalog: catalog.rating, -1),
+    'price_asc': (lambda catalog: catalog.price, 1),
+    'price_desc': (lambda catalog: catalog.price, -1),
+    'restaurant_rating': (lambda catalog: catalog.food_restaurant_rating(), -1),
+    'delivery_time': (lambda catalog: catalog.food_delivery_minutes(), 1),
+    'distance': (None, 1)
+}
+
+DEFAULT_SORT = 'rating'
+
+# Boolean filters and the item flag each one requires
+FLAG_FILTERS = {
+    'vegetarian': 'isVegetarian',
+    'vegan': 'isVegan',
+    'gluten_free': 'isGlutenFree'
+}
+
+
+class InvalidQueryError(ValueError):
+    """Raised for unknown sort keys, bad cursors and incomplete location filters"""
+
+
+class SortedView:
+    """One sort order over a catalog: rows by (key, id) ascending, plus the sorted keys for seeking"""
+
+    def __init__(self, keys: np.ndarray, ids: np.ndarray):
+        keys = np.where(np.isnan(keys), np.inf, keys)
+        self.keys = keys
+        self.order = np.lexsort((ids, keys))
+        self.sorted_keys = keys[self.order]
+        self.sorted_ids = ids[self.order]
+
+    def position_after(self, key: float, item_id: str) -> int:
+        """Index in the order of the first row after (key, item_id)"""
+        low = int(np.searchsorted(self.sorted_keys, key, side='left'))
+        high = int(np.searchsorted(self.sorted_keys, key, side='right'))
+        return low + int(np.searchsorted(self.sorted_ids[low:high], item_id, side='right'))
+
+
+class CatalogViews(NamedTuple):
+    """Item ids and sorted views of one catalog snapshot; replaced as a whole when the snapshot changes"""
+    catalog: CatalogSnapshot
+    ids: np.ndarray
+    views: Dict[str, SortedView]
+
+
+class RecommendationEngine:
+    """
+    In-process query engine behind POST /recommendations; no LLM in the loop.
+    Sorted views are built once per catalog snapshot, so a page is a mask, a seek and a slice.
+    """
+
+    def __init__(self, max_page_size: int):
+        """
+        Initialize the engine
+
+        Args:
+            max_page_size (int): Largest page a client may request
+        """
+        self.max_page_size = max_page_size
+        self._state: Optional[CatalogViews] = None
+        self._lock = threading.Lock()
+
+    def query(
+        self,
+        filters: Dict[str, Any],
+        sort: str = DEFAULT_SORT,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one filtered, sorted page query
+
+        Args:
+            filters (Dict): Filter values (see RecommendationFilters in main.py); None means unset
+            sort (str): One of SORT_KEYS
+            limit (int): Page size (clamped to max_page_size)
+            cursor (str): next_cursor from the previous page of the same query
+
+        Returns:
+            Dict: recommendations, total matches, next_cursor (None on the last page) and catalog version
+
+        Raises:
+            InvalidQueryError: On an unknown sort, a foreign cursor or a partial location
+        """
+        started = time.perf_counter()
+        limit = max(1, min(limit, self.max_page_size))
+        if sort not in SORT_KEYS:
+            raise InvalidQueryError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        filters = {key: value for key, value in filters.items() if value is not None}
+        location = self._location(filters)
+        if sort == 'distance' and location is None:
+            raise InvalidQueryError("sort=distance needs latitude and longitude")
+
+        snapshot = food_index.get()
+        catalog = snapshot.catalog
+        state = self._state_for(catalog)
+        ids = state.ids
+        mask = self._mask(catalog, filters, location)
+
+        if sort == 'distance':
+            view = SortedView(food_distances(catalog, None, location).astype(np.float64), ids)
+        else:
+            view = self._view(state, sort)
+
+        digest = _digest(filters, sort)
+        start = 0
+        if cursor:
+            key, item_id = _decode_cursor(cursor, digest)
+            start = view.position_after(key, item_id)
+
+        hits = np.flatnonzero(mask[view.order[start:]])[:limit + 1]
+        rows = view.order[start + hits[:limit]]
+        next_cursor = None
+        if len(hits) > limit:
+            last = rows[-1]
+            next_cursor = _encode_cursor(float(view.keys[last]), str(ids[last]), digest)
+
+        distances = food_distances(catalog, rows, location) if location is not None else None
+        recommendations = [
+            self._format(snapshot, row, None if distances is None else distances[position])
+            for position, row in enumerate(rows)
+        ]
+        stage_metrics.record('recommendations.query', time.perf_counter() - started)
+        return {
+            'recommendations': recommendations,
+            'total': int(mask.sum()),
+            'next_cursor': next_cursor,
+            'sort': sort,
+            'catalog_version': snapshot.version
+        }
+
+    def _location(self, filters: Dict[str, Any]) -> Optional[tuple]:
+        has_latitude, has_longitude = 'latitude' in filters, 'longitude' in filters
+        if has_latitude != has_longitude:
+            raise InvalidQueryError("latitude and longitude must be given together")
+        return (filters['latitude'], filters['longitude']) if has_latitude else None
+
+    def _state_for(self, catalog: CatalogSnapshot) -> CatalogViews:
+        """Ids and sorted views of this catalog, swapping in a fresh state when the snapshot changes"""
+        state = self._state
+        if state is None or state.catalog is not catalog:
+            with self._lock:
+                state = self._state
+                if state is None or state.catalog is not catalog:
+                    state = CatalogViews(catalog, np.array(catalog.food_ids, dtype=str), {})
+                    self._state = state
+        return state
+
+    def _view(self, state: CatalogViews, sort: str) -> SortedView:
+        """Sorted view of the state's own catalog; never stored against another snapshot"""
+        view = state.views.get(sort)
+        if view is None:
+            with self._lock:
+                view = state.views.get(sort)
+                if view is None:
+                    column, direction = SORT_KEYS[sort]
+                    view = SortedView(column(state.catalog).astype(np.float64) * direction, state.ids)
+                    state.views[sort] = view
+        return view
+
+    def _mask(self, catalog: CatalogSnapshot, filters: Dict[str, Any], location: Optional[tuple]) -> np.ndarray:
+        """Vectorized filter over the food rows"""
+        mask = catalog.food_mask(
+            min_price=filters.get('min_price', 0),
+            max_price=filters.get('max_price', float('inf')),
+            flags=[flag for name, flag in FLAG_FILTERS.items() if filters.get(name)],
+            tag_groups=[filters['tags']] if filters.get('tags') else [],
+            available_only=filters.get('available_only', True)
+        )
+        if filters.get('categories'):
+            mask &= np.isin(catalog.category, catalog.labels.codes_equal(filters['categories']))
+        if filters.get('spice_levels'):
+            levels = [SPICE_LEVELS.index(level) for level in filters['spice_levels'] if level in SPICE_LEVELS]
+            mask &= np.isin(catalog.spice_level, levels)
+        if filters.get('max_spice') in SPICE_LEVELS:
+            mask &= catalog.spice_level <= SPICE_LEVELS.index(filters['max_spice'])
+        if 'min_rating' in filters:
+            mask &= catalog.rating >= filters['min_rating']
+        if 'min_restaurant_rating' in filters:
+            mask &= catalog.food_restaurant_rating() >= filters['min_restaurant_rating']
+        if 'max_delivery_minutes' in filters:
+            mask &= catalog.food_delivery_minutes() <= filters['max_delivery_minutes']
+        if filters.get('restaurant_id'):
+            restaurant = catalog.restaurant_row_of(filters['restaurant_id'])
+            mask &= catalog.restaurant_row == (restaurant if restaurant is not None else -2)
+
+        if filters.get('cuisines'):
+            cuisines = catalog.restaurant_cuisine.rows_with_any(catalog.labels.codes_equal(filters['cuisines']))
+            mask &= catalog.join_restaurant_column(cuisines.astype(np.float32), None, 0.0) > 0
+        if filters.get('open_now', config.OPEN_HOURS_FILTER):
+            mask &= opening_hours.food_open_mask(catalog)
+
+        if location is not None and filters.get('radius_km'):
+            distances = food_distances(catalog, None, location)
+            mask &= distances <= filters['radius_km']
+        return mask
+
+    def _format(self, snapshot: FoodIndexSnapshot, row: int, distance: Optional[float]) -> Dict[str, Any]:
+        item = snapshot.items[row]
+        restaurant = snapshot.restaurant_for(item) or {}
+        formatted = {
+            'id': item['_id'],
+            'name': item['name'],
+            'price': item['price'],
+            'rating': item['rating'],
+            'category': item['category'],
+            'description': item.get('description', ''),
+            'tags': item.get('tags', []),
+            'spiceLevel': item['spiceLevel'],
+            'isVegetarian': item['isVegetarian'],
+            'isVegan': item['isVegan'],
+            'isGlutenFree': item['isGlutenFree'],
+            'restaurant': {
+                'id': restaurant.get('_id'),
+                'name': restaurant.get('name', 'Restaurant'),
+                'rating': restaurant.get('rating', 0),
+                'cuisine': restaurant.get('cuisine', []),
+                'deliveryTime': restaurant.get('deliveryTime', '30-45 mins')
+            }
+        }
+        if distance is not None and not np.isnan(distance):
+            formatted['restaurant']['distanceKm'] = round(float(distance), 2)
+        return formatted
+
+
+def _digest(filters: Dict[str, Any], sort: str) -> str:
+    """Short fingerprint tying a cursor to the query that produced it"""
+    payload = json.dumps({'filters': filters, 'sort': sort}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def _encode_cursor(key: float, item_id: str, digest: str) -> str:
+    payload = json.dumps({'k': key, 'i': item_id, 'q': digest}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, digest: str) -> tuple:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key, item_id, query = float(payload['k']), str(payload['i']), payload['q']
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeEncodeError):
+        raise InvalidQueryError("Malformed cursor")
+    if query != digest:
+        raise InvalidQueryError("Cursor belongs to a different filter/sort combination")
+    return key, item_id
+
+
+# Global instance used by POST /recommendations
+recommendation_engine = RecommendationEngine(max_page_size=config.RECOMMENDATIONS_MAX_PAGE_SIZE)
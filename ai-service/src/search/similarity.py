@@ -0,0 +1,354 @@
+"""
+"More like this" dish similarity index.
+Hashed TF-IDF text features plus category, price and spice features; the top-k
+neighbours of every item are precomputed and stored in a compact array file.
+"""
+
+import math
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import config
+from .food_index import FoodIndexSnapshot, food_index
+from .inverted_index import tokenize
+
+
+# Hash buckets for text unigrams and bigrams
+TEXT_DIMS = 2048
+
+# Per-field term weights for the text block
+TEXT_FIELD_WEIGHTS = {
+    'name': 2.0,
+    'tags': 1.5,
+    'category': 1.0,
+    'ingredients': 1.0,
+    'description': 1.0
+}
+
+# Share of the final vector each feature block carries
+BLOCK_WEIGHTS = {
+    'text': 0.65,
+    'category': 0.2,
+    'price': 0.1,
+    'spice': 0.05
+}
+
+# Upper price bounds of the price bands used as features
+PRICE_BANDS = (8, 12, 16, 20, 30, float('inf'))
+
+# FoodItem.spiceLevel enum, mildest first
+SPICE_LEVELS = ('None', 'Mild', 'Medium', 'Hot', 'Very Hot')
+
+# Rows scored per matrix multiply while building neighbours
+BUILD_BLOCK_ROWS = 512
+
+
+def _bucket(term: str) -> int:
+    """Stable hash bucket (Python's hash() is salted per process)"""
+    return zlib.crc32(term.encode('utf-8')) % TEXT_DIMS
+
+
+def _item_terms(item: Dict) -> Dict[int, float]:
+    """Weighted unigram and bigram bucket counts for one item"""
+    counts: Dict[int, float] = {}
+    for field, weight in TEXT_FIELD_WEIGHTS.items():
+        value = item.get(field)
+        if not value:
+            continue
+        text = ' '.join(map(str, value)) if isinstance(value, list) else str(value)
+        tokens = tokenize(text)
+        terms = tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+        for term in terms:
+            bucket = _bucket(term)
+            counts[bucket] = counts.get(bucket, 0.0) + weight
+    return counts
+
+
+def _banded(index: int, size: int) -> np.ndarray:
+    """One-hot band with half weight on the neighbouring bands, so near values stay similar"""
+    vector = np.zeros(size, dtype=np.float32)
+    vector[index] = 1.0
+    if index > 0:
+        vector[index - 1] = 0.5
+    if index < size - 1:
+        vector[index + 1] = 0.5
+    return vector
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_feature_vectors(items: List[Dict]) -> np.ndarray:
+    """
+    Build L2-normalized item vectors; the dot product of two rows is their similarity
+
+    Args:
+        items (List[Dict]): Raw fooditems documents
+
+    Returns:
+        np.ndarray: float32 matrix with one row per item
+    """
+    n = len(items)
+    text = np.zeros((n, TEXT_DIMS), dtype=np.float32)
+    for row, item in enumerate(items):
+        for bucket, count in _item_terms(item).items():
+            text[row, bucket] = 1.0 + math.log(count)
+    document_frequency = np.count_nonzero(text, axis=0)
+    text *= (np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+    categories = sorted({str(item.get('category', '')).lower() for item in items})
+    category_column = {category: column for column, category in enumerate(categories)}
+    category = np.zeros((n, len(categories)), dtype=np.float32)
+    price = np.zeros((n, len(PRICE_BANDS)), dtype=np.float32)
+    spice = np.zeros((n, len(SPICE_LEVELS)), dtype=np.float32)
+    for row, item in enumerate(items):
+        category[row, category_column[str(item.get('category', '')).lower()]] = 1.0
+        band = next(i for i, bound in enumerate(PRICE_BANDS) if (item.get('price') or 0) <= bound)
+        price[row] = _banded(band, len(PRICE_BANDS))
+        level = item.get('spiceLevel', 'None')
+        spice[row] = _banded(SPICE_LEVELS.index(level) if level in SPICE_LEVELS else 0, len(SPICE_LEVELS))
+
+    blocks = [
+        math.sqrt(BLOCK_WEIGHTS['text']) * _normalize_rows(text),
+        math.sqrt(BLOCK_WEIGHTS['category']) * _normalize_rows(category),
+        math.sqrt(BLOCK_WEIGHTS['price']) * _normalize_rows(price),
+        math.sqrt(BLOCK_WEIGHTS['spice']) * _normalize_rows(spice)
+    ]
+    return _normalize_rows(np.hstack(blocks)).astype(np.float32)
+
+
+def compute_neighbors(vectors: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute the top-k most similar rows for every row
+
+    Args:
+        vectors (np.ndarray): L2-normalized item vectors
+        top_k (int): Neighbours kept per item
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: int32 neighbour rows and float16 similarities, best first
+    """
+    n = len(vectors)
+    k = min(top_k, max(n - 1, 0))
+    neighbors = np.zeros((n, k), dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float16)
+    if k == 0:
+        return neighbors, scores
+
+    for start in range(0, n, BUILD_BLOCK_ROWS):
+        rows = np.arange(start, min(start + BUILD_BLOCK_ROWS, n))
+        similarity = vectors[rows] @ vectors.T
+        similarity[np.arange(len(rows)), rows] = -np.inf
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        neighbors[rows] = np.take_along_axis(top, order, axis=1)
+        scores[rows] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbors, scores
+
+
+class SimilarItems:
+    """Loaded neighbour table; lookups are a dict hit plus an array slice"""
+
+    def __init__(self, ids: np.ndarray, restaurants: np.ndarray, neighbors: np.ndarray, scores: np.ndarray, version: str):
+        self.ids = ids
+        self.restaurants = restaurants
+        self.neighbors = neighbors
+        self.scores = scores
+        self.version = version
+        self._rows = {item_id: row for row, item_id in enumerate(ids.tolist())}
+
+    @classmethod
+    def build(cls, snapshot: FoodIndexSnapshot, top_k: int) -> 'SimilarItems':
+        """Compute the neighbour table for a catalog snapshot"""
+        items = snapshot.items
+        neighbors, scores = compute_neighbors(build_feature_vectors(items), top_k)
+        return cls(
+            ids=np.array([str(item['_id']) for item in items], dtype='U24'),
+            restaurants=np.array([item.get('restaurant') or '' for item in items], dtype='U24'),
+            neighbors=neighbors,
+            scores=scores,
+            version=snapshot.version
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarItems':
+        """Read a neighbour table written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['ids'], data['restaurants'], data['neighbors'], data['scores'], str(data['version']))
+
+    def save(self, path: str) -> None:
+        """Write the neighbour table as a compressed .npz file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write to a temp file and rename so a concurrent reader never sees a partial file
+        temp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            temp_path,
+            ids=self.ids,
+            restaurants=self.restaurants,
+            neighbors=self.neighbors,
+            scores=self.scores,
+            version=np.array(self.version)
+        )
+        os.replace(temp_path, path)
+
+    def similar(self, item_id: str, limit: int, other_restaurants: bool = False) -> Optional[List[Tuple[str, float]]]:
+        """
+        Get the most similar items to an item
+
+        Args:
+            item_id (str): Food item id
+            limit (int): Maximum number of neighbours
+            other_restaurants (bool): Only return dishes from a different restaurant
+
+        Returns:
+            Optional[List[Tuple[str, float]]]: (item id, similarity) pairs, or None if the id is unknown
+        """
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+        results = []
+        for neighbor, score in zip(self.neighbors[row].tolist(), self.scores[row].tolist()):
+            if other_restaurants and self.restaurants[neighbor] == self.restaurants[row]:
+                continue
+            results.append((str(self.ids[neighbor]), round(float(score), 4)))
+            if len(results) >= limit:
+                break
+        return results
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the table arrays"""
+        return self.ids.nbytes + self.restaurants.nbytes + self.neighbors.nbytes + self.scores.nbytes
+
+
+class SimilarityIndex:
+    """
+    Process-wide holder of the neighbour table.
+    Loads the prebuilt file at first use. When the catalog changes, the table is rebuilt and
+    rewritten on a background thread while the previous one keeps serving.
+    """
+
+    def __init__(self, path: str, top_k: int):
+        """
+        Initialize the holder without loading anything
+
+        Args:
+            path (str): Location of the .npz neighbour file
+            top_k (int): Neighbours stored per item
+        """
+        self.path = path
+        self.top_k = top_k
+        self._table: Optional[SimilarItems] = None
+        self._building = False
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[FoodIndexSnapshot, SimilarItems]:
+        """
+        Get the catalog snapshot and the freshest neighbour table
+
+        Only a missing table is built inline; a table from an older catalog version is served
+        (items the snapshot no longer has are skipped) until the background rebuild lands.
+
+        Returns:
+            Tuple[FoodIndexSnapshot, SimilarItems]: Current snapshot and its neighbours
+        """
+        snapshot = food_index.get()
+        table = self._table
+        if table is None:
+            with self._lock:
+                if self._table is None:
+                    self._table = self._load_or_build(snapshot)
+                table = self._table
+        if table.version != snapshot.version:
+            with self._lock:
+                start = not self._building
+                self._building = True
+            if start:
+                threading.Thread(target=self._rebuild_in_background, name="similarity-build", daemon=True).start()
+        return snapshot, table
+
+    def rebuild(self) -> SimilarItems:
+        """Build the neighbour table from the current catalog and write it to disk"""
+        snapshot = food_index.get()
+        table = SimilarItems.build(snapshot, self.top_k)
+        table.save(self.path)
+        with self._lock:
+            self._table = table
+        print(f"🧭 Similarity index built: {len(table.ids)} items, {table.nbytes / 1024:.1f} KiB")
+        return table
+
+    def similar_items(self, item_id: str, limit: int = 5, other_restaurants: bool = False) -> Optional[List[Dict]]:
+        """
+        Get display-ready dishes similar to an item
+
+        Args:
+            item_id (str): Food item id
+            limit (int): Maximum number of dishes
+            other_restaurants (bool): Only return dishes from a different restaurant
+
+        Returns:
+            Optional[List[Dict]]: Dishes with a similarity score, or None if the id is not in the catalog
+        """
+        snapshot, table = self.get()
+        if snapshot.item_by_id(item_id) is None:
+            return None
+        neighbors = table.similar(item_id, limit, other_restaurants)
+        if neighbors is None:
+            # Added after the table was built; it gets neighbours with the background rebuild
+            return []
+        results = []
+        for neighbor_id, score in neighbors:
+            item = snapshot.item_by_id(neighbor_id)
+            if item is None:
+                continue
+            restaurant = snapshot.restaurant_for(item) or {}
+            results.append({
+                'id': neighbor_id,
+                'name': item['name'],
+                'price': item['price'],
+                'restaurant': {
+                    'name': restaurant.get('name', 'Restaurant'),
+                    'rating': restaurant.get('rating', 4.0),
+                    'deliveryTime': restaurant.get('deliveryTime', '25-35 mins')
+                },
+                'description': item.get('description', ''),
+                'tags': item.get('tags', []),
+                'similarity': score
+            })
+        return results
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"❌ Similarity index rebuild failed: {e}")
+        finally:
+            self._building = False
+
+    def _load_or_build(self, snapshot: FoodIndexSnapshot) -> SimilarItems:
+        """Read the prebuilt file, even from an older catalog version, or build the first table inline"""
+        if os.path.exists(self.path):
+            try:
+                return SimilarItems.load(self.path)
+            except Exception as e:
+                print(f"⚠️ Could not read similarity index {self.path}: {e}")
+        table = SimilarItems.build(snapshot, self.top_k)
+        try:
+            table.save(self.path)
+        except OSError as e:
+            print(f"⚠️ Could not write similarity index {self.path}: {e}")
+        return table
+
+
+# Global instance used by /similar and the find_similar_items tool
+similarity_index = SimilarityIndex(path=config.SIMILARITY_INDEX_PATH, top_k=config.SIMILARITY_TOP_K)
@@ -11,13 +11,14 @@ class FoodRecommendationTasks:
     """Collection of tasks for the food recommendation workflow"""
     
     @staticmethod
-    def create_intent_analysis_task(user_message: str, user_context: dict = None) -> Task:
+    def create_intent_analysis_task(user_message: str, user_context: dict = None, order_history: str = None) -> Task:
         """
         Create task for analyzing user intent and preferences
         
         Args:
             user_message (str): The user's message requesting food recommendations
             user_context (dict): Additional context about the user
+            order_history (str): Taste profile summary from past orders, if any
             
         Returns:
             Task: CrewAI task for intent analysis
@@ -29,6 +30,7 @@ class FoodRecommendationTasks:
             Analyze this user message to understand their food preferences and intent: "{user_message}"
             
             User context: {user_context if user_context else 'No additional context provided'}
+            Order history: {order_history or 'No past orders'}
             
             Extract and return a comprehensive JSON object with the following structure:
             {{
@@ -51,6 +53,7 @@ class FoodRecommendationTasks:
             - "Quick bite" = fast urgency
             - "Healthy" mentions = health-conscious preferences
             - Cultural or regional mentions = specific cuisine preferences
+            - Use the order history only to fill gaps the message leaves open; the message always wins
             
             Provide thorough analysis based on explicit and implicit cues in the message.
             """,
@@ -71,8 +74,9 @@ class FoodRecommendationTasks:
             Based on the analyzed user intent and preferences, discover the most relevant food options.
             
             Use the available tools to:
-            1. Search for food items that match the user's preferences using food_search tool
-            2. Search for restaurants that align with their cuisine preferences using restaurant_search tool
+            1. Call discover_options ONCE with the query, foodType, cuisine and preferences from the intent -
+               it searches food items and restaurants in parallel and returns de-duplicated results
+            2. Only if that returns too little, follow up with food_search or restaurant_search
             3. Consider budget constraints, dietary restrictions, and mood preferences
             
             Search strategy:
@@ -82,64 +86,26 @@ class FoodRecommendationTasks:
             - Consider mood-based selections (comfort food, healthy options, celebration food)
             - Include variety in cuisine types when appropriate
             
-            Return a comprehensive list of relevant food items and restaurants with all available details:
-            - Food items with pricing, descriptions, restaurant info
-            - Restaurant information with ratings, delivery times, specialties
-            - Ensure options match the user's analyzed intent
+            Return the best options as the tools print them, one per line, most relevant first:
+            - Up to 10 food lines: "handle | name | price | restaurant rating delivery | tags"
+            - Up to 5 restaurant lines: "name | cuisine | rating | delivery"
+            Copy the lines as-is (the handle identifies the dish); no JSON, no extra details.
             
             Focus on quality options that will satisfy the user's stated and implied needs.
             """,
-            expected_output="Comprehensive list of relevant food options and restaurants with detailed information",
+            expected_output="Compact candidate lines: food options keyed by handle, then restaurants",
             agent=None,  # Will be set when creating the crew
             context=[]   # Will include intent analysis task
         )
     
     @staticmethod
-    def create_evaluation_task() -> Task:
-        """
-        Create task for evaluating and ranking food options
-        
-        Returns:
-            Task: CrewAI task for food evaluation
-        """
-        return Task(
-            description="""
-            Evaluate and rank the discovered food options based on multiple criteria to ensure the best recommendations.
-            
-            Evaluation criteria (in order of importance):
-            1. **Match to User Intent**: How well does each option match the user's stated preferences, mood, and needs?
-            2. **Quality Indicators**: Restaurant ratings, food ratings, customer reviews
-            3. **Value for Money**: Price appropriateness for the quality and quantity offered
-            4. **Delivery Experience**: Estimated delivery time, restaurant reliability
-            5. **Health Considerations**: Nutritional value, freshness, preparation quality
-            6. **Uniqueness**: Special or standout items that provide exceptional experience
-            
-            Ranking process:
-            - Score each option on a 1-10 scale for each criterion
-            - Weight scores based on user intent (e.g., budget-conscious users prioritize value)
-            - Consider user's emotional context for final ranking
-            - Ensure dietary restrictions are absolutely respected
-            
-            Return the top 3-5 ranked options with:
-            - Overall scores and reasoning for each ranking
-            - Specific benefits that align with user needs
-            - Any potential concerns or considerations
-            - Clear explanation of why each option was selected
-            
-            Focus on providing options that will truly satisfy and delight the user.
-            """,
-            expected_output="Top 3-5 ranked food options with detailed evaluation scores and reasoning",
-            agent=None,  # Will be set when creating the crew
-            context=[]   # Will include intent analysis and discovery tasks
-        )
-    
-    @staticmethod
-    def create_recommendation_task(user_name: str = "friend") -> Task:
+    def create_recommendation_task(user_name: str = "friend", evaluation: str = None) -> Task:
         """
         Create task for generating personalized recommendations
         
         Args:
             user_name (str): User's name for personalization
+            evaluation (str): Ranked shortlist with score breakdowns from the scoring engine
             
         Returns:
             Task: CrewAI task for recommendation generation
@@ -148,38 +114,36 @@ class FoodRecommendationTasks:
             description=f"""
             Create a personalized, engaging food recommendation for "{user_name}" based on all the analysis and evaluation completed.
             
+            Ranked shortlist (scored in code; score breakdown shows the strongest factors):
+            {evaluation or 'Not available - rank the discovered options yourself.'}
+            
+            Prefer the shortlist order and use its handles. Let the strongest factors shape each "why_perfect".
+            
             Your response should be warm, conversational, and enthusiastic about food. Address the user directly and make them excited about their options.
               Response structure - Return a JSON object with:
             {{
                 "message": "Short, friendly recommendation message (1-2 sentences, max 50 words)",
                 "recommendations": [
                     {{
-                        "id": "food_item_id",
-                        "name": "Food Name",
-                        "price": 12.99,
-                        "restaurant": {{
-                            "name": "Restaurant Name",
-                            "rating": 4.5,
-                            "deliveryTime": "25-30 mins"
-                        }},
-                        "description": "Brief, appetizing description",
-                        "why_perfect": "Short explanation of why this matches their needs",
-                        "tags": ["vegetarian", "spicy", etc.]
+                        "id": "handle of the dish (first column of its line)",
+                        "why_perfect": "Short explanation of why this matches their needs"
                     }}
                 ],
                 "actionRequired": {{
                     "type": "add_to_cart",
-                    "message": "Would you like me to add the [top item] to your cart?",
-                    "item_id": "recommended_item_id"
+                    "item_id": "handle of the top recommendation"
                 }} or null
             }}
             
+            Only use handles from the shortlist or the discovered options. Names, prices, restaurants
+            and tags are filled in from the catalog by handle, so do not repeat them.
+            
             Message guidelines:
             - Keep message VERY SHORT and concise (2-3 sentences maximum)
             - Be friendly but brief ("Hey {user_name}! Found some great options for you!")
             - Use minimal emojis (max 1-2)
             - Focus on the recommendations rather than long explanations
-            - Keep descriptions under 30 words each
+            - Keep each why_perfect under 20 words
             - Make it chatty but not wordy but also make it witty and sarcastic
             
             Always end with asking if they'd like to add the top recommendation to their cart, unless they specifically mentioned just browsing.
@@ -1,53 +1,76 @@
 """
 Cart management tool for CrewAI agents.
 Handles cart operations like adding items, checking cart status.
+Backend calls go through the shared pooled client (src/runtime/backend_client.py).
 """
 
 from langchain_core.tools import tool
 from typing import Dict, Optional
+import asyncio
 import httpx
-from ..config.settings import config
+from ..runtime.backend_client import backend_client
+
+
+# Shown when the backend cannot be reached
+SIMULATED_CART_ITEMS = [
+    {"id": "item1", "name": "Pizza Margherita", "quantity": 1, "price": 12.99},
+    {"id": "item2", "name": "Garlic Bread", "quantity": 1, "price": 4.99}
+]
 
 
 @tool
 def cart_operations(action: str, item_id: Optional[str] = None, user_id: Optional[str] = None, quantity: int = 1) -> Dict:
     """
     Handle cart operations like adding items, checking cart status, and managing quantities.
-    
+
     Args:
         action (str): Action to perform ("add_item", "check_cart", "remove_item")
         item_id (str): Food item ID
         user_id (str): User ID
         quantity (int): Quantity of items
-        
+
+    Returns:
+        Dict: Result of the cart operation
+    """
+    try:
+        return backend_client.run_sync(cart_action(action, item_id=item_id, user_id=user_id, quantity=quantity))
+    except Exception as e:
+        return {"success": False, "message": f"Error performing cart operation: {str(e)}", "action": action}
+
+
+async def cart_action(action: str, item_id: Optional[str] = None, user_id: Optional[str] = None, quantity: int = 1) -> Dict:
+    """
+    Perform a cart operation against the Node backend
+
+    Args:
+        action (str): Action to perform ("add_item", "check_cart", "remove_item")
+        item_id (str): Food item ID
+        user_id (str): User ID
+        quantity (int): Quantity of items
+
     Returns:
         Dict: Result of the cart operation
     """
     try:
         if action == "add_item" and item_id and user_id:
             # Add item to cart via backend API
-            backend_url = config.NODE_BACKEND_URL
             try:
-                response = httpx.post(
-                    f"{backend_url}/api/cart/add",
-                    json={
-                        "userId": user_id,
-                        "itemId": item_id,
-                        "quantity": quantity
-                    },
-                    timeout=10.0
+                response = await backend_client.request(
+                    'cart.add', 'POST', '/api/cart/add',
+                    json={"userId": user_id, "itemId": item_id, "quantity": quantity}
                 )
-                
+
                 if response.status_code == 200:
                     return {
                         "success": True,
                         "message": f"Added {quantity} item(s) to cart",
                         "action": action,
-                        "cart_total_items": _get_cart_count(user_id) + quantity
+                        # Read after the add, so the count already includes this item
+                        "cart_total_items": await _get_cart_count(user_id)
                     }
                 else:
                     return {"success": False, "message": "Failed to add item to cart", "action": action}
-            except:
+            except httpx.HTTPError:
                 # Fallback simulation
                 return {
                     "success": True,
@@ -55,78 +78,54 @@ def cart_operations(action: str, item_id: Optional[str] = None, user_id: Optiona
                     "action": action,
                     "cart_total_items": 2 + quantity
                 }
-                
+
         elif action == "check_cart" and user_id:
-            # Check cart contents
-            try:
-                cart_items = _get_cart_items(user_id)
-                return {
-                    "success": True,
-                    "message": "Cart retrieved successfully",
-                    "action": action,
-                    "cart_items": cart_items,
-                    "total_items": _get_cart_count(user_id)
-                }
-            except:
-                # Fallback simulation
-                return {
-                    "success": True,
-                    "message": "Cart retrieved successfully",
-                    "action": action,
-                    "cart_items": [
-                        {"id": "item1", "name": "Pizza Margherita", "quantity": 1, "price": 12.99},
-                        {"id": "item2", "name": "Garlic Bread", "quantity": 1, "price": 4.99}
-                    ],
-                    "total_items": 2
-                }
-            
+            # Items and count are independent reads, so fetch them concurrently
+            cart_items, total_items = await asyncio.gather(_get_cart_items(user_id), _get_cart_count(user_id))
+            return {
+                "success": True,
+                "message": "Cart retrieved successfully",
+                "action": action,
+                "cart_items": cart_items,
+                "total_items": total_items
+            }
+
         elif action == "remove_item" and item_id and user_id:
             # Remove item from cart
-            backend_url = config.NODE_BACKEND_URL
             try:
-                response = httpx.delete(
-                    f"{backend_url}/api/cart/remove",
-                    json={
-                        "userId": user_id,
-                        "itemId": item_id,
-                        "quantity": quantity
-                    },
-                    timeout=10.0
+                response = await backend_client.request(
+                    'cart.remove', 'DELETE', '/api/cart/remove',
+                    json={"userId": user_id, "itemId": item_id, "quantity": quantity}
                 )
-                
+
                 if response.status_code == 200:
                     return {"success": True, "message": f"Removed {quantity} item(s) from cart", "action": action}
                 else:
                     return {"success": False, "message": "Failed to remove item from cart", "action": action}
-            except:
+            except httpx.HTTPError:
                 # Fallback simulation
                 return {"success": True, "message": f"Removed item {item_id} from cart for user {user_id}", "action": action}
         else:
             return {"success": False, "message": "Invalid action or missing parameters", "action": action}
-            
+
     except Exception as e:
         return {"success": False, "message": f"Error performing cart operation: {str(e)}", "action": action}
 
 
-def _get_cart_count(user_id: str) -> int:
+async def _get_cart_count(user_id: str) -> int:
     """Get total number of items in cart"""
     try:
-        backend_url = config.NODE_BACKEND_URL
-        response = httpx.get(f"{backend_url}/api/cart/{user_id}/count", timeout=10.0)
+        response = await backend_client.request('cart.count', 'GET', f"/api/cart/{user_id}/count")
         return response.json().get("count", 0) if response.status_code == 200 else 0
-    except:
+    except (httpx.HTTPError, ValueError):
         return 2  # Fallback simulation
 
 
-def _get_cart_items(user_id: str) -> list:
+async def _get_cart_items(user_id: str) -> list:
     """Get all items in cart"""
     try:
-        backend_url = config.NODE_BACKEND_URL
-        response = httpx.get(f"{backend_url}/api/cart/{user_id}", timeout=10.0)
+        response = await backend_client.request('cart.items', 'GET', f"/api/cart/{user_id}")
         return response.json().get("items", []) if response.status_code == 200 else []
-    except:
+    except (httpx.HTTPError, ValueError):
         # Fallback simulation
-        return [
-            {"id": "item1", "name": "Pizza Margherita", "quantity": 1, "price": 12.99},
-            {"id": "item2", "name": "Garlic Bread", "quantity": 1, "price": 4.99}
-        ]
+        return list(SIMULATED_CART_ITEMS)
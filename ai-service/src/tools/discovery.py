@@ -0,0 +1,37 @@
+"""
+Combined discovery tool for CrewAI agents.
+Runs all searches implied by the analyzed intent in one concurrent call.
+"""
+
+from langchain_core.tools import tool
+from typing import Dict, Optional
+from ..pipeline.discovery_executor import discovery_executor
+from ..pipeline.handles import compact_restaurant_line, compact_results
+
+
+@tool
+def discover_options(
+    query: str,
+    food_type: Optional[str] = None,
+    cuisine: Optional[str] = None,
+    preferences: Optional[Dict] = None
+) -> Dict:
+    """
+    Find food items and restaurants in one call. Searches food by query, food by type and
+    restaurants by cuisine in parallel and returns the merged, de-duplicated results.
+    
+    Args:
+        query (str): Free-text food query (e.g. "comfort food", "paneer")
+        food_type (str): Specific food type or cuisine from the intent (e.g. "pizza", "indian")
+        cuisine (str): Cuisine for the restaurant search; defaults to food_type
+        preferences (Dict): budget ("low"|"medium"|"high") and preferences list (vegetarian, vegan, spicy, healthy)
+        
+    Returns:
+        Dict: food_items (one "handle | name | price | restaurant rating delivery | tags" line each)
+        and restaurants (one "name | cuisine | rating | delivery" line each)
+    """
+    result = discovery_executor.discover(query, food_type, cuisine, preferences)
+    return {
+        'food_items': compact_results(result['food_items']),
+        'restaurants': [compact_restaurant_line(restaurant) for restaurant in result['restaurants']]
+    }
@@ -4,15 +4,34 @@ Handles searching for food items based on user preferences.
 """
 
 from langchain_core.tools import tool
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from ..config.settings import config
+from ..data.catalog_store import catalog_store
+from ..pipeline.handles import compact_results
+from ..search.food_index import build_item_mask, food_index
+from ..search.opening_hours import opening_hours
 
 
 @tool
-def food_search(query: str, preferences: Optional[Dict] = None) -> List[Dict]:
+def food_search(query: str, preferences: Optional[Dict] = None) -> List[str]:
     """
     Search for food items from the database based on user preferences.
     
+    Args:
+        query (str): Search query text
+        preferences (Dict): User preferences including foodType, budget, dietary restrictions
+        
+    Returns:
+        List[str]: One line per matching item: handle | name | price | restaurant rating delivery | tags
+    """
+    return compact_results(search_food_items(query, preferences))
+
+
+def search_food_items(query: str, preferences: Optional[Dict] = None) -> List[Dict]:
+    """
+    Plain-function form of food_search for callers outside the agent tool loop
+    
     Args:
         query (str): Search query text
         preferences (Dict): User preferences including foodType, budget, dietary restrictions
@@ -21,150 +40,101 @@ def food_search(query: str, preferences: Optional[Dict] = None) -> List[Dict]:
         List[Dict]: List of food items matching the criteria
     """
     try:
-        client = config.get_mongo_client()
-        db = client[config.DB_NAME]
-        
-        # Build search query
-        search_query = {}
-        
-        # Add query text search
-        if query:
-            search_query['$or'] = [
-                {'name': {'$regex': query, '$options': 'i'}},
-                {'description': {'$regex': query, '$options': 'i'}},
-                {'category': {'$regex': query, '$options': 'i'}},
-                {'tags': {'$in': [query.lower()]}}
-            ]
-        
-        if preferences:
-            # Food type/cuisine search
-            if preferences.get('foodType'):
-                food_type = preferences['foodType']
-                if '$or' not in search_query:
-                    search_query['$or'] = []
-                search_query['$or'].extend([
-                    {'name': {'$regex': food_type, '$options': 'i'}},
-                    {'description': {'$regex': food_type, '$options': 'i'}},
-                    {'category': {'$regex': food_type, '$options': 'i'}},
-                    {'tags': {'$in': [food_type.lower()]}}
-                ])
-            
-            # Budget constraints
-            if preferences.get('budget') == 'low':
-                search_query['price'] = {'$lte': 15}
-            elif preferences.get('budget') == 'medium':
-                search_query['price'] = {'$gte': 10, '$lte': 25}
-            elif preferences.get('budget') == 'high':
-                search_query['price'] = {'$gte': 20}
-            
-            # Dietary preferences
-            user_prefs = preferences.get('preferences', [])
-            if 'vegetarian' in user_prefs:
-                search_query['isVegetarian'] = True
-            if 'vegan' in user_prefs:
-                search_query['isVegan'] = True
-            if 'spicy' in user_prefs:
-                search_query['tags'] = {'$in': ['spicy', 'hot', 'chili']}
-            if 'healthy' in user_prefs:
-                search_query['tags'] = {'$in': ['healthy', 'low-calorie', 'organic']}
+        snapshot = food_index.get()
+        catalog = snapshot.catalog
+        mask = build_item_mask(catalog, preferences or {})
+        if config.OPEN_HOURS_FILTER:
+            # Closed kitchens never reach the agents
+            mask &= opening_hours.food_open_mask(catalog)
         
-        # Query food items with restaurant data
-        try:
-            food_items = list(db[config.COLLECTIONS['food_items']].aggregate([
-                {'$match': search_query},
-                {'$lookup': {
-                    'from': config.COLLECTIONS['restaurants'],
-                    'localField': 'restaurant',
-                    'foreignField': '_id',
-                    'as': 'restaurant_info'
-                }},
-                {'$unwind': '$restaurant_info'},
-                {'$sort': {'restaurant_info.rating': -1, 'price': 1}},
-                {'$limit': config.MAX_FOOD_RESULTS}
-            ]))
-        except:
-            # Fallback to simple query if aggregation fails
-            food_items = list(db[config.COLLECTIONS['food_items']].find(search_query).limit(config.MAX_FOOD_RESULTS))
+        # Score the free-text query and the requested food type; an item matching
+        # either keeps its best score (the old $or over both clause sets)
+        texts = [text for text in (query, (preferences or {}).get('foodType')) if text]
+        if texts:
+            scored: Dict[str, Tuple[Dict, float]] = {}
+            for text in texts:
+                for item, score in snapshot.search(text, mask=mask):
+                    item_id = item['_id']
+                    if item_id not in scored or scored[item_id][1] < score:
+                        scored[item_id] = (item, score)
+            ranked = sorted(
+                scored.values(),
+                key=lambda pair: (-pair[1], -snapshot.restaurant_rating(pair[0]), pair[0]['price'])
+            )
+            food_items = [item for item, _ in ranked]
+        else:
+            rows = np.flatnonzero(mask)
+            order = np.lexsort((catalog.price[rows], -catalog.food_restaurant_rating(rows)))
+            food_items = [snapshot.items[row] for row in rows[order]]
         
-        # Format results
-        results = []
-        for item in food_items:
-            result_item = {
-                'id': str(item['_id']),
-                'name': item['name'],
-                'price': item['price'],
-                'description': item['description'],
-                'category': item.get('category', 'Food'),
-                'isVegetarian': item.get('isVegetarian', False),
-                'isVegan': item.get('isVegan', False),
-                'tags': item.get('tags', []),
-                'calories': item.get('calories'),
-                'rating': item.get('rating', 4.0)
-            }
-            
-            # Add restaurant info if available
-            if 'restaurant_info' in item:
-                result_item['restaurant'] = {
-                    'id': str(item['restaurant_info']['_id']),
-                    'name': item['restaurant_info']['name'],
-                    'rating': item['restaurant_info'].get('rating', 4.0),
-                    'cuisine': item['restaurant_info'].get('cuisine', 'Various'),
-                    'deliveryTime': item['restaurant_info'].get('estimatedDeliveryTime', '25-35 mins')
-                }
-            else:
-                result_item['restaurant'] = {
-                    'id': str(item.get('restaurant', 'unknown')),
-                    'name': 'Restaurant',
-                    'rating': 4.0,
-                    'cuisine': 'Various',
-                    'deliveryTime': '25-35 mins'
-                }
-            
-            results.append(result_item)
-        
-        client.close()
-        return results
+        return [
+            _format_food_item(item, snapshot.restaurant_for(item))
+            for item in food_items[:config.MAX_FOOD_RESULTS]
+        ]
         
     except Exception as e:
         print(f"Food search error: {e}")
-        # Return fallback results for demo purposes
-        return [
-            {
-                'id': 'sample1',
-                'name': 'Margherita Pizza',
-                'price': 12.99,
-                'description': 'Classic pizza with tomato sauce, mozzarella, and basil',
-                'category': 'Pizza',
-                'restaurant': {
-                    'id': 'rest1',
-                    'name': 'Mario\'s Pizza',
-                    'rating': 4.5,
-                    'cuisine': 'Italian',
-                    'deliveryTime': '25-30 mins'
-                },
-                'isVegetarian': True,
-                'isVegan': False,
-                'tags': ['classic', 'cheese'],
-                'calories': 280,
-                'rating': 4.3
-            },
-            {
-                'id': 'sample2',
-                'name': 'Chicken Tikka Masala',
-                'price': 15.99,
-                'description': 'Tender chicken in a creamy spiced curry sauce',
-                'category': 'Indian',
-                'restaurant': {
-                    'id': 'rest2',
-                    'name': 'Spice Garden',
-                    'rating': 4.7,
-                    'cuisine': 'Indian',
-                    'deliveryTime': '30-40 mins'
-                },
-                'isVegetarian': False,
-                'isVegan': False,
-                'tags': ['spicy', 'curry', 'popular'],
-                'calories': 350,
-                'rating': 4.6
-            }
-        ]
+        return _fallback_food_items()
+
+
+def _fallback_food_items() -> List[Dict]:
+    """
+    Best-rated items from the last loaded catalog, used when the search itself fails
+    
+    Returns:
+        List[Dict]: Formatted food items (empty if the catalog was never loaded)
+    """
+    catalog = catalog_store.peek()
+    if catalog is None:
+        return []
+    results = []
+    for row in catalog.top_food_rows(config.MAX_FOOD_RESULTS, mask=catalog.is_available):
+        item = catalog.food_document(row)
+        restaurant_row = catalog.restaurant_row[row]
+        restaurant = catalog.restaurant_document(restaurant_row) if restaurant_row >= 0 else None
+        results.append(_format_food_item(item, restaurant))
+    return results
+
+
+def _format_food_item(item: Dict, restaurant: Optional[Dict]) -> Dict:
+    """
+    Format a food item document for agent consumption
+    
+    Args:
+        item (Dict): Food item document from the catalog store
+        restaurant (Dict): Restaurant document from the catalog store, if known
+        
+    Returns:
+        Dict: Food item with embedded restaurant summary
+    """
+    result_item = {
+        'id': str(item['_id']),
+        'name': item['name'],
+        'price': item['price'],
+        'description': item['description'],
+        'category': item.get('category', 'Food'),
+        'isVegetarian': item.get('isVegetarian', False),
+        'isVegan': item.get('isVegan', False),
+        'tags': item.get('tags', []),
+        'calories': item.get('calories'),
+        'rating': item.get('rating', 4.0)
+    }
+    
+    if restaurant:
+        result_item['restaurant'] = {
+            'id': str(restaurant['_id']),
+            'name': restaurant['name'],
+            'rating': restaurant.get('rating', 4.0),
+            'cuisine': restaurant.get('cuisine', 'Various'),
+            'deliveryTime': restaurant.get('deliveryTime', '25-35 mins')
+        }
+    else:
+        result_item['restaurant'] = {
+            'id': str(item.get('restaurant', 'unknown')),
+            'name': 'Restaurant',
+            'rating': 4.0,
+            'cuisine': 'Various',
+            'deliveryTime': '25-35 mins'
+        }
+    
+    return result_item
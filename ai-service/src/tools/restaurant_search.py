@@ -4,86 +4,153 @@ Handles searching for restaurants based on location, cuisine, and ratings.
 """
 
 from langchain_core.tools import tool
+from datetime import datetime
 from typing import Dict, List, Optional
 from ..config.settings import config
+from ..data.catalog_store import CatalogSnapshot, catalog_store, to_number
+from ..search.geo_index import geo_index
+from ..search.opening_hours import opening_hours
 
 
 @tool
-def restaurant_search(query: str) -> List[Dict]:
+def restaurant_search(
+    query: str,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: Optional[float] = None
+) -> List[Dict]:
     """
     Search for restaurants from the database based on cuisine, location, and ratings.    
     Args:
         query (str): Search query - can be cuisine type, restaurant name, or food type
+        latitude (float): User latitude; with longitude, results are limited to nearby restaurants
+        longitude (float): User longitude
+        radius_km (float): Search radius in km (defaults to GEO_SEARCH_RADIUS_KM)
         
     Returns:
         List[Dict]: List of restaurants matching the criteria
     """
-    try:
-        client = config.get_mongo_client()
-        db = client[config.DB_NAME]
-        
-        # Build search query - search in both cuisine and name fields
-        search_query = {}
-        
-        if query:
-            # Search in restaurant name and cuisine
-            search_query = {
-                '$or': [
-                    {'name': {'$regex': query, '$options': 'i'}},
-                    {'cuisine': {'$regex': query, '$options': 'i'}}
-                ]
-            }
-        
-        # Find restaurants
-        restaurants = list(db[config.COLLECTIONS['restaurants']].find(search_query)
-                         .sort('rating', -1)
-                         .limit(config.MAX_RESTAURANT_RESULTS))
-        
-        # Format results
-        results = []
-        for restaurant in restaurants:
-            results.append({
-                'id': str(restaurant['_id']),
-                'name': restaurant['name'],
-                'cuisine': restaurant.get('cuisine', 'Various'),
-                'rating': restaurant.get('rating', 4.0),
-                'estimatedDeliveryTime': restaurant.get('estimatedDeliveryTime', '25-35 mins'),
-                'address': restaurant.get('address', {}),
-                'isOpen': restaurant.get('isOpen', True),
-                'deliveryFee': restaurant.get('deliveryFee', 3.99),
-                'minimumOrder': restaurant.get('minimumOrder', 15.00),
-                'specialOffers': restaurant.get('specialOffers', [])
-            })
+    return search_restaurants(query, latitude, longitude, radius_km)
+
+
+def search_restaurants(
+    query: str,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: Optional[float] = None
+) -> List[Dict]:
+    """
+    Plain-function form of restaurant_search for callers outside the agent tool loop
+    
+    Args:
+        query (str): Cuisine type, restaurant name, or food type
+        latitude (float): User latitude; with longitude, nearest matching restaurants come first
+        longitude (float): User longitude
+        radius_km (float): Search radius in km (defaults to GEO_SEARCH_RADIUS_KM)
         
-        client.close()
-        return results
+    Returns:
+        List[Dict]: List of restaurants matching the criteria
+    """
+    try:
+        # Match the query against restaurant names and cuisines over the catalog columns
+        catalog = catalog_store.get()
+        mask = catalog.restaurant_text_mask(query)
+        if config.OPEN_HOURS_FILTER:
+            mask &= opening_hours.open_mask(catalog)
+        if latitude is not None and longitude is not None:
+            rows, distances = geo_index.within(
+                latitude, longitude, radius_km or config.GEO_SEARCH_RADIUS_KM, catalog=catalog
+            )
+            keep = mask[rows]
+            return [
+                _format_restaurant(catalog, row, distance)
+                for row, distance in zip(rows[keep][:config.MAX_RESTAURANT_RESULTS], distances[keep])
+            ]
+        return [
+            _format_restaurant(catalog, row)
+            for row in catalog.top_restaurant_rows(config.MAX_RESTAURANT_RESULTS, mask=mask)
+        ]
         
     except Exception as e:
         print(f"Restaurant search error: {e}")
-        # Return fallback results for demo purposes
+        # Fall back to the best-rated restaurants from the last loaded catalog
+        catalog = catalog_store.peek()
+        if catalog is None:
+            return []
         return [
-            {
-                'id': 'rest1',
-                'name': 'Mario\'s Pizza Palace',
-                'cuisine': 'Italian',
-                'rating': 4.5,
-                'estimatedDeliveryTime': '25-30 mins',
-                'address': {'street': '123 Main St', 'city': 'Downtown'},
-                'isOpen': True,
-                'deliveryFee': 2.99,
-                'minimumOrder': 12.00,
-                'specialOffers': ['20% off orders over $25']
-            },
-            {
-                'id': 'rest2',
-                'name': 'Spice Garden Indian',
-                'cuisine': 'Indian',
-                'rating': 4.7,
-                'estimatedDeliveryTime': '30-40 mins',
-                'address': {'street': '456 Curry Lane', 'city': 'Spice District'},
-                'isOpen': True,
-                'deliveryFee': 3.99,
-                'minimumOrder': 15.00,
-                'specialOffers': ['Free naan with any curry']
-            }
+            _format_restaurant(catalog, row)
+            for row in catalog.top_restaurant_rows(config.MAX_RESTAURANT_RESULTS)
         ]
+
+
+def nearby_restaurants(
+    latitude: float,
+    longitude: float,
+    radius_km: Optional[float] = None,
+    limit: int = 10
+) -> List[Dict]:
+    """
+    Restaurants closest to a point, nearest first
+    
+    Args:
+        latitude (float): Origin latitude
+        longitude (float): Origin longitude
+        radius_km (float): Only restaurants within this radius; None for the k nearest at any distance
+        limit (int): Maximum number of restaurants
+        
+    Returns:
+        List[Dict]: Restaurant summaries with distanceKm
+    """
+    catalog = catalog_store.get()
+    if radius_km is None:
+        rows, distances = geo_index.nearest(latitude, longitude, limit, catalog=catalog)
+    else:
+        rows, distances = geo_index.within(latitude, longitude, radius_km, limit=limit, catalog=catalog)
+    return [_format_restaurant(catalog, row, distance) for row, distance in zip(rows, distances)]
+
+
+def open_restaurants(at: Optional[datetime] = None, limit: int = 20) -> List[Dict]:
+    """
+    Best-rated restaurants open at a time
+    
+    Args:
+        at (datetime): Moment to check; naive values are read in RESTAURANT_TIMEZONE (default: now)
+        limit (int): Maximum number of restaurants
+        
+    Returns:
+        List[Dict]: Restaurant summaries
+    """
+    catalog = catalog_store.get()
+    mask = opening_hours.open_mask(catalog, at)
+    return [_format_restaurant(catalog, row) for row in catalog.top_restaurant_rows(limit, mask=mask)]
+
+
+def _format_restaurant(catalog: CatalogSnapshot, row: int, distance_km: Optional[float] = None) -> Dict:
+    """
+    Format one restaurant row for agent consumption
+    
+    Args:
+        catalog (CatalogSnapshot): Catalog columns
+        row (int): Restaurant row
+        distance_km (float): Distance from the user, when known
+        
+    Returns:
+        Dict: Restaurant summary
+    """
+    hours = opening_hours.table(catalog)
+    restaurant = {
+        'id': catalog.restaurant_ids[row],
+        'name': catalog.names.values[catalog.restaurant_name[row]],
+        'cuisine': catalog.restaurant_cuisine.row(row) or 'Various',
+        'rating': to_number(catalog.restaurant_rating[row]),
+        'estimatedDeliveryTime': catalog.labels.values[catalog.delivery_time[row]],
+        'address': catalog.address[row],
+        'isOpen': bool(opening_hours.open_mask(catalog)[row]),
+        'hoursToday': hours.hours_on(row, opening_hours.now().weekday()),
+        'deliveryFee': to_number(catalog.delivery_fee[row]),
+        'minimumOrder': to_number(catalog.minimum_order[row]),
+        'specialOffers': catalog.special_offers.row(row)
+    }
+    if distance_km is not None:
+        restaurant['distanceKm'] = round(float(distance_km), 2)
+    return restaurant
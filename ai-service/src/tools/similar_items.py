@@ -0,0 +1,39 @@
+"""
+"More like this" tool for CrewAI agents.
+Serves precomputed dish neighbours from the similarity index.
+"""
+
+from langchain_core.tools import tool
+from typing import List
+from ..pipeline.handles import compact_results, handle_table
+from ..search.food_index import food_index
+from ..search.similarity import similarity_index
+
+
+@tool
+def find_similar_items(item: str, other_restaurants: bool = False, limit: int = 5) -> List[str]:
+    """
+    Find dishes similar to a given dish (e.g. "something like the Paneer Butter Masala but from
+    another place").
+    
+    Args:
+        item (str): Food item handle or id, or the dish name if neither is known
+        other_restaurants (bool): Only return dishes from a different restaurant
+        limit (int): Maximum number of dishes to return
+        
+    Returns:
+        List[str]: One line per similar dish: handle | name | price | restaurant rating delivery | tags
+    """
+    try:
+        snapshot = food_index.get()
+        source = snapshot.item_by_id(handle_table(snapshot).resolve(item) or item)
+        if source is None:
+            matches = snapshot.search(item, limit=1)
+            if not matches:
+                return []
+            source = matches[0][0]
+        similar = similarity_index.similar_items(str(source['_id']), limit, other_restaurants) or []
+        return compact_results(similar, snapshot)
+    except Exception as e:
+        print(f"❌ Similar items lookup failed: {e}")
+        return []
@@ -4,10 +4,11 @@ Common helper functions and data validation.
 """
 
 import re
-import json
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from ..llm.json_output import extract_json
+
 
 def validate_user_message(message: str) -> bool:
     """
@@ -59,22 +60,7 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict]: Extracted JSON object or None
     """
-    try:
-        # Try to find JSON in the text
-        json_pattern = r'\\{[^{}]*(?:\\{[^{}]*\\}[^{}]*)*\\}'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-        
-        # If no valid JSON found, try the entire text
-        return json.loads(text)
-        
-    except json.JSONDecodeError:
-        return None
+    return extract_json(text)
 
 
 def sanitize_string(text: str, max_length: int = 500) -> str:
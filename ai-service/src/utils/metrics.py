@@ -0,0 +1,89 @@
+"""
+Lightweight in-process metrics.
+Records latency and token counts per named stage for the /metrics endpoint.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+# Recent samples kept per stage for percentile estimates
+WINDOW_SIZE = 512
+
+# Rough characters per token for English prompt text, used where the LLM reports no usage
+CHARS_PER_TOKEN = 4
+
+
+class StageMetrics:
+    """Thread-safe latency/token recorder keyed by stage name"""
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, stage: str, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        """
+        Record one execution of a stage
+
+        Args:
+            stage (str): Stage name, e.g. "pipeline.crew"
+            seconds (float): Wall-clock duration
+            prompt_tokens (int): Prompt tokens consumed
+            completion_tokens (int): Completion tokens produced
+        """
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = {
+                    'count': 0,
+                    'prompt_tokens': 0,
+                    'completion_tokens': 0,
+                    'latencies': deque(maxlen=self.window_size)
+                }
+                self._stages[stage] = entry
+            entry['count'] += 1
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+            entry['latencies'].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize every stage
+
+        Returns:
+            Dict: Per-stage count, latency percentiles (ms) and average tokens
+        """
+        with self._lock:
+            return {stage: _summarize(entry) for stage, entry in sorted(self._stages.items())}
+
+
+def _summarize(entry: Dict[str, Any]) -> Dict[str, Any]:
+    latencies: Deque[float] = entry['latencies']
+    ordered = sorted(latencies)
+    count = entry['count']
+
+    def percentile(fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] * 1000, 2)
+
+    return {
+        'count': count,
+        'avg_ms': round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        'p50_ms': percentile(0.5),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'avg_prompt_tokens': round(entry['prompt_tokens'] / count, 1) if count else 0.0,
+        'avg_completion_tokens': round(entry['completion_tokens'] / count, 1) if count else 0.0
+    }
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a prompt fragment"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+# Global instance shared by pipeline stages
+stage_metrics = StageMetrics()
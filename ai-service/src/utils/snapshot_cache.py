@@ -0,0 +1,58 @@
+"""
+Per-snapshot memo for structures derived from a catalog or index snapshot.
+Keeps the few most recently used snapshots, so a batch pinned to an older snapshot and
+live traffic on the current one don't rebuild each other's structures on every call.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+# Snapshots kept per cache: the live one, one pinned by an in-flight batch and one spare
+# for a refresh that lands while that batch is still running
+SNAPSHOT_CACHE_SIZE = 3
+
+
+class SnapshotCache:
+    """Thread-safe LRU of derived values keyed by snapshot identity"""
+
+    def __init__(self, size: int = SNAPSHOT_CACHE_SIZE):
+        """
+        Initialize an empty cache
+
+        Args:
+            size (int): Snapshots kept before the least recently used one is dropped
+        """
+        self.size = size
+        self._entries: "OrderedDict[int, Tuple[Any, Any]]" = OrderedDict()
+        self._latest: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def get(self, snapshot: Any, build: Callable[[Any], Any]) -> Any:
+        """
+        Get the value derived from a snapshot, building it on first use
+
+        Args:
+            snapshot: Catalog or index snapshot (compared by identity)
+            build (Callable): Builds the value from the snapshot; called under the cache lock
+
+        Returns:
+            Any: The cached or freshly built value
+        """
+        key = id(snapshot)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is snapshot:
+                self._entries.move_to_end(key)
+            else:
+                entry = (snapshot, build(snapshot))
+                self._entries[key] = entry
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+            self._latest = entry[1]
+        return entry[1]
+
+    def latest(self) -> Optional[Any]:
+        """Most recently used value (None before the first get)"""
+        return self._latest
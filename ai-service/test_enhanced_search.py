@@ -14,19 +14,19 @@ def test_enhanced_search():
     print('\n1. Searching for "pizza":')
     pizza_foods = food_search.invoke({'query': 'pizza'})
     for food in pizza_foods[:3]:
-        print(f'   - {food.get("name")} at {food.get("restaurant", {}).get("name", "Unknown")} (${food.get("price", 0)})')
+        print(f'   - {food}')
     
     # Test for burger (should find items)
     print('\n2. Searching for "burger":')
     burger_foods = food_search.invoke({'query': 'burger'})
     for food in burger_foods[:3]:
-        print(f'   - {food.get("name")} at {food.get("restaurant", {}).get("name", "Unknown")} (${food.get("price", 0)})')
+        print(f'   - {food}')
     
     # Test for comfort keywords
     print('\n3. Searching for "comfort":')
     comfort_foods = food_search.invoke({'query': 'comfort'})
     for food in comfort_foods[:3]:
-        print(f'   - {food.get("name")} at {food.get("restaurant", {}).get("name", "Unknown")} (${food.get("price", 0)})')
+        print(f'   - {food}')
     
     # Test restaurants with comfort
     print('\n🏪 COMFORT RESTAURANTS:')
@@ -50,7 +50,7 @@ def test_enhanced_search():
         foods = food_search.invoke({'query': craving})
         print(f'\n{craving.title()} foods: {len(foods)}')
         for food in foods[:2]:
-            print(f'   - {food.get("name")} (${food.get("price", 0)})')
+            print(f'   - {food}')
 
 if __name__ == '__main__':
     test_enhanced_search()
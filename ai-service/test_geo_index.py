@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Test the restaurant geo grid against a brute-force distance scan"""
+
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from src.search.geo_index import GeoGrid, haversine_km
+
+# (latitude, longitude, radius km, k) queries: a city, the antimeridian, near the pole, open sea
+QUERIES = [
+    (12.97, 77.59, 5.0, 10),
+    (0.0, 179.99, 40.0, 5),
+    (89.9, 10.0, 300.0, 3),
+    (-40.0, -120.0, 1.0, 4),
+]
+
+def random_catalog(seed=7):
+    """Restaurants clustered around the query points, plus some without coordinates"""
+    rng = np.random.default_rng(seed)
+    latitudes, longitudes = [], []
+    for latitude, longitude, _, _ in QUERIES:
+        latitudes.append(np.clip(latitude + rng.normal(0, 0.3, 200), -90, 90))
+        longitudes.append((longitude + rng.normal(0, 0.3, 200) + 180) % 360 - 180)
+    latitude = np.concatenate(latitudes + [np.full(5, np.nan)]).astype(np.float32)
+    longitude = np.concatenate(longitudes + [np.full(5, np.nan)]).astype(np.float32)
+    # GeoGrid only reads the coordinate columns of the catalog snapshot
+    return SimpleNamespace(latitude=latitude, longitude=longitude)
+
+def brute_force(catalog, latitude, longitude):
+    distances = haversine_km(latitude, longitude, catalog.latitude.astype(np.float64), catalog.longitude.astype(np.float64))
+    rows = np.flatnonzero(~np.isnan(distances))
+    order = np.lexsort((rows, distances[rows]))
+    return rows[order], distances[rows][order]
+
+def test_geo_index():
+    print('Testing GeoGrid.within and GeoGrid.nearest...')
+    catalog = random_catalog()
+    grid = GeoGrid(catalog)
+    assert len(grid) == len(catalog.latitude) - 5, 'restaurants without coordinates are skipped'
+
+    for latitude, longitude, radius_km, k in QUERIES:
+        expected_rows, expected_distances = brute_force(catalog, latitude, longitude)
+
+        rows, distances = grid.within(latitude, longitude, radius_km)
+        inside = expected_distances <= radius_km
+        assert np.array_equal(rows, expected_rows[inside]), f'within({latitude}, {longitude}, {radius_km})'
+        assert np.allclose(distances, expected_distances[inside])
+
+        rows, distances = grid.nearest(latitude, longitude, k)
+        assert np.array_equal(rows, expected_rows[:k]), f'nearest({latitude}, {longitude}, {k})'
+        assert np.all(np.diff(distances) >= 0), 'nearest first'
+        print(f'✅ ({latitude}, {longitude}): {int(inside.sum())} within {radius_km} km, '
+              f'nearest {distances[0]:.2f}-{distances[-1]:.2f} km')
+
+if __name__ == '__main__':
+    test_geo_index()
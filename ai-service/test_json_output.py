@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Test JSON extraction and repair of LLM output"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.llm.json_output import JsonFieldStream, extract_json
+
+# Model output -> object extract_json should recover
+CASES = [
+    ('bare object', '{"mood": "comfort", "budget": "low"}', {'mood': 'comfort', 'budget': 'low'}),
+    ('fenced, trailing commas', 'Sure! ```json\n{"a": 1, "b": [1, 2,],}\n```', {'a': 1, 'b': [1, 2]}),
+    ('python literals and quotes', "{'mood': 'comfort', 'ok': True, 'x': None}", {'mood': 'comfort', 'ok': True, 'x': None}),
+    ('prose braces, raw newline', 'Here {not json} then {"a": "line1\nline2"} bye', {'a': 'line1\nline2'}),
+    ('truncated mid-object',
+     '{"message": "hi", "recommendations": [{"id": "1"}, {"id": "2", "why',
+     {'message': 'hi', 'recommendations': [{'id': '1'}, {'id': '2'}]}),
+    ('first of two objects', '{"a": {"b": 1}} trailing {"c": 2}', {'a': {'b': 1}}),
+    ('no object', 'no json here', None),
+]
+
+def test_extract_json():
+    print('Testing extract_json...')
+    failures = 0
+    for name, text, expected in CASES:
+        extracted = extract_json(text)
+        ok = extracted == expected
+        failures += not ok
+        print(f'{"✅" if ok else "❌"} {name}: {extracted}' + ('' if ok else f' (expected {expected})'))
+    assert failures == 0, f'{failures} outputs extracted wrong'
+
+# Streamed advisor output: the message key also appears nested, and the value carries escapes
+STREAMED = 'Final Answer: {"actionRequired": {"message": "nested"}, "message": "Hi \\"Sam\\" \\ud83d\\ude0b\\nenjoy", "recommendations": []}'
+
+def test_json_field_stream():
+    print('Testing JsonFieldStream...')
+    for size in (1, 3, 8, len(STREAMED)):
+        stream = JsonFieldStream('message')
+        pieces = [stream.feed(STREAMED[start:start + size]) for start in range(0, len(STREAMED), size)]
+        assert ''.join(pieces) == 'Hi "Sam" 😋\nenjoy', f'chunks of {size}: {pieces}'
+        assert len([piece for piece in pieces if piece]) > 1 or size == len(STREAMED), 'value arrives incrementally'
+    print('✅ top-level message decoded chunk by chunk')
+
+if __name__ == '__main__':
+    test_extract_json()
+    test_json_field_stream()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Test opening-hours parsing"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.search.opening_hours import parse_day
+
+# Hours string -> expected (open, close) minutes after the day's midnight
+CASES = [
+    ('11:00-23:00', ((660, 1380),)),
+    ('10:00-00:00', ((600, 1440),)),
+    ('9am - 10:30pm', ((540, 1350),)),
+    ('11-10pm', ((660, 1320),)),
+    ('noon - midnight', ((720, 1440),)),
+    ('11:00-15:00, 18:00-02:00', ((660, 900), (1080, 1560))),
+    ('Closed', ()),
+    ('24 hours', ((0, 1440),)),
+    ('', None),
+    (None, None),
+    ('whenever', None),
+    ('25:00-26:00', None),
+]
+
+def test_parse_day():
+    print('Testing parse_day...')
+    failures = 0
+    for text, expected in CASES:
+        parsed = parse_day(text)
+        ok = parsed == expected
+        failures += not ok
+        print(f'{"✅" if ok else "❌"} {text!r} -> {parsed}' + ('' if ok else f' (expected {expected})'))
+    assert failures == 0, f'{failures} hours strings parsed wrong'
+
+if __name__ == '__main__':
+    test_parse_day()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test cursor pagination of the recommendations query engine"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.catalog_store import CatalogSnapshot
+from src.search.food_index import FoodIndexSnapshot, food_index
+from src.search.recommendations import InvalidQueryError, recommendation_engine
+
+PAGE_SIZE = 7
+
+# (filters, sort, sort key of a result) combinations to walk page by page; open_now is off
+# because the test catalog has no opening hours
+QUERIES = [
+    ({'open_now': False}, 'rating', lambda rec: (-rec['rating'], rec['id'])),
+    ({'open_now': False, 'max_price': 15}, 'price_asc', lambda rec: (rec['price'], rec['id'])),
+    ({'open_now': False, 'vegetarian': True}, 'price_desc', lambda rec: (-rec['price'], rec['id'])),
+]
+
+def build_snapshot():
+    """In-memory catalog with many rating and price ties, so pages split inside tied runs"""
+    restaurants = [
+        {'_id': f'65f0a1b2c3d4e5f6a7b8{row:04x}', 'name': f'Place {row}', 'rating': 4.0 + row / 10,
+         'cuisine': ['Italian'], 'deliveryTime': '25-35 mins'}
+        for row in range(4)
+    ]
+    foods = [
+        {'_id': f'65f0a1b2c3d4e5f6a7c{row:05x}', 'name': f'Dish {row}', 'price': 6 + (row * 7) % 20,
+         'rating': 4.0 + (row % 5) / 10, 'category': 'Pizza', 'tags': ['pizza'],
+         'restaurant': restaurants[row % 4]['_id'], 'isVegetarian': row % 3 == 0}
+        for row in range(100)
+    ]
+    return FoodIndexSnapshot(CatalogSnapshot(foods, restaurants, 'test'))
+
+def walk(filters, sort):
+    """Every page of one query, following next_cursor to the end"""
+    pages, cursor = [], None
+    while True:
+        page = recommendation_engine.query(filters, sort=sort, limit=PAGE_SIZE, cursor=cursor)
+        pages.append(page)
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+def test_pagination():
+    print('Testing cursor pagination round-trip...')
+    with food_index.pinned(build_snapshot()):
+        check_pages()
+
+def check_pages():
+    for filters, sort, key in QUERIES:
+        pages = walk(filters, sort)
+        results = [rec for page in pages for rec in page['recommendations']]
+        ids = [str(rec['id']) for rec in results]
+        assert len(ids) == len(set(ids)), f'{sort}: an item appeared on two pages'
+        assert len(ids) == pages[0]['total'], f'{sort}: pages hold {len(ids)} of {pages[0]["total"]} matches'
+        assert all(len(page['recommendations']) == PAGE_SIZE for page in pages[:-1]), f'{sort}: short page before the last'
+        keys = [key(rec) for rec in results]
+        assert keys == sorted(keys), f'{sort}: results out of order across pages'
+        print(f'✅ {sort} {filters}: {len(ids)} items over {len(pages)} pages')
+
+    first = recommendation_engine.query({'open_now': False}, sort='rating', limit=PAGE_SIZE)
+    if first['next_cursor']:
+        try:
+            recommendation_engine.query({'open_now': False}, sort='price_asc', limit=PAGE_SIZE, cursor=first['next_cursor'])
+            raise AssertionError('a cursor from another sort was accepted')
+        except InvalidQueryError as e:
+            print(f'✅ foreign cursor rejected: {e}')
+    try:
+        recommendation_engine.query({'open_now': False}, sort='rating', limit=PAGE_SIZE, cursor='not-a-cursor')
+        raise AssertionError('a malformed cursor was accepted')
+    except InvalidQueryError as e:
+        print(f'✅ malformed cursor rejected: {e}')
+
+if __name__ == '__main__':
+    test_pagination()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Test the BM25 inverted index behind catalog search"""
+
+import sys
+import os
+import math
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.search.inverted_index import PREFIX_PENALTY, InvertedIndex, tokenize
+
+FIELD_WEIGHTS = {'name': 3.0, 'description': 1.0}
+
+DOCUMENTS = [
+    {'name': 'Margherita Pizza', 'description': 'Tomato, mozzarella and basil'},
+    {'name': 'Pepperoni Pizza', 'description': 'Spicy pepperoni on a crisp base'},
+    {'name': 'Garlic Bread', 'description': 'Goes well with any pizza'},
+    {'name': 'Pizzette', 'description': 'Mini pizzas for sharing'},
+    {'name': 'Chicken Curry', 'description': 'Slow cooked and spicy'},
+]
+
+def analyze(document):
+    """Field-weighted term frequencies and length, computed independently of the index"""
+    frequencies, length = {}, 0.0
+    for field, weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(document[field])
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0.0) + weight
+        length += weight * len(tokens)
+    return frequencies, length
+
+def bm25(term, doc_id, k1=1.2, b=0.75):
+    """Reference BM25 score of one exact term in one document"""
+    analyzed = [analyze(doc) for doc in DOCUMENTS]
+    matches = sum(1 for frequencies, _ in analyzed if term in frequencies)
+    avg_length = sum(length for _, length in analyzed) / len(DOCUMENTS)
+    frequencies, length = analyzed[doc_id]
+    idf = math.log(1 + (len(DOCUMENTS) - matches + 0.5) / (matches + 0.5))
+    norm = k1 * (1 - b + b * length / avg_length)
+    return idf * frequencies[term] * (k1 + 1) / (frequencies[term] + norm)
+
+def test_search_index():
+    print('Testing BM25 inverted index...')
+    index = InvertedIndex(FIELD_WEIGHTS)
+    index.build(DOCUMENTS)
+
+    results = index.search('pizza')
+    print(f'"pizza" -> {[(DOCUMENTS[doc_id]["name"], round(score, 3)) for doc_id, score in results]}')
+    scores = dict(results)
+    assert set(scores) == {0, 1, 2, 3}, '"pizza" should also match "pizzas" by prefix'
+    assert min(scores[0], scores[1]) > scores[2], 'a name match should outrank a description-only match'
+    for doc_id in (0, 1, 2):
+        assert math.isclose(scores[doc_id], bm25('pizza', doc_id), rel_tol=1e-9), f'BM25 score of doc {doc_id}'
+    assert scores[3] <= min(scores[2] * PREFIX_PENALTY, PREFIX_PENALTY * bm25('pizzas', 3)), 'prefix-only matches are discounted'
+    print('✅ scores match the BM25 formula')
+
+    assert [doc_id for doc_id, _ in results][:2] in ([0, 1], [1, 0]), 'exact name matches should rank first'
+    assert [doc_id for doc_id, _ in results][2:] == [2, 3], 'an exact match should outrank a prefix-only match'
+    assert [doc_id for doc_id, _ in index.search('pizzet')] == [3], 'a prefix-only query still finds its documents'
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True), 'scores follow the order'
+    print('✅ exact matches rank ahead of prefix-only matches')
+
+    assert [doc_id for doc_id, _ in index.search('spicy pizza')] == [1], 'every token must match'
+    assert {doc_id for doc_id, _ in index.search('spicy pizza', require_all=False)} == {0, 1, 2, 3, 4}
+    assert index.search('sushi') == []
+    print('✅ conjunctive, disjunctive and empty queries')
+
+    # Incremental update: change one document and add one, then compare with a full rebuild
+    changed = {'name': 'Veggie Curry', 'description': 'Spicy and mild at once'}
+    added = {'name': 'Curry Pizza', 'description': 'Fusion'}
+    updated = index.updated({4: DOCUMENTS[4]}, {4: changed, len(DOCUMENTS): added})
+    rebuilt = InvertedIndex(FIELD_WEIGHTS)
+    rebuilt.build(DOCUMENTS[:4] + [changed, added])
+    for query in ('curry', 'pizza', 'spicy', 'chicken'):
+        assert updated.search(query) == rebuilt.search(query), f'updated index differs on "{query}"'
+    assert [doc_id for doc_id, _ in index.search('chicken')] == [4], 'the old index must stay unchanged'
+    print('✅ incremental update matches a full rebuild')
+
+if __name__ == '__main__':
+    test_search_index()
@@ -14,7 +14,7 @@ def test_tools():
         foods = food_search('pizza')
         print(f'Found {len(foods)} food items')
         for food in foods[:3]:
-            print(f'- {food.get("name", "Unknown")}')
+            print(f'- {food}')
     except Exception as e:
         print(f'Food search error: {e}')
 
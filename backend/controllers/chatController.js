@@ -81,15 +81,22 @@ const processUserQuery = async (req, res) => {
 
 const getRecommendations = async (req, res) => {
   try {
-    const { filters } = req.body;
-    const userId = req.user?.id || req.user?._id || 'anonymous';
-    
-    // For now, return a simple response
-    // This could also integrate with the AI service for more advanced recommendations
-    res.json({ 
-      recommendations: [],
-      message: "Let me know what you're craving and I'll find the perfect match!"
+    const { filters, sort, limit, cursor } = req.body;
+
+    // Filter-based recommendations are answered by the AI service straight from the catalog (no LLM)
+    const response = await fetch(`${AI_SERVICE_URL}/recommendations`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ filters: filters || {}, sort, limit, cursor })
     });
+
+    const result = await response.json();
+    if (!response.ok) {
+      return res.status(response.status).json({ error: result.detail || 'Failed to get recommendations' });
+    }
+    res.json(result);
   } catch (error) {
     console.error('Get Recommendations Error:', error);
     res.status(500).json({ error: 'Failed to get recommendations' });